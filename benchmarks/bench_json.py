@@ -0,0 +1,85 @@
+"""
+Compare the JSON backends on large task definitions.
+
+Every installed backend reads the same files through ``load_json_file``. The
+baseline is the previous loader, which decoded the file into a ``str`` and
+parsed it with ``json.load``. Backends that parse from a buffer are also
+measured with every file memory-mapped.
+
+Usage:
+    python -m benchmarks.bench_json [task_definition.json ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+from benchmarks.generator import generate_task_definition
+from benchmarks.run import SIZES
+from fargate_task_validator.utils import json_loader
+from fargate_task_validator.utils.json_loader import (
+    BACKEND_NAMES,
+    get_backend,
+    load_json_file,
+)
+
+# The largest definitions of the benchmark suite, and one ten times larger.
+GENERATED = {
+    "large": SIZES["large"],
+    "huge": dict(SIZES["large"], containers=100),
+}
+
+
+def text_json_load(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {label:<16} {seconds * 1e3:10.3f} ms/file")
+    return seconds
+
+
+def compare(path):
+    size = os.path.getsize(path)
+    print(f"{path} ({size / 1024:.0f} KiB)")
+    number = max(1, min(200, 20 * 1024 * 1024 // size))
+    expected = text_json_load(path)
+    baseline = bench("json (str)", lambda: text_json_load(path), number)
+
+    threshold = json_loader.MMAP_THRESHOLD
+    for name in BACKEND_NAMES:
+        try:
+            backend = get_backend(name)
+        except ImportError:
+            print(f"  {name:<16} {'not installed':>10}")
+            continue
+        assert load_json_file(path, backend) == expected, f"{name} disagrees"
+        json_loader.MMAP_THRESHOLD = float("inf")
+        try:
+            seconds = bench(name, lambda: load_json_file(path, backend), number)
+            if backend.buffers:
+                json_loader.MMAP_THRESHOLD = 0
+                bench(f"{name} (mmap)", lambda: load_json_file(path, backend), number)
+        finally:
+            json_loader.MMAP_THRESHOLD = threshold
+        print(f"  {'speedup':<16} {baseline / seconds:10.1f}x")
+
+
+def main(paths):
+    with tempfile.TemporaryDirectory() as directory:
+        if not paths:
+            for label, sizes in GENERATED.items():
+                path = os.path.join(directory, f"{label}.json")
+                with open(path, "w") as f:
+                    json.dump(generate_task_definition(**sizes), f, indent=2)
+                paths.append(path)
+        for path in paths:
+            compare(path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,53 @@
+"""
+Compare the compiled schema validator with the interpreted Draft7Validator.
+
+Usage:
+    python -m benchmarks.bench_schema_validator [task_definition.json ...]
+"""
+
+import json
+import sys
+import timeit
+
+from fargate_task_validator.validators.schema_validator import (
+    get_compiled_validator,
+    validator,
+)
+
+DEFAULT_FILES = [
+    "examples/amazon_linux_2_task.json",
+    "examples/my_nginx_task.json",
+    "examples/windows_task.json",
+]
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    per_call = seconds / number * 1e6
+    print(f"  {label:<10} {per_call:10.2f} us/call")
+    return per_call
+
+
+def main(paths):
+    compile_seconds = timeit.timeit(
+        lambda: get_compiled_validator.__wrapped__(), number=1
+    )
+    print(f"Compiling the schema took {compile_seconds * 1e3:.2f} ms")
+    compiled = get_compiled_validator()
+
+    for path in paths:
+        with open(path, "r") as f:
+            task_definition = json.load(f)
+
+        assert compiled.is_valid(task_definition) == validator.is_valid(
+            task_definition
+        ), f"Backends disagree on {path}"
+
+        print(path)
+        draft7 = bench("draft7", lambda: validator.is_valid(task_definition), 2000)
+        fast = bench("compiled", lambda: compiled.is_valid(task_definition), 2000)
+        print(f"  speedup    {draft7 / fast:10.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_FILES)
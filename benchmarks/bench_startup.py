@@ -0,0 +1,93 @@
+"""
+Measure the start-up cost of the fargate-validator CLI.
+
+Reports the median wall time of a bare interpreter, of importing the CLI module
+and of validating one file, and lists the slowest imports.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 20] [--top 15]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+EXAMPLE = "examples/windows_task.json"
+
+COMMANDS = {
+    "interpreter": [sys.executable, "-c", "pass"],
+    "import": [sys.executable, "-c", "import fargate_task_validator.__main__"],
+    "cli": [
+        sys.executable,
+        "-m",
+        "fargate_task_validator",
+        "--quiet",
+        "--no-cache",
+        EXAMPLE,
+    ],
+    "cli.skip_schema": [
+        sys.executable,
+        "-m",
+        "fargate_task_validator",
+        "--quiet",
+        "--no-cache",
+        "--skip-schema",
+        EXAMPLE,
+    ],
+}
+
+
+def measure_startup(repeat=20):
+    """
+    Time each start-up command.
+
+    Returns:
+    - dict: Median wall time in milliseconds per command name.
+    """
+    results = {}
+    for name, command in COMMANDS.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, stdout=subprocess.DEVNULL, check=False)
+            timings.append(time.perf_counter() - start)
+        results[name] = statistics.median(timings) * 1e3
+    return results
+
+
+def slowest_imports(top):
+    """
+    Run the CLI under ``-X importtime`` and return its slowest imports.
+
+    Returns:
+    - list: ``(cumulative_us, module)`` pairs, slowest first.
+    """
+    command = [sys.executable, "-X", "importtime"] + COMMANDS["cli"][1:]
+    stderr = subprocess.run(command, capture_output=True, text=True).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        imports.append((int(cumulative), module.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    for name, milliseconds in measure_startup(args.repeat).items():
+        print(f"{name:<16} {milliseconds:8.1f} ms")
+
+    print("\nSlowest imports (cumulative):")
+    for cumulative, module in slowest_imports(args.top):
+        print(f"{cumulative / 1e3:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Synthetic task definitions for benchmarks.
+
+Every knob scales one part of the document, so benchmarks can show how the
+validators behave as task definitions grow.
+"""
+
+import json
+import os
+import random
+
+SUPPORTED_NAMESPACES = [
+    "net.core.somaxconn",
+    "net.ipv4.tcp_keepalive_time",
+    "kernel.shmmax",
+    "kernel.msgmax",
+    "fs.mqueue.msg_max",
+]
+
+
+def generate_task_definition(
+    containers=1,
+    environment=0,
+    secrets=0,
+    sysctls=0,
+    ulimits=0,
+    volumes=0,
+    seed=0,
+):
+    """
+    Build a Fargate compatible task definition of the requested size.
+
+    Args:
+    - containers (int): Number of entries in ``containerDefinitions``.
+    - environment (int): Environment variables per container.
+    - secrets (int): Secrets per container.
+    - sysctls (int): ``systemControls`` entries per container, all in
+      namespaces supported by Fargate.
+    - ulimits (int): ``ulimits`` entries per container.
+    - volumes (int): EFS volumes on the task, each mounted in every container.
+    - seed (int): Seed for the generated values, for reproducible documents.
+
+    Returns:
+    - dict: The task definition.
+    """
+    rng = random.Random(seed)
+
+    task_volumes = [
+        {
+            "name": f"volume-{v}",
+            "efsVolumeConfiguration": {
+                "fileSystemId": f"fs-{rng.getrandbits(32):08x}",
+                "rootDirectory": f"/data/{v}",
+                "transitEncryption": "ENABLED",
+            },
+        }
+        for v in range(volumes)
+    ]
+
+    container_definitions = []
+    for c in range(containers):
+        container_definitions.append(
+            {
+                "name": f"container-{c}",
+                "image": f"123456789012.dkr.ecr.us-east-1.amazonaws.com/app-{c}:latest",
+                "essential": c == 0,
+                "cpu": 0,
+                "portMappings": [{"containerPort": 8080 + c, "protocol": "tcp"}],
+                "environment": [
+                    {"name": f"ENV_{e}", "value": f"{rng.getrandbits(64):016x}"}
+                    for e in range(environment)
+                ],
+                "secrets": [
+                    {
+                        "name": f"SECRET_{s}",
+                        "valueFrom": "arn:aws:secretsmanager:us-east-1:"
+                        f"123456789012:secret:secret-{s}",
+                    }
+                    for s in range(secrets)
+                ],
+                "systemControls": [
+                    {
+                        "namespace": SUPPORTED_NAMESPACES[s % len(SUPPORTED_NAMESPACES)],
+                        "value": str(rng.randint(1, 65535)),
+                    }
+                    for s in range(sysctls)
+                ],
+                "ulimits": [
+                    {"name": "nofile", "softLimit": 65536, "hardLimit": 65536}
+                    for _ in range(ulimits)
+                ],
+                "mountPoints": [
+                    {"sourceVolume": volume["name"], "containerPath": f"/mnt/{v}"}
+                    for v, volume in enumerate(task_volumes)
+                ],
+                "logConfiguration": {
+                    "logDriver": "awslogs",
+                    "options": {
+                        "awslogs-group": "/ecs/synthetic",
+                        "awslogs-region": "us-east-1",
+                        "awslogs-stream-prefix": f"container-{c}",
+                    },
+                },
+            }
+        )
+
+    return {
+        "family": f"synthetic-{seed}",
+        "networkMode": "awsvpc",
+        "requiresCompatibilities": ["FARGATE"],
+        "cpu": "1024",
+        "memory": "2048",
+        "runtimePlatform": {"operatingSystemFamily": "LINUX"},
+        "containerDefinitions": container_definitions,
+        "volumes": task_volumes,
+    }
+
+
+def write_task_definitions(directory, count, **sizes):
+    """
+    Write ``count`` synthetic task definitions as JSON files into ``directory``.
+
+    Returns:
+    - list: Paths of the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"task-{index:06d}.json")
+        with open(path, "w") as f:
+            json.dump(generate_task_definition(seed=index, **sizes), f)
+        paths.append(path)
+    return paths
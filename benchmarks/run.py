@@ -0,0 +1,212 @@
+"""
+Benchmark suite for the Fargate validator.
+
+Measures throughput and latency of the Fargate checks, both schema validator
+backends and the whole CLI on synthetic task definitions of several sizes, and
+the start-up time of the CLI.
+
+Usage:
+    python -m benchmarks.run [--quick] [--output results.json]
+    python -m benchmarks.run --compare baseline.json [--threshold 10]
+
+Results are written as JSON so runs from different commits can be compared.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_startup import measure_startup
+from benchmarks.generator import generate_task_definition, write_task_definitions
+from fargate_task_validator.validators.fargate_validator import (
+    check_fargate_compatibility,
+)
+from fargate_task_validator.validators.schema_validator import (
+    get_compiled_validator,
+    validator,
+)
+
+SIZES = {
+    "small": dict(containers=1, environment=5),
+    "medium": dict(
+        containers=4, environment=50, secrets=10, sysctls=5, ulimits=2, volumes=2
+    ),
+    "large": dict(
+        containers=10, environment=500, secrets=50, sysctls=50, ulimits=5, volumes=5
+    ),
+}
+
+CLI_FILES = 200
+
+
+def measure(func, iterations):
+    """
+    Call ``func`` repeatedly and summarize the latency of each call.
+
+    Returns:
+    - dict: ``ops_per_sec`` and the ``p50_us``, ``p95_us`` and ``max_us`` latencies.
+    """
+    func()  # warm up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    return {
+        "ops_per_sec": len(samples) / sum(samples),
+        "p50_us": statistics.median(samples) * 1e6,
+        "p95_us": samples[int(len(samples) * 0.95) - 1] * 1e6,
+        "max_us": samples[-1] * 1e6,
+    }
+
+
+def measure_cli(directory, files, repeat):
+    """
+    Time the CLI, including interpreter start-up, over a directory of files.
+
+    Returns:
+    - dict: ``ops_per_sec`` in files per second and ``wall_ms`` of the best run.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "fargate_task_validator",
+        "--quiet",
+        "--no-cache",
+        "--workers",
+        "1",
+        directory,
+    ]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"ops_per_sec": files / best, "wall_ms": best * 1e3}
+
+
+def run_suite(sizes, quick=False):
+    iterations = 200 if quick else 2000
+    cli_files = CLI_FILES // 10 if quick else CLI_FILES
+    compiled = get_compiled_validator()
+
+    results = {}
+    for size in sizes:
+        task_definition = generate_task_definition(**SIZES[size])
+        # Measure the path of compatible documents, which run every check.
+        feedback = check_fargate_compatibility(task_definition)
+        failing = [name for name, status in feedback.items() if status != "OK"]
+        assert not failing, f"{size} task definition fails {failing}"
+        results[f"fargate.{size}"] = measure(
+            lambda: check_fargate_compatibility(task_definition), iterations
+        )
+        results[f"schema.draft7.{size}"] = measure(
+            lambda: validator.validate(task_definition), iterations
+        )
+        results[f"schema.compiled.{size}"] = measure(
+            lambda: compiled.is_valid(task_definition), iterations
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            write_task_definitions(directory, cli_files, **SIZES[size])
+            results[f"cli.{size}"] = measure_cli(
+                directory, cli_files, repeat=1 if quick else 3
+            )
+
+        for name in sorted(key for key in results if key.endswith(f".{size}")):
+            print(f"{name:<24} {results[name]['ops_per_sec']:14.1f} ops/s")
+
+    for name, milliseconds in measure_startup(5 if quick else 20).items():
+        results[f"startup.{name}"] = {
+            "ops_per_sec": 1e3 / milliseconds,
+            "wall_ms": milliseconds,
+        }
+        print(f"startup.{name:<16} {milliseconds:14.1f} ms")
+
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Print the throughput change of every benchmark against a baseline.
+
+    Returns:
+    - bool: ``True`` if no benchmark lost more than ``threshold`` percent.
+    """
+    ok = True
+    print(f"\n{'benchmark':<24} {'baseline':>14} {'current':>14} {'change':>9}")
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["ops_per_sec"]
+        after = result["ops_per_sec"]
+        change = (after - before) / before * 100
+        marker = ""
+        if change < -threshold:
+            marker = "  REGRESSION"
+            ok = False
+        print(f"{name:<24} {before:14.1f} {after:14.1f} {change:+8.1f}%{marker}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations.")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        choices=sorted(SIZES),
+        default=list(SIZES),
+        help="Task definition sizes to benchmark.",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with a previous results file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Throughput loss in percent reported as a regression (default: 10).",
+    )
+    args = parser.parse_args(argv)
+
+    report = {"meta": metadata(), "results": run_suite(args.sizes, args.quick)}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if not compare(baseline["results"], report["results"], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
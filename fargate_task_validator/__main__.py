@@ -1,30 +1,49 @@
 #!/usr/bin/env python3
 
-import json
-from termcolor import colored
-from fargate_task_validator.validators.fargate_validator import (
-    check_fargate_compatibility,
+import argparse
+import os
+from fargate_task_validator.batch import (
+    expand_paths,
+    until_first_failure,
+    validate_files,
+    validate_revision,
+    validate_stream,
 )
-from fargate_task_validator.validators.recommendations import (
-    RECOMMENDATIONS,
-    REMEDIATIONS,
+from fargate_task_validator.profiling import RuleStats
+from fargate_task_validator.utils.json_loader import (
+    BACKEND_NAMES,
+    get_backend,
+    JSON_BACKEND_ENV,
+)
+from fargate_task_validator.watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL
+from fargate_task_validator.validators.rule_engine import (
+    DEFAULT_MEMO_ENTRIES,
+    RULES,
+)
+from fargate_task_validator.validators.schema_validator import (
+    DEFAULT_MAX_SCHEMA_ERRORS,
 )
-from jsonschema.exceptions import ValidationError
-from fargate_task_validator.validators.schema_validator import validator
 import sys
 
 
-def display_results(results):
-    max_length = (
-        max(map(len, results.keys())) + 4
-    )  # 4 is just a buffer for better visualization
+def colored(text, color):
+    # termcolor is imported on first use to keep start-up fast.
+    from termcolor import colored as termcolor_colored
+
+    return termcolor_colored(text, color)
+
+
+def display_results(results, failing_containers=None):
+    # Pad to the longest registered check, so the width does not depend on
+    # which checks reported. 4 is just a buffer for better visualization.
+    max_length = max(len(rule.name) for rule in RULES) + 4
     failures = []
 
     print("\nValidation Results:")
     print("--------------------")
 
     for key, value in results.items():
-        key_padding = max_length - len(key)
+        key_padding = max(max_length - len(key), 1)
 
         if value.startswith("OK"):
             status = colored(value, "green")
@@ -43,9 +62,16 @@ def display_results(results):
     )
 
     if failures:
+        from fargate_task_validator.validators.recommendations import (
+            RECOMMENDATIONS,
+            REMEDIATIONS,
+        )
+
         print("\nFailures:")
         for failure in failures:
             print(f"- {failure}")
+            if failing_containers and failure in failing_containers:
+                print(f"  Containers: {', '.join(failing_containers[failure])}")
             if failure in RECOMMENDATIONS:
                 print(f"  Recommendation: {RECOMMENDATIONS[failure]}")
             if failure in REMEDIATIONS:
@@ -53,29 +79,723 @@ def display_results(results):
         print("\n")
 
 
-def validate_task_definition(task_definition):
+class RunSummary:
+    """
+    Running totals of a validation run.
+
+    Only failures are remembered, so memory does not grow with the number of
+    passing task definitions.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.failed = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.over_provisioned = 0
+        self.hourly_savings = 0.0
+        self.stats = RuleStats()
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.fleet = None
+
+    def add(self, outcome):
+        self.total += 1
+        if self.fleet is not None:
+            self.fleet.add(outcome)
+        if outcome["stats"]:
+            self.stats.merge(outcome["stats"])
+        if outcome["memo"]:
+            self.memo_hits += outcome["memo"]["hits"]
+            self.memo_misses += outcome["memo"]["misses"]
+        if outcome["passed"]:
+            self.passed += 1
+        else:
+            reason = outcome["error"] or (
+                "schema" if outcome["schema_valid"] is False else "fargate"
+            )
+            self.failed.append((outcome["path"], reason))
+
+        if outcome["cache"] == "hit":
+            self.cache_hits += 1
+        elif outcome["cache"] == "miss":
+            self.cache_misses += 1
+
+        sizing = outcome["sizing"]
+        if sizing and sizing["over_provisioned"]:
+            self.over_provisioned += 1
+            self.hourly_savings += (
+                sizing["current_hourly_cost"] - sizing["recommended_hourly_cost"]
+            )
+
+    @property
+    def exit_code(self):
+        return 1 if self.failed else 0
+
+    def display(self, label="Files"):
+        failed_color = "red" if self.failed else "green"
+        print("\n" + "=" * 50)
+        print(
+            f"{label}: {self.total}, "
+            f"Passed: {colored(str(self.passed), 'green')}, "
+            f"Failed: {colored(str(len(self.failed)), failed_color)}"
+        )
+
+        if self.failed:
+            print(f"\nFailed {label.lower()}:")
+            for path, reason in self.failed:
+                print(f"- {path} ({reason})")
+
+    def display_sizing(self):
+        print(
+            f"Over-provisioned: {self.over_provisioned}, "
+            f"potential savings: ${self.hourly_savings:.4f}/hour"
+        )
+
+    def display_cache_counters(self):
+        print(f"Cache: {self.cache_hits} hits, {self.cache_misses} misses")
+
+    def display_memo_counters(self):
+        lookups = self.memo_hits + self.memo_misses
+        rate = self.memo_hits / lookups if lookups else 0.0
+        print(
+            f"Container memo: {self.memo_hits} hits, {self.memo_misses} misses "
+            f"({rate:.1%} hit rate)"
+        )
+
+    def write_fleet_report(self, path):
+        import json
+
+        summary = self.fleet.summary()
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(
+            f"Fleet report: {path} ({summary['invalid_sizes']} of "
+            f"{summary['task_definitions']} task definitions use an invalid "
+            "cpu/memory combination)"
+        )
+
+    def display_stats(self):
+        # Printed to standard error so machine-readable reports stay intact.
+        rows = self.stats.rows()
+        total = sum(row[3] for row in rows) or 1.0
+        print(
+            f"\n{'check':<30} {'calls':>8} {'failed':>8} {'total ms':>10} "
+            f"{'mean us':>9} {'share':>7}",
+            file=sys.stderr,
+        )
+        for name, calls, failures, seconds in rows:
+            print(
+                f"{name:<30} {calls:>8} {failures:>8} {seconds * 1e3:>10.2f} "
+                f"{seconds / calls * 1e6:>9.2f} {seconds / total:>7.1%}",
+                file=sys.stderr,
+            )
+        if not rows:
+            print("No checks were run, all results were cached.", file=sys.stderr)
+
+
+def format_sizing(sizing):
+    def size(value):
+        return f"{value[0]} CPU / {value[1]} MiB" if value else "none"
+
+    if sizing["recommended"] is None:
+        return f"no Fargate size covers {size(sizing['required'])}"
+    if sizing["current"] is None:
+        return f"not set, {size(sizing['recommended'])} covers the containers"
+    if sizing["over_provisioned"]:
+        return (
+            f"over-provisioned, {size(sizing['current'])} -> "
+            f"{size(sizing['recommended'])}"
+        )
+    return f"{size(sizing['current'])} is the cheapest valid size"
+
+
+def display_outcome(outcome, quiet=False, header=False):
+    if quiet:
+        if outcome["passed"]:
+            status = colored("PASS", "green")
+        else:
+            status = colored("FAIL", "red")
+        sizing = ""
+        if outcome["sizing"] and outcome["sizing"]["over_provisioned"]:
+            sizing = f" ({format_sizing(outcome['sizing'])})"
+        print(f"{status} {outcome['path']}{sizing}")
+        return
+
+    if header:
+        print(f"\n### {outcome['path']}")
+    if outcome["schema"] is not None:
+        print(outcome["schema"])
+    if outcome["error"]:
+        print(colored(outcome["error"], "red"))
+        return
+    display_results(outcome["results"], outcome["failing_containers"])
+    if outcome["incremental"]:
+        counts = outcome["incremental"]
+        print(
+            f"Incremental: {counts['evaluated']} checks run, "
+            f"{counts['reused']} reused from the previous revision"
+        )
+    if outcome["fail_fast"] and outcome["fail_fast"]["skipped"]:
+        print(f"Fail fast: {outcome['fail_fast']['skipped']} checks skipped")
+    if outcome["sizing"]:
+        print(f"Task size: {format_sizing(outcome['sizing'])}")
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+
+def shard_argument(value):
+    from fargate_task_validator.shard import parse_shard
+
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="fargate-validator",
+        description="Validate AWS ECS task definitions for Fargate compatibility.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Task definition files, directories or glob patterns. With "
+        "--stream, JSON Lines or JSON array files, or '-' for standard input. "
+        "With --cloudformation, templates or cdk.out directories.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read task definitions one at a time from JSON Lines or JSON array "
+        "input and print each result as soon as it is available.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_argument,
+        metavar="I/N",
+        help="Only validate the files of shard I of N (1 <= I <= N). Files are "
+        "assigned by a stable hash of their path, so adding files does not move "
+        "the others to another shard.",
+    )
+    parser.add_argument(
+        "--partial",
+        metavar="PATH",
+        help="Also write the results to a partial result file, to be combined "
+        "with the files of the other shards by --merge.",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Combine the partial result files given as paths into one report "
+        "and exit code, instead of validating.",
+    )
+    parser.add_argument(
+        "--base",
+        metavar="REF",
+        help="Only validate the task definition files changed since the merge "
+        "base of REF and --head (or the working tree, including untracked files "
+        "that are not ignored), as listed by git. Paths limit the diff.",
+    )
+    parser.add_argument(
+        "--head",
+        metavar="REF",
+        help="Head ref for --base. Files are read from this ref, so it does not "
+        "need to be checked out.",
+    )
+    parser.add_argument(
+        "--cloudformation",
+        action="store_true",
+        help="Validate the AWS::ECS::TaskDefinition resources of CloudFormation "
+        "templates (JSON or YAML) and cdk.out directories.",
+    )
+    parser.add_argument(
+        "--previous",
+        metavar="PATH",
+        help="Earlier revision of the task definition. Only the checks affected "
+        "by the changes since then are run again.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and validate files again as they change. Results "
+        "are redrawn in place, only changed files are checked again.",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, detect changes by polling instead of inotify.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SECONDS",
+        help="Polling interval with --watch, when inotify is not used "
+        f"(default: {DEFAULT_POLL_INTERVAL}).",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        metavar="SECONDS",
+        help="With --watch, wait until no file changed for this long before "
+        f"validating (default: {DEFAULT_DEBOUNCE}).",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="[HOST:]PORT",
+        help="Run a validation server on this address instead of validating files.",
+    )
+    parser.add_argument(
+        "--unix-socket",
+        metavar="PATH",
+        help="Run a validation server on this Unix socket.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Print one line per file instead of the full results.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "jsonl", "junit", "sarif"],
+        default="text",
+        help="Output format (default: text). jsonl, junit and sarif write each "
+        "result as soon as it is available.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="PATH",
+        help="Write the jsonl, junit or sarif report to this file instead of "
+        "standard output. The text results are still printed.",
+    )
+    parser.add_argument(
+        "--skip-schema",
+        action="store_true",
+        help="Only check Fargate compatibility, skip the task definition schema.",
+    )
+    parser.add_argument(
+        "--max-schema-errors",
+        type=non_negative_int,
+        default=DEFAULT_MAX_SCHEMA_ERRORS,
+        metavar="N",
+        help="Report at most N schema errors per task definition, 0 for all "
+        f"(default: {DEFAULT_MAX_SCHEMA_ERRORS}).",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop checking a task definition at its first failing check. Checks "
+        "run cheapest and most often failing first, and the schema is only "
+        "checked when they all pass.",
+    )
+    parser.add_argument(
+        "--fail-fast-batch",
+        action="store_true",
+        help="Like --fail-fast, and also stop the run at the first failing task "
+        "definition.",
+    )
+    parser.add_argument(
+        "--right-size",
+        action="store_true",
+        help="Recommend the cheapest valid cpu/memory combination covering the "
+        "containers and report over-provisioned tasks.",
+    )
+    parser.add_argument(
+        "--fleet-report",
+        metavar="PATH",
+        help="Write fleet statistics as JSON to PATH: failure rates per check, "
+        "task cpu/memory combinations against the Fargate tables and "
+        "ephemeralStorage sizes. Requires NumPy.",
+    )
+    parser.add_argument(
+        "--memoize",
+        action="store_true",
+        help="Check identical containers, such as shared sidecars, only once per "
+        "worker process and report the hit rate.",
+    )
+    parser.add_argument(
+        "--memo-size",
+        type=int,
+        default=DEFAULT_MEMO_ENTRIES,
+        metavar="N",
+        help="Number of distinct containers remembered by each worker with "
+        f"--memoize (default: {DEFAULT_MEMO_ENTRIES}).",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print the wall time, calls and failures of every check and of the "
+        "schema step to standard error. Results served from the cache are not "
+        "timed, combine with --no-cache to time every file.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Write a cProfile dump of the run to PATH, for pstats or snakeviz. "
+        "Validation runs in this process unless --workers is given.",
+    )
+    parser.add_argument(
+        "--json-backend",
+        choices=("auto",) + BACKEND_NAMES,
+        default=None,
+        help="JSON parser used to read task definitions (default: auto, the "
+        "first installed of orjson, ujson and simdjson, else the json module).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Validate every file, ignoring and not updating the result cache.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory of the result cache (default: ~/.cache/fargate-validator).",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=64,
+        help="Maximum size of the result cache in MiB (default: 64).",
+    )
+    args = parser.parse_args(argv)
+    if not args.paths and not (args.serve or args.unix_socket or args.base):
+        parser.error("at least one path is required")
+    if args.merge and (
+        args.shard
+        or args.partial
+        or args.stream
+        or args.previous
+        or args.cloudformation
+        or args.watch
+        or args.base
+    ):
+        parser.error("--merge only takes partial result files and report options")
+    if (args.shard or args.partial) and (
+        args.stream or args.previous or args.watch or args.base
+    ):
+        parser.error(
+            "--shard and --partial cannot be combined with --stream, --previous, "
+            "--watch or --base"
+        )
+    if args.head and not args.base:
+        parser.error("--head requires --base")
+    if args.base and (
+        args.stream or args.previous or args.cloudformation or args.watch
+    ):
+        parser.error(
+            "--base cannot be combined with --stream, --previous, "
+            "--cloudformation or --watch"
+        )
+    if args.previous and (args.stream or len(args.paths) != 1):
+        parser.error("--previous takes exactly one path and no --stream")
+    if args.cloudformation and (args.stream or args.previous):
+        parser.error("--cloudformation cannot be combined with --stream or --previous")
+    if args.watch and (
+        args.stream or args.previous or args.cloudformation or args.format != "text"
+    ):
+        parser.error(
+            "--watch cannot be combined with --stream, --previous, "
+            "--cloudformation or --format"
+        )
+    if args.fail_fast_batch:
+        args.fail_fast = True
+    if args.fail_fast and (
+        args.previous or args.watch or args.memoize or args.fleet_report
+    ):
+        # Checks skipped by --fail-fast would count as not applicable in the
+        # fleet report.
+        parser.error(
+            "--fail-fast cannot be combined with --previous, --watch, --memoize "
+            "or --fleet-report"
+        )
+    if args.json_backend:
+        try:
+            get_backend(args.json_backend)
+        except ImportError:
+            parser.error(f"JSON backend '{args.json_backend}' is not installed")
+    if args.profile and args.workers is None:
+        # Worker processes would not show up in the profile.
+        args.workers = 1
+    return args
+
+
+def validation_options(args):
+    """Options passed on to ``validate_document``."""
+    return {
+        "right_size": args.right_size,
+        "skip_schema": args.skip_schema,
+        "max_schema_errors": args.max_schema_errors or None,
+        "stats": args.stats,
+        "memoize": args.memoize,
+        "memo_size": args.memo_size,
+        "fleet": bool(args.fleet_report),
+        "fail_fast": args.fail_fast,
+    }
+
+
+def serve(args):
+    from fargate_task_validator.server import create_server, parse_address
+
+    address = args.unix_socket or parse_address(args.serve)
+    server = create_server(
+        address,
+        workers=args.workers or os.cpu_count() or 1,
+        quiet=args.quiet,
+        **validation_options(args),
+    )
+    print(f"Serving on {address}. POST task definitions to /validate.")
     try:
-        validator.validate(task_definition)
-        return "Task definition schema is valid!"
-    except ValidationError as e:
-        return f"Task definition schema is invalid! {e}"
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def shard_paths(args, paths):
+    """Select the paths of the ``--shard`` of this run, if any."""
+    if not args.shard:
+        return paths
+    from fargate_task_validator.shard import select_shard
+
+    return select_shard(paths, *args.shard)
+
+
+def display_watch(session, watcher, validated):
+    if sys.stdout.isatty():
+        # Redraw in place: move the cursor home and clear the screen.
+        print("\x1b[H\x1b[2J", end="")
+    else:
+        print("\n" + "=" * 50)
+    summary = RunSummary()
+    for outcome in session.outcomes:
+        summary.add(outcome)
+        display_outcome(outcome, quiet=True)
+    # Details of the files that were just validated and failed.
+    for outcome in validated:
+        if not outcome["passed"]:
+            display_outcome(outcome, header=True)
+    summary.display()
+    print(
+        f"\nWatching {len(session.outcomes)} files ({watcher.name}), "
+        f"{len(validated)} validated. Press Ctrl+C to stop."
+    )
+    sys.stdout.flush()
+
+
+def watch(args, cache=None):
+    from fargate_task_validator.watch import (
+        create_watcher,
+        debounced_changes,
+        WatchSession,
+        WatchTargets,
+    )
+
+    targets = WatchTargets(args.paths)
+    session = WatchSession(targets, cache=cache, **validation_options(args))
+    # Start watching before the first run, so no change is missed.
+    watcher = create_watcher(targets, polling=args.poll, interval=args.poll_interval)
+    try:
+        display_watch(session, watcher, session.refresh())
+        for changed in debounced_changes(watcher, args.debounce):
+            display_watch(session, watcher, session.refresh(changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if cache is not None:
+            cache.prune()
+
+
+def report(args, outcomes, summary):
+    from fargate_task_validator.reporters import REPORTERS
+
+    stream = open(args.output, "w") if args.output else sys.stdout
+    try:
+        reporter = REPORTERS[args.format](stream)
+        reporter.start()
+        for outcome in outcomes:
+            summary.add(outcome)
+            reporter.add(outcome)
+        reporter.finish()
+    finally:
+        if args.output:
+            stream.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.profile:
+        run(args)
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run(args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+
+def run(args):
+    if args.json_backend:
+        # Also selects the backend in worker processes.
+        os.environ[JSON_BACKEND_ENV] = args.json_backend
+    if args.serve or args.unix_socket:
+        serve(args)
+        return
+
+    cache = None
+    if not args.no_cache:
+        from fargate_task_validator.cache import ResultCache
+
+        cache = ResultCache(args.cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+
+    if args.watch:
+        watch(args, cache)
+        return
+
+    if args.merge:
+        from fargate_task_validator.shard import merge_partials
+
+        try:
+            outcomes = merge_partials(args.paths)
+        except (OSError, ValueError) as e:
+            sys.exit(f"fargate-validator: {e}")
+        label, header = "Files", True
+    elif args.previous:
+        outcomes = [
+            validate_revision(
+                args.previous,
+                args.paths[0],
+                cache=cache,
+                **validation_options(args),
+            )
+        ]
+        label, header = "Files", False
+    elif args.base:
+        from fargate_task_validator.git import GitError, validate_changed
+
+        try:
+            outcomes = validate_changed(
+                args.base,
+                args.head,
+                args.paths,
+                workers=args.workers,
+                cache=cache,
+                **validation_options(args),
+            )
+        except GitError as e:
+            sys.exit(f"fargate-validator: {e}")
+        label, header = "Files", True
+    elif args.cloudformation:
+        from fargate_task_validator.cloudformation import (
+            expand_template_paths,
+            validate_templates,
+        )
+
+        paths = expand_template_paths(args.paths)
+        if not paths:
+            print("No CloudFormation templates found.")
+            sys.exit(1)
+        paths = shard_paths(args, paths)
+        outcomes = validate_templates(
+            paths,
+            workers=args.workers,
+            cache=cache,
+            **validation_options(args),
+        )
+        label, header = "Task definitions", True
+    elif args.stream:
+        outcomes = validate_stream(
+            args.paths,
+            workers=args.workers,
+            cache=cache,
+            **validation_options(args),
+        )
+        label, header = "Task definitions", True
+    else:
+        paths = expand_paths(args.paths)
+        if not paths:
+            print("No task definition files found.")
+            sys.exit(1)
+        paths = shard_paths(args, paths)
+        outcomes = validate_files(
+            paths,
+            workers=args.workers,
+            cache=cache,
+            **validation_options(args),
+        )
+        label, header = "Files", len(paths) > 1
 
+    if args.fail_fast_batch:
+        outcomes = until_first_failure(outcomes)
+    if args.partial:
+        from fargate_task_validator.shard import record_partial
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: fargate-validator <path_to_task_definition>")
-        sys.exit(1)
+        index, count = args.shard or (1, 1)
+        outcomes = record_partial(outcomes, args.partial, index, count)
 
-    task_definition_path = sys.argv[1]
+    summary = RunSummary()
+    if args.fleet_report:
+        from fargate_task_validator.fleet import FleetReport
 
-    with open(task_definition_path, "r") as f:
-        task_definition_str = f.read()
+        try:
+            summary.fleet = FleetReport()
+        except ImportError as e:
+            sys.exit(f"fargate-validator: {e}")
+    if args.format == "text":
+        for outcome in outcomes:
+            summary.add(outcome)
+            display_outcome(outcome, quiet=args.quiet, header=header)
+    else:
+        report(args, outcomes, summary)
+        if not args.output:
+            if args.fleet_report:
+                summary.write_fleet_report(args.fleet_report)
+            if args.stats:
+                summary.display_stats()
+            sys.exit(summary.exit_code)
+        # The report went to a file, summarize the run on the terminal too.
+        header = True
 
-    result = validate_task_definition(json.loads(task_definition_str))
-    print(result)
+    if header or args.quiet:
+        summary.display(label)
+    if args.fail_fast_batch and summary.failed:
+        print("Stopped at the first failure (--fail-fast-batch).")
+    if args.right_size:
+        summary.display_sizing()
+    if cache is not None:
+        summary.display_cache_counters()
+    if args.memoize:
+        summary.display_memo_counters()
+    if args.fleet_report:
+        summary.write_fleet_report(args.fleet_report)
+    if args.stats:
+        summary.display_stats()
 
-    results = check_fargate_compatibility(task_definition_str)
-    display_results(results)
+    sys.exit(summary.exit_code)
 
 
 if __name__ == "__main__":
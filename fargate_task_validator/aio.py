@@ -0,0 +1,102 @@
+import asyncio
+import os
+from functools import partial
+
+from fargate_task_validator.batch import (
+    new_outcome,
+    validate_document,
+    validate_file,
+)
+
+DEFAULT_CONCURRENCY = 8
+
+
+def _validate_source(label, source, **options):
+    if isinstance(source, (str, os.PathLike)):
+        return validate_file(os.fspath(source), **options)
+    outcome = new_outcome(label)
+    if not isinstance(source, dict):
+        outcome["error"] = "Task definition must be a JSON object."
+        return outcome
+    return validate_document(source, outcome, **options)
+
+
+async def _iterate(sources):
+    if hasattr(sources, "__aiter__"):
+        async for source in sources:
+            yield source
+    else:
+        for source in sources:
+            yield source
+
+
+async def validate_many(
+    sources, concurrency=DEFAULT_CONCURRENCY, executor=None, **options
+):
+    """
+    Validate many task definitions concurrently without blocking the event loop.
+
+    File reads and checks run in ``executor``. At most ``concurrency`` sources
+    are in flight at once and sources are pulled lazily, so ``sources`` may be
+    a large or unbounded (async) iterator. Results are yielded as soon as each
+    one finishes, so a slow or huge definition does not hold up the others.
+
+    Args:
+    - sources (iterable | async iterable): Paths of task definition files, or
+      already parsed task definitions.
+    - concurrency (int): Maximum number of validations in flight.
+    - executor (concurrent.futures.Executor): Where validations run. Defaults
+      to the event loop's thread pool. Pass a ``ProcessPoolExecutor`` to use
+      several CPU cores.
+    - options: Passed on to ``validate_document``, e.g. ``cache``.
+
+    Returns:
+    - async generator: Outcome dicts as returned by ``validate_file``, in
+      completion order. Parsed task definitions are labeled
+      ``<document N>``, where ``N`` is their position in ``sources``.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    pending = set()
+    labels = {}
+    index = 0
+    sources = _iterate(sources)
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    source = await sources.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                label = f"<document {index}>"
+                if isinstance(source, (str, os.PathLike)):
+                    label = os.fspath(source)
+                index += 1
+                future = loop.run_in_executor(
+                    executor, partial(_validate_source, label, source, **options)
+                )
+                labels[future] = label
+                pending.add(future)
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                label = labels.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = new_outcome(label)
+                    outcome["error"] = f"Validation failed: {e}"
+                yield outcome
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,513 @@
+import glob
+import os
+import sys
+from collections import deque
+from functools import partial
+from time import perf_counter
+
+from fargate_task_validator.fleet import fleet_fields
+from fargate_task_validator.profiling import RuleStats
+from fargate_task_validator.utils.json_loader import (
+    iter_json_records,
+    load_json_file,
+)
+from fargate_task_validator.validators.fargate_validator import (
+    collect_findings,
+)
+from fargate_task_validator.validators.rule_engine import (
+    changed_keys,
+    ContainerMemo,
+    DEFAULT_MEMO_ENTRIES,
+    evaluate_fail_fast,
+    evaluate_incremental,
+    failing_containers,
+    findings_from_list,
+    findings_to_list,
+    rule_order,
+    summarize,
+)
+from fargate_task_validator.validators.sizing import recommend_size
+from fargate_task_validator.validators.schema_validator import (
+    format_schema_errors,
+    revalidate_schema_errors,
+    schema_errors,
+    DEFAULT_MAX_SCHEMA_ERRORS,
+)
+
+GLOB_CHARACTERS = set("*?[")
+
+# Container results memoized by this process, see ``container_memo``.
+_container_memo = None
+
+
+def is_json_name(name):
+    return name.endswith(".json")
+
+
+def expand_paths(patterns, select=is_json_name):
+    """
+    Expand files, directories and glob patterns into a list of task definition files.
+
+    Directories are searched recursively for ``*.json`` files. Paths are returned
+    in the order they were given, with duplicates removed.
+
+    Args:
+    - patterns (list): File paths, directory paths or glob patterns.
+    - select (callable): Selects the files of a directory by their name.
+      Defaults to ``*.json`` files.
+
+    Returns:
+    - list: Paths of the task definition files to validate.
+    """
+    paths = []
+    seen = set()
+
+    def add(path):
+        normalized = os.path.normpath(path)
+        if normalized not in seen:
+            seen.add(normalized)
+            paths.append(path)
+
+    for pattern in patterns:
+        if GLOB_CHARACTERS & set(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+
+        for match in matches:
+            if os.path.isdir(match):
+                for root, dirs, files in os.walk(match):
+                    dirs.sort()
+                    for name in sorted(files):
+                        if select(name):
+                            add(os.path.join(root, name))
+            else:
+                add(match)
+
+    return paths
+
+
+def container_memo(max_entries=DEFAULT_MEMO_ENTRIES):
+    """
+    Return the container memo of this process, creating it on first use.
+
+    Every worker process keeps its own memo for the whole run.
+    """
+    global _container_memo
+    if _container_memo is None:
+        _container_memo = ContainerMemo(max_entries)
+    _container_memo.max_entries = max_entries
+    return _container_memo
+
+
+def new_outcome(path=None):
+    return {
+        "path": path,
+        "error": None,
+        "schema": None,
+        "schema_valid": False,
+        "schema_errors": [],
+        "results": {},
+        "failing_containers": {},
+        "findings": [],
+        "passed": False,
+        "cache": None,
+        "sizing": None,
+        "incremental": None,
+        "stats": None,
+        "memo": None,
+        "resource": None,
+        "fleet": None,
+        "fail_fast": None,
+    }
+
+
+def validate_file(path, cache=None, **options):
+    """
+    Run the schema and Fargate compatibility checks for a single file.
+
+    Args:
+    - path (str): Path to the task definition file.
+    - cache (ResultCache): Cache to serve and store results. Optional.
+    - options: Passed on to ``validate_document``.
+
+    Returns:
+    - dict: Validation outcome with the keys ``path``, ``error``, ``schema``,
+      ``schema_valid``, ``schema_errors`` (see ``schema_errors``),
+      ``results``, ``failing_containers``, ``findings``
+      (``[container, check, status]`` items), ``passed``, ``cache``
+      (``"hit"``, ``"miss"`` or ``None`` when no cache is used), ``sizing``
+      ``incremental``, ``stats``, ``memo``, ``fleet``, ``fail_fast`` (see
+      ``validate_document``) and ``resource`` (see ``validate_templates``).
+    """
+    outcome = new_outcome(path)
+
+    try:
+        task_definition = load_json_file(path)
+    except (OSError, ValueError) as e:
+        outcome["error"] = f"Could not load task definition: {e}"
+        return outcome
+
+    return validate_document(task_definition, outcome, cache=cache, **options)
+
+
+def validate_document(
+    task_definition,
+    outcome=None,
+    cache=None,
+    right_size=False,
+    skip_schema=False,
+    max_schema_errors=DEFAULT_MAX_SCHEMA_ERRORS,
+    previous=None,
+    stats=False,
+    memoize=False,
+    memo_size=DEFAULT_MEMO_ENTRIES,
+    fleet=False,
+    fail_fast=False,
+):
+    """
+    Run the schema and Fargate compatibility checks for a parsed task definition.
+
+    Both checks share the same parsed document.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+    - outcome (dict): Outcome to fill in. A new one is created when omitted.
+    - cache (ResultCache): Cache to serve and store results. Optional.
+    - right_size (bool): Also recommend the cheapest valid task size, stored
+      in ``outcome["sizing"]`` as returned by ``recommend_size``.
+    - skip_schema (bool): Only check Fargate compatibility. ``schema`` and
+      ``schema_valid`` are left as ``None``.
+    - max_schema_errors (int): Report at most this many schema errors.
+      ``None`` reports all of them.
+    - previous (tuple): ``(task_definition, outcome)`` of an earlier revision.
+      Only the checks and schema properties affected by the changes are run
+      again, the other findings are reused. ``outcome["incremental"]`` then
+      holds the number of rule checks ``evaluated`` and ``reused``.
+    - stats (bool): Time every check and the schema step. The statistics are
+      stored in ``outcome["stats"]`` in ``RuleStats.as_dict()`` form. Results
+      served from the cache have none.
+    - memoize (bool): Check identical containers once per process, using
+      ``container_memo``. ``outcome["memo"]`` then holds the memo ``hits``
+      and ``misses`` of this task definition. The task definition must not
+      be modified afterwards, see ``ContainerMemo``.
+    - memo_size (int): Maximum number of containers remembered.
+    - fleet (bool): Store the fields summarized by ``FleetReport`` in
+      ``outcome["fleet"]``, as returned by ``fleet_fields``.
+    - fail_fast (bool): Stop at the first failing check. The checks run
+      cheapest first, in the order of ``rule_order``, and the schema is only
+      checked, up to its first error, when they all pass. ``results`` then
+      only hold the checks that ran and ``outcome["fail_fast"]`` the number
+      of checks ``evaluated`` and ``skipped``. ``previous`` and ``memoize``
+      are ignored.
+
+    Returns:
+    - dict: Validation outcome, see ``validate_file``.
+    """
+    if outcome is None:
+        outcome = new_outcome()
+
+    if right_size:
+        try:
+            outcome["sizing"] = recommend_size(task_definition)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            outcome["error"] = f"Could not recommend a task size: {e}"
+            return outcome
+    if fleet:
+        outcome["fleet"] = fleet_fields(task_definition)
+
+    key = None
+    if cache is not None:
+        variant = "skip-schema" if skip_schema else f"max-errors={max_schema_errors}"
+        if fail_fast:
+            variant += ",fail-fast"
+        key = cache.key_for(task_definition, variant)
+        cached = cache.get(key)
+        if cached is not None:
+            outcome.update(cached)
+            outcome["cache"] = "hit"
+            return outcome
+        outcome["cache"] = "miss"
+
+    rule_stats = RuleStats() if stats else None
+
+    if previous is not None and not fail_fast and previous[1]["error"] is None:
+        previous_definition, previous_outcome = previous
+        changed = changed_keys(previous_definition, task_definition)
+    else:
+        previous = changed = None
+
+    if skip_schema or fail_fast:
+        outcome["schema"] = outcome["schema_valid"] = None
+    elif previous is not None and previous_outcome["schema_valid"] is True:
+        _check_schema(
+            outcome,
+            partial(revalidate_schema_errors, task_definition, changed),
+            max_schema_errors,
+            rule_stats,
+        )
+    else:
+        _check_schema(
+            outcome,
+            partial(schema_errors, task_definition),
+            max_schema_errors,
+            rule_stats,
+        )
+
+    try:
+        if fail_fast:
+            findings, outcome["fail_fast"] = evaluate_fail_fast(
+                task_definition, rule_order(), stats=rule_stats
+            )
+        elif previous is not None and changed is not None:
+            findings, outcome["incremental"] = evaluate_incremental(
+                previous_definition,
+                findings_from_list(previous_outcome["findings"]),
+                task_definition,
+                stats=rule_stats,
+            )
+        elif memoize:
+            # Counted per call, other threads share the memo of the process.
+            outcome["memo"] = {"hits": 0, "misses": 0}
+            findings = collect_findings(
+                task_definition,
+                stats=rule_stats,
+                memo=container_memo(memo_size),
+                memo_counts=outcome["memo"],
+            )
+        else:
+            findings = collect_findings(task_definition, stats=rule_stats)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        outcome["error"] = f"Could not check Fargate compatibility: {e}"
+        return outcome
+    finally:
+        if rule_stats is not None:
+            outcome["stats"] = rule_stats.as_dict()
+
+    outcome["results"] = summarize(findings)
+    if fail_fast and not skip_schema:
+        if not any(value.startswith("FAIL") for value in outcome["results"].values()):
+            # Checked last, the schema costs more than all the rules together.
+            schema = partial(schema_errors, task_definition)
+            _check_schema(outcome, schema, 1, rule_stats)
+            if rule_stats is not None:
+                outcome["stats"] = rule_stats.as_dict()
+    outcome["failing_containers"] = failing_containers(findings)
+    outcome["findings"] = findings_to_list(findings)
+    outcome["passed"] = outcome["schema_valid"] is not False and not any(
+        value.startswith("FAIL") for value in outcome["results"].values()
+    )
+    if key is not None:
+        cache.put(key, outcome)
+    return outcome
+
+
+def _check_schema(outcome, collect_errors, max_errors, rule_stats):
+    start = perf_counter()
+    errors = collect_errors(max_errors)
+    if rule_stats is not None:
+        status = "FAIL" if errors else "OK"
+        rule_stats.record("schema", perf_counter() - start, status)
+    outcome["schema_errors"] = errors
+    outcome["schema"] = format_schema_errors(errors, max_errors)
+    outcome["schema_valid"] = not errors
+
+
+def until_first_failure(outcomes):
+    """
+    Stop a run at its first failing outcome.
+
+    Returns:
+    - generator: The outcomes up to and including the first one that did not
+      pass. The remaining ones are not validated.
+    """
+    try:
+        for outcome in outcomes:
+            yield outcome
+            if not outcome["passed"]:
+                return
+    finally:
+        # Closing a validation generator cancels its pending work.
+        close = getattr(outcomes, "close", None)
+        if close is not None:
+            close()
+
+
+def validate_files(paths, workers=None, cache=None, **options):
+    """
+    Validate many task definition files, optionally in a process pool.
+
+    Results are yielded in the same order as ``paths``.
+
+    Args:
+    - paths (list): Paths of the task definition files.
+    - workers (int): Number of worker processes. Defaults to the CPU count;
+      ``1`` validates in the current process.
+    - cache (ResultCache): Cache to serve and store results. Optional. It is
+      pruned to its size bound once every file has been validated.
+    - options: Passed on to ``validate_document``.
+
+    Returns:
+    - generator: One outcome dict per path, as returned by ``validate_file``.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths)))
+
+    validate = partial(validate_file, cache=cache, **options)
+    if workers == 1:
+        yield from map(validate, paths)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(validate, paths, chunksize=chunksize)
+
+    if cache is not None:
+        cache.prune()
+
+
+def validate_revision(previous_path, path, cache=None, **options):
+    """
+    Validate a task definition file against an earlier revision of it.
+
+    The earlier revision is validated first, which is a cache hit when it was
+    validated before. Only the checks affected by the differences between the
+    two revisions are then run on ``path``.
+
+    Args:
+    - previous_path (str): Path to the earlier revision.
+    - path (str): Path to the new revision.
+    - cache (ResultCache): Cache to serve and store results. Optional.
+    - options: Passed on to ``validate_document``.
+
+    Returns:
+    - dict: Validation outcome of ``path``, see ``validate_file``.
+    """
+    outcome = new_outcome(path)
+    try:
+        previous_definition = load_json_file(previous_path)
+        task_definition = load_json_file(path)
+    except (OSError, ValueError) as e:
+        outcome["error"] = f"Could not load task definition: {e}"
+        return outcome
+
+    previous_outcome = validate_document(
+        previous_definition, new_outcome(previous_path), cache=cache, **options
+    )
+    return validate_document(
+        task_definition,
+        outcome,
+        cache=cache,
+        previous=(previous_definition, previous_outcome),
+        **options,
+    )
+
+
+def unwrap_task_definition(document):
+    """
+    Return the task definition of a ``describe-task-definition`` response.
+
+    Other documents are returned unchanged.
+    """
+    if (
+        isinstance(document, dict)
+        and "containerDefinitions" not in document
+        and isinstance(document.get("taskDefinition"), dict)
+    ):
+        return document["taskDefinition"]
+    return document
+
+
+def _validate_labeled_document(item, cache=None, **options):
+    label, document, error = item
+    outcome = new_outcome(label)
+    if error is not None:
+        outcome["error"] = error
+        return outcome
+    if not isinstance(document, dict):
+        outcome["error"] = "Task definition must be a JSON object."
+        return outcome
+    return validate_document(document, outcome, cache=cache, **options)
+
+
+def _ordered_map(func, items, workers):
+    # Like executor.map, but only keeps a bounded number of items in flight so
+    # an unbounded input stream is never read ahead entirely.
+    if workers == 1:
+        yield from map(func, items)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_stream_documents(path):
+    """
+    Read task definitions one at a time from a JSON Lines or JSON array file.
+
+    Args:
+    - path (str): Path of the file, or ``-`` for standard input.
+
+    Returns:
+    - generator: ``(label, task_definition, error)`` tuples, where the label
+      names the source and the position of the document in it. Malformed
+      documents carry an ``error`` message and no task definition, and the
+      documents after them are still read.
+    """
+    source = "<stdin>" if path == "-" else path
+    stream = sys.stdin if path == "-" else open(path, "r")
+    try:
+        for index, (document, error) in enumerate(iter_json_records(stream)):
+            label = f"{source}[{index}]"
+            if error is not None:
+                yield label, None, f"Could not parse task definition: {error}"
+            else:
+                yield label, unwrap_task_definition(document), None
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def validate_stream(paths, workers=None, cache=None, **options):
+    """
+    Validate task definitions streamed from JSON Lines or JSON array files.
+
+    Documents are read lazily and results are yielded in input order as soon as
+    they are available, so memory use does not grow with the input size.
+
+    Args:
+    - paths (list): Paths of the files, ``-`` reads standard input.
+    - workers (int): Number of worker processes. Defaults to the CPU count.
+    - cache (ResultCache): Cache to serve and store results. Optional.
+    - options: Passed on to ``validate_document``.
+
+    Returns:
+    - generator: One outcome dict per document, labeled ``<path>[<index>]``. A
+      file that cannot be read, and every malformed document, adds an outcome
+      carrying the error.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def items():
+        for path in paths:
+            try:
+                yield from iter_stream_documents(path)
+            except (OSError, ValueError) as e:
+                yield path, None, f"Could not read task definitions: {e}"
+
+    validate = partial(_validate_labeled_document, cache=cache, **options)
+    yield from _ordered_map(validate, items(), max(1, workers))
+
+    if cache is not None:
+        cache.prune()
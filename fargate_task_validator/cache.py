@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+
+from fargate_task_validator.utils.json_loader import load_json_file
+from fargate_task_validator.validators.fargate_validator import RULESET_VERSION
+from fargate_task_validator.validators.rule_engine import RULES
+from fargate_task_validator.validators.schema_validator import task_definition_schema
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Outcome fields stored in the cache. Everything else describes the input
+# (e.g. its path) and is filled in by the caller.
+CACHED_FIELDS = (
+    "schema",
+    "schema_valid",
+    "schema_errors",
+    "results",
+    "failing_containers",
+    "findings",
+    "passed",
+)
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "fargate-validator")
+
+
+def canonical_json(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def ruleset_fingerprint():
+    """
+    Identify the ruleset and schema that produced a cached result.
+
+    Returns:
+    - str: Hex digest that changes whenever ``RULESET_VERSION``, the registered
+      rules, the task definition schema or the cached fields change.
+    """
+    digest = hashlib.sha256()
+    digest.update(str(RULESET_VERSION).encode())
+    digest.update("\0".join(CACHED_FIELDS).encode())
+    digest.update("\0".join(rule.name for rule in RULES).encode())
+    digest.update(canonical_json(task_definition_schema).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk, content-addressed cache of validation outcomes.
+
+    Entries are keyed by a hash of the canonicalized task definition and the
+    ruleset fingerprint, so the cache never serves results produced by other
+    rules or another schema. The total size is bounded and the least recently
+    used entries are evicted first by ``prune``.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.fingerprint = ruleset_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # Worker processes start with fresh counters.
+        state = dict(self.__dict__)
+        state["hits"] = state["misses"] = 0
+        return state
+
+    def key_for(self, task_definition, variant=""):
+        """
+        Hash a task definition into its cache key.
+
+        Args:
+        - task_definition (dict): Parsed task definition.
+        - variant (str): Names the options that change the result, such as a
+          skipped schema check, so their results are cached separately.
+
+        Returns:
+        - str: Hex digest.
+        """
+        digest = hashlib.sha256(self.fingerprint.encode())
+        digest.update(variant.encode() + b"\0")
+        digest.update(canonical_json(task_definition).encode())
+        return digest.hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """
+        Look up a cached outcome and mark it as recently used.
+
+        Returns:
+        - dict: The cached outcome fields, or ``None`` on a miss.
+        """
+        path = self.path_for(key)
+        try:
+            entry = load_json_file(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, outcome):
+        import tempfile
+
+        path = self.path_for(key)
+        entry = {field: outcome[field] for field in CACHED_FIELDS}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # A cache that cannot be written only costs speed, not correctness.
+            pass
+
+    def prune(self):
+        """
+        Evict least recently used entries until the cache fits in ``max_bytes``.
+
+        Returns:
+        - int: Number of evicted entries.
+        """
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        return evicted
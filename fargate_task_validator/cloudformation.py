@@ -0,0 +1,300 @@
+import os
+from functools import partial
+
+from fargate_task_validator.batch import (
+    _ordered_map,
+    expand_paths,
+    new_outcome,
+    validate_document,
+)
+from fargate_task_validator.utils.json_loader import loads
+
+TASK_DEFINITION_TYPE = "AWS::ECS::TaskDefinition"
+
+# File names picked up when a directory is searched, e.g. the templates that
+# ``cdk synth`` writes to ``cdk.out`` (and its nested ``assembly-*`` folders).
+TEMPLATE_SUFFIXES = (
+    ".template.json",
+    ".template.yaml",
+    ".template.yml",
+    ".template",
+)
+TEMPLATE_NAMES = ("template.json", "template.yaml", "template.yml")
+
+# CloudFormation property names that do not map to the API name by lowercasing
+# their first letter.
+RENAMED_PROPERTIES = {
+    "EFSVolumeConfiguration": "efsVolumeConfiguration",
+    "FSxWindowsFileServerVolumeConfiguration": (
+        "fsxWindowsFileServerVolumeConfiguration"
+    ),
+    "FilesystemId": "fileSystemId",
+    "IAM": "iam",
+    "ProxyConfigurationProperties": "properties",
+}
+
+# Properties whose value is a free-form map. Their keys are kept as they are.
+MAP_PROPERTIES = frozenset(["DockerLabels", "DriverOpts", "Labels", "Options"])
+
+# Task level properties that are strings in the ECS API, but may be numbers
+# in a template.
+STRING_PROPERTIES = frozenset(["Cpu", "Memory"])
+
+NO_VALUE = "AWS::NoValue"
+
+# Stands in for properties removed with {"Ref": "AWS::NoValue"}.
+_REMOVED = object()
+
+
+def is_template_name(name):
+    return name in TEMPLATE_NAMES or name.endswith(TEMPLATE_SUFFIXES)
+
+
+def expand_template_paths(patterns):
+    """
+    Expand files, directories and glob patterns into a list of templates.
+
+    Directories are searched recursively for ``*.template.json`` (as written by
+    ``cdk synth``), ``*.template.yaml``, ``*.template.yml``, ``*.template`` and
+    ``template.{json,yaml,yml}`` files. Files given explicitly are always read.
+
+    Args:
+    - patterns (list): File paths, directory paths or glob patterns.
+
+    Returns:
+    - list: Paths of the templates to read.
+    """
+    return expand_paths(patterns, select=is_template_name)
+
+
+def _yaml_loader():
+    # PyYAML is only needed for YAML templates.
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("PyYAML is required to read YAML templates") from None
+
+    class TemplateLoader(yaml.SafeLoader):
+        pass
+
+    def construct_tag(loader, suffix, node):
+        # !Ref Name and !GetAtt Name.Attribute are shorthands for
+        # {"Ref": ...} and {"Fn::GetAtt": [...]}, the other tags for Fn::*.
+        if isinstance(node, yaml.ScalarNode):
+            value = loader.construct_scalar(node)
+        elif isinstance(node, yaml.SequenceNode):
+            value = loader.construct_sequence(node, deep=True)
+        else:
+            value = loader.construct_mapping(node, deep=True)
+        if suffix == "Ref":
+            return {"Ref": value}
+        if suffix == "GetAtt" and isinstance(value, str):
+            value = value.split(".", 1)
+        return {f"Fn::{suffix}": value}
+
+    TemplateLoader.add_multi_constructor("!", construct_tag)
+    return TemplateLoader
+
+
+def load_template(path):
+    """
+    Read a CloudFormation template in JSON or YAML.
+
+    Args:
+    - path (str): Path to the template.
+
+    Returns:
+    - dict: Parsed template.
+
+    Raises:
+    - OSError: The file cannot be read.
+    - ValueError: The file is not a JSON or YAML template.
+    """
+    with open(path, "rb") as f:
+        text = f.read()
+    if text.lstrip().startswith(b"{"):
+        template = loads(text)
+    else:
+        loader = _yaml_loader()
+        import yaml
+
+        try:
+            template = yaml.load(text, Loader=loader)
+        except yaml.YAMLError as e:
+            raise ValueError(str(e)) from None
+    if not isinstance(template, dict):
+        raise ValueError("Template must be a JSON or YAML object.")
+    return template
+
+
+def _unresolved(name, value):
+    if name == "Ref":
+        return f"<Ref {value}>"
+    if name == "Fn::GetAtt" and isinstance(value, list):
+        return f"<Fn::GetAtt {'.'.join(str(part) for part in value)}>"
+    return f"<{name}>"
+
+
+def _resolve(value, parameters):
+    if isinstance(value, dict):
+        if len(value) == 1:
+            ((name, argument),) = value.items()
+            if name == "Ref":
+                if argument == NO_VALUE:
+                    return _REMOVED
+                if "Default" in parameters.get(argument, {}):
+                    return parameters[argument]["Default"]
+                return _unresolved(name, argument)
+            if name.startswith("Fn::"):
+                return _unresolved(name, argument)
+    return value
+
+
+def to_task_definition(properties, parameters=None):
+    """
+    Map the properties of an ``AWS::ECS::TaskDefinition`` to the ECS API shape.
+
+    PascalCase property names become the camelCase names of the API, e.g.
+    ``ContainerDefinitions`` becomes ``containerDefinitions``. References to
+    template parameters are replaced with their default values and
+    ``{"Ref": "AWS::NoValue"}`` removes a property. Other intrinsic functions
+    cannot be resolved without deploying the stack and are replaced with a
+    placeholder string such as ``"<Fn::GetAtt TaskRole.Arn>"``.
+
+    Args:
+    - properties (dict): ``Properties`` of the resource.
+    - parameters (dict): ``Parameters`` of the template. Optional.
+
+    Returns:
+    - dict: Task definition, as expected by ``check_fargate_compatibility``.
+    """
+    parameters = parameters or {}
+
+    def convert(value, keep_keys=False):
+        value = _resolve(value, parameters)
+        if isinstance(value, list):
+            items = (convert(item) for item in value)
+            return [item for item in items if item is not _REMOVED]
+        if not isinstance(value, dict):
+            return value
+        converted = {}
+        for key, item in value.items():
+            item = convert(item, keep_keys=key in MAP_PROPERTIES)
+            if item is _REMOVED:
+                continue
+            if not keep_keys:
+                key = RENAMED_PROPERTIES.get(key) or key[:1].lower() + key[1:]
+            converted[key] = item
+        return converted
+
+    task_definition = convert(properties)
+    for key in STRING_PROPERTIES:
+        key = key.lower()
+        value = task_definition.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            task_definition[key] = str(value)
+    return task_definition
+
+
+def extract_task_definitions(template):
+    """
+    Find the ``AWS::ECS::TaskDefinition`` resources of a template.
+
+    Args:
+    - template (dict): Parsed template, see ``load_template``.
+
+    Returns:
+    - list: ``(logical_id, task_definition)`` pairs in template order, with the
+      task definitions in the ECS API shape (see ``to_task_definition``).
+
+    Raises:
+    - ValueError: A task definition resource has ``Properties`` that are not a
+      mapping.
+    """
+    resources = template.get("Resources")
+    parameters = template.get("Parameters")
+    if not isinstance(resources, dict):
+        return []
+    if not isinstance(parameters, dict):
+        parameters = {}
+
+    task_definitions = []
+    for logical_id, resource in resources.items():
+        if not isinstance(resource, dict):
+            continue
+        if resource.get("Type") != TASK_DEFINITION_TYPE:
+            continue
+        properties = resource.get("Properties", {})
+        if not isinstance(properties, dict):
+            raise ValueError(
+                f"Properties of resource {logical_id} must be a mapping, "
+                f"got {type(properties).__name__}"
+            )
+        task_definitions.append(
+            (logical_id, to_task_definition(properties, parameters))
+        )
+    return task_definitions
+
+
+def iter_template_task_definitions(paths):
+    """
+    Read every template once and yield its task definitions.
+
+    Args:
+    - paths (list): Paths of the templates.
+
+    Returns:
+    - generator: ``(path, logical_id, task_definition, error)`` tuples. A
+      template that cannot be read yields one tuple with ``logical_id`` and
+      ``task_definition`` set to ``None`` and the error message.
+    """
+    for path in paths:
+        try:
+            task_definitions = extract_task_definitions(load_template(path))
+        except (OSError, ValueError) as e:
+            yield path, None, None, f"Could not read template: {e}"
+            continue
+        for logical_id, task_definition in task_definitions:
+            yield path, logical_id, task_definition, None
+
+
+def _validate_resource(item, cache=None, **options):
+    path, logical_id, task_definition, error = item
+    label = path if logical_id is None else f"{path}#{logical_id}"
+    outcome = new_outcome(label)
+    if logical_id is not None:
+        outcome["resource"] = {"template": path, "logical_id": logical_id}
+    if error is not None:
+        outcome["error"] = error
+        return outcome
+    return validate_document(task_definition, outcome, cache=cache, **options)
+
+
+def validate_templates(paths, workers=None, cache=None, **options):
+    """
+    Validate the task definitions of CloudFormation templates.
+
+    Templates are read one at a time, and the task definitions they contain
+    are validated in a process pool as soon as they are extracted.
+
+    Args:
+    - paths (list): Paths of the templates, see ``expand_template_paths``.
+    - workers (int): Number of worker processes. Defaults to the CPU count.
+    - cache (ResultCache): Cache to serve and store results. Optional.
+    - options: Passed on to ``validate_document``.
+
+    Returns:
+    - generator: One outcome dict per task definition resource, in template
+      order. They are labeled ``<template>#<logical id>`` and
+      ``outcome["resource"]`` holds the ``template`` and ``logical_id``. A
+      template that cannot be read adds an outcome carrying the error.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    validate = partial(_validate_resource, cache=cache, **options)
+    items = iter_template_task_definitions(paths)
+    yield from _ordered_map(validate, items, max(1, workers))
+
+    if cache is not None:
+        cache.prune()
@@ -0,0 +1,243 @@
+from array import array
+from enum import IntEnum
+from functools import lru_cache
+
+# Imported for its side effect of registering the checks in ``RULES``.
+import fargate_task_validator.validators.fargate_validator  # noqa: F401
+from fargate_task_validator.validators.rule_engine import (
+    split_status,
+    RULES,
+    RULES_BY_NAME,
+    STATUS_SEVERITY,
+)
+
+# Status code of rules that did not apply to a task definition.
+NOT_APPLICABLE = 0xFF
+
+
+class Status(IntEnum):
+    """Status of a check. Values are the severities, OK < WARN < FAIL."""
+
+    OK = STATUS_SEVERITY["OK"]
+    WARN = STATUS_SEVERITY["WARN"]
+    FAIL = STATUS_SEVERITY["FAIL"]
+
+
+_STATUSES = {status.name: status for status in Status}
+
+
+@lru_cache(maxsize=4096)
+def parse_status(status):
+    """
+    Convert a status string such as ``"FAIL: vm.swappiness"``.
+
+    Results are cached, as the same few status strings repeat across a fleet.
+
+    Returns:
+    - tuple: ``(Status, detail)``. Unknown words count as ``FAIL``.
+    """
+    word, detail = split_status(status)
+    return _STATUSES.get(word, Status.FAIL), detail
+
+
+class Finding:
+    """A single status of a check, for a container or the whole task."""
+
+    __slots__ = ("container", "rule_id", "status", "detail")
+
+    def __init__(self, container, rule_id, status, detail=None):
+        self.container = container
+        self.rule_id = rule_id
+        self.status = status
+        self.detail = detail
+
+    @property
+    def rule(self):
+        return RULES[self.rule_id].name
+
+    def to_status(self):
+        """Return the status string of the finding, e.g. ``"FAIL: ns1"``."""
+        if self.detail:
+            return f"{self.status.name}: {self.detail}"
+        return self.status.name
+
+    def __repr__(self):
+        return f"Finding({self.container!r}, {self.rule!r}, {self.to_status()!r})"
+
+
+def _summary_codes(results):
+    codes = bytearray([NOT_APPLICABLE]) * len(RULES)
+    for name, status in results.items():
+        codes[RULES_BY_NAME[name].id] = parse_status(status)[0]
+    return codes
+
+
+def _failing_findings(findings):
+    failing = []
+    for container, name, status in findings:
+        if status == "OK":
+            continue
+        code, detail = parse_status(status)
+        if code != Status.OK:
+            failing.append(Finding(container, RULES_BY_NAME[name].id, code, detail))
+    return tuple(failing)
+
+
+def _results_from_codes(codes, failing):
+    # Task level findings keep their detail, as ``summarize`` does.
+    details = {
+        finding.rule_id: finding.to_status()
+        for finding in failing
+        if finding.container is None and finding.detail
+    }
+    return {
+        RULES[rule_id].name: details.get(rule_id, Status(code).name)
+        for rule_id, code in enumerate(codes)
+        if code != NOT_APPLICABLE
+    }
+
+
+def _failing_containers(failing):
+    containers = {}
+    for finding in failing:
+        if finding.container is not None and finding.status == Status.FAIL:
+            label = finding.container
+            if finding.detail:
+                label = f"{label} ({finding.detail})"
+            containers.setdefault(finding.rule, []).append(label)
+    return containers
+
+
+class CompactResult:
+    """
+    Memory efficient result of one task definition.
+
+    The status of every check is one byte, indexed by rule id. Only the
+    findings that are not ``OK`` are kept, as ``Finding`` objects, so details
+    of ``OK`` statuses are dropped.
+    """
+
+    __slots__ = ("path", "error", "schema_valid", "passed", "codes", "failing")
+
+    def __init__(self, path, error, schema_valid, passed, codes, failing):
+        self.path = path
+        self.error = error
+        self.schema_valid = schema_valid
+        self.passed = passed
+        self.codes = codes
+        self.failing = failing
+
+    @classmethod
+    def from_outcome(cls, outcome):
+        """Build a compact result from an outcome returned by ``validate_file``."""
+        return cls(
+            outcome["path"],
+            outcome["error"],
+            outcome["schema_valid"],
+            outcome["passed"],
+            bytes(_summary_codes(outcome["results"])),
+            _failing_findings(outcome["findings"]),
+        )
+
+    def status(self, rule):
+        """Return the ``Status`` of a check, or ``None`` if it did not apply."""
+        code = self.codes[RULES_BY_NAME[rule].id]
+        return None if code == NOT_APPLICABLE else Status(code)
+
+    def to_dict(self):
+        """
+        Returns:
+        - dict: Status string per check, as returned by ``check_task_definition``.
+        """
+        return _results_from_codes(self.codes, self.failing)
+
+    def failing_containers(self):
+        """
+        Returns:
+        - dict: Failing container labels per check, as in ``outcome``.
+        """
+        return _failing_containers(self.failing)
+
+
+class ResultBatch:
+    """
+    Results of many task definitions, stored in flat arrays.
+
+    Statuses take one byte per check and task definition, in rows of
+    ``len(RULES)`` codes. Findings are only kept for task definitions with a
+    status other than ``OK``. Use ``result(i)`` or ``to_dict(i)`` to get a
+    single result back in its usual form.
+    """
+
+    def __init__(self):
+        self.width = len(RULES)
+        self.paths = []
+        self.codes = array("B")
+        # 1 valid, 0 invalid, -1 not checked.
+        self.schema_valid = array("b")
+        self.passed = array("B")
+        self.errors = {}
+        self.failing = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def append(self, outcome):
+        """Add an outcome returned by ``validate_file`` or ``validate_document``."""
+        index = len(self.paths)
+        self.paths.append(outcome["path"])
+        self.codes.extend(_summary_codes(outcome["results"]))
+        valid = outcome["schema_valid"]
+        self.schema_valid.append(-1 if valid is None else int(valid))
+        self.passed.append(bool(outcome["passed"]))
+        if outcome["error"]:
+            self.errors[index] = outcome["error"]
+        failing = _failing_findings(outcome["findings"])
+        if failing:
+            self.failing[index] = failing
+
+    def extend(self, outcomes):
+        for outcome in outcomes:
+            self.append(outcome)
+        return self
+
+    def row(self, index):
+        """Return the status codes of one task definition, indexed by rule id."""
+        return self.codes[index * self.width : (index + 1) * self.width]
+
+    def result(self, index):
+        valid = self.schema_valid[index]
+        return CompactResult(
+            self.paths[index],
+            self.errors.get(index),
+            None if valid < 0 else bool(valid),
+            bool(self.passed[index]),
+            self.row(index).tobytes(),
+            self.failing.get(index, ()),
+        )
+
+    def to_dict(self, index):
+        """
+        Returns:
+        - dict: Status string per check of one task definition.
+        """
+        return _results_from_codes(self.row(index), self.failing.get(index, ()))
+
+    def counts(self, rule):
+        """
+        Count the statuses of one check across the batch.
+
+        Returns:
+        - dict: Number of task definitions per ``Status``. Task definitions the
+          check did not apply to are not counted.
+        """
+        column = self.codes[RULES_BY_NAME[rule].id :: self.width]
+        return {status: column.count(status) for status in Status}
+
+    @property
+    def nbytes(self):
+        """Size of the arrays, without paths and findings."""
+        return sum(
+            len(values) * values.itemsize
+            for values in (self.codes, self.schema_valid, self.passed)
+        )
@@ -0,0 +1,276 @@
+from array import array
+
+from fargate_task_validator.compact import NOT_APPLICABLE, ResultBatch, Status
+from fargate_task_validator.validators.fargate_validator import (
+    VALID_COMBINATIONS_LINUX,
+    VALID_COMBINATIONS_WINDOWS,
+    VALID_OS_VALUES,
+)
+from fargate_task_validator.validators.rule_engine import RULES
+
+# Stored for task definitions without a (numeric) value.
+MISSING = -1
+
+# Codes of the operatingSystemFamily column. Task definitions without one run
+# on Linux, unknown values get UNKNOWN_OS.
+OS_CODES = {name: code for code, name in enumerate(VALID_OS_VALUES)}
+UNKNOWN_OS = len(VALID_OS_VALUES)
+
+PERCENTILES = (50, 90, 99)
+
+# Upper bounds (GiB) of the ephemeralStorage histogram buckets. 21 to 200 GiB
+# can be configured, tasks without ephemeralStorage get 20 GiB.
+EPHEMERAL_STORAGE_BUCKETS = (20, 50, 100, 150, 200)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "Fleet reports require NumPy, install it with "
+            "'pip install fargate_validator[fleet]'."
+        ) from None
+    return numpy
+
+
+# Larger values are stored as MISSING, so cpu and memory fit in one int64 key.
+MAX_VALUE = 2**31 - 1
+
+
+def _as_int(value):
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return MISSING
+    return value if 0 <= value <= MAX_VALUE else MISSING
+
+
+def fleet_fields(task_definition):
+    """
+    Extract the fields summarized by ``FleetReport`` from a task definition.
+
+    Args:
+    - task_definition (dict): Parsed task definition. Other JSON values have
+      every field ``MISSING``.
+
+    Returns:
+    - dict: ``cpu``, ``memory`` and ``ephemeral_storage`` (GiB) as ints, or
+      ``MISSING``, and the ``os_family``.
+    """
+    if not isinstance(task_definition, dict):
+        task_definition = {}
+    platform = task_definition.get("runtimePlatform")
+    storage = task_definition.get("ephemeralStorage")
+    if not isinstance(platform, dict):
+        platform = {}
+    if not isinstance(storage, dict):
+        storage = {}
+    os_family = platform.get("operatingSystemFamily", "LINUX")
+    return {
+        "cpu": _as_int(task_definition.get("cpu")),
+        "memory": _as_int(task_definition.get("memory")),
+        "ephemeral_storage": _as_int(storage.get("sizeInGiB")),
+        "os_family": os_family if isinstance(os_family, str) else None,
+    }
+
+
+def _size_keys(numpy, cpu, memory):
+    return cpu.astype(numpy.int64) << 32 | memory.astype(numpy.int64)
+
+
+def _valid_size_keys(numpy, table):
+    sizes = [
+        (int(cpu), int(memory)) for cpu, values in table.items() for memory in values
+    ]
+    cpu, memory = numpy.array(sizes, dtype=numpy.int64).T
+    return _size_keys(numpy, cpu, memory)
+
+
+class FleetReport:
+    """
+    Fleet statistics of a batch run, kept in columns.
+
+    ``add`` appends one entry per column and outcome, the statuses go to a
+    ``ResultBatch``. ``summary`` turns the columns into NumPy arrays and
+    computes every aggregate with vectorized operations, so it scales to
+    millions of task definitions. Outcomes need the ``fleet`` field, see
+    ``validate_document``.
+    """
+
+    def __init__(self):
+        _numpy()
+        self.results = ResultBatch()
+        self.cpu = array("q")
+        self.memory = array("q")
+        self.ephemeral_storage = array("q")
+        self.os_family = array("B")
+
+    def __len__(self):
+        return len(self.results)
+
+    def add(self, outcome):
+        self.results.append(outcome)
+        fields = outcome["fleet"] or {}
+        self.cpu.append(fields.get("cpu", MISSING))
+        self.memory.append(fields.get("memory", MISSING))
+        self.ephemeral_storage.append(fields.get("ephemeral_storage", MISSING))
+        self.os_family.append(OS_CODES.get(fields.get("os_family"), UNKNOWN_OS))
+
+    def extend(self, outcomes):
+        for outcome in outcomes:
+            self.add(outcome)
+        return self
+
+    def rule_counts(self):
+        """
+        Count the statuses of every check.
+
+        Returns:
+        - dict: Per check, the number of task definitions by status
+          (``ok``, ``warn``, ``fail``), the number it did not apply to
+          (``not_applicable``) and the ``failure_rate`` among the others.
+        """
+        numpy = _numpy()
+        codes = numpy.frombuffer(self.results.codes, dtype=numpy.uint8)
+        codes = codes.reshape(-1, self.results.width)
+        counts = {
+            status: numpy.count_nonzero(codes == status, axis=0)
+            for status in Status
+        }
+        not_applicable = numpy.count_nonzero(codes == NOT_APPLICABLE, axis=0)
+        applicable = len(codes) - not_applicable
+        rates = counts[Status.FAIL] / numpy.maximum(applicable, 1)
+
+        return {
+            rule.name: {
+                "ok": int(counts[Status.OK][rule.id]),
+                "warn": int(counts[Status.WARN][rule.id]),
+                "fail": int(counts[Status.FAIL][rule.id]),
+                "not_applicable": int(not_applicable[rule.id]),
+                "failure_rate": float(rates[rule.id]),
+            }
+            for rule in RULES[: self.results.width]
+        }
+
+    def valid_sizes(self):
+        """
+        Check the task ``cpu`` and ``memory`` against the Fargate size tables.
+
+        Returns:
+        - numpy.ndarray: One bool per task definition, ``True`` when its
+          combination is valid for its ``operatingSystemFamily``.
+        """
+        numpy = _numpy()
+        cpu = numpy.frombuffer(self.cpu, dtype=numpy.int64)
+        memory = numpy.frombuffer(self.memory, dtype=numpy.int64)
+        os_family = numpy.frombuffer(self.os_family, dtype=numpy.uint8)
+        keys = _size_keys(numpy, cpu, memory)
+
+        windows_codes = [
+            code for name, code in OS_CODES.items() if "WINDOWS" in name
+        ]
+        windows = numpy.isin(os_family, windows_codes)
+        linux = os_family == OS_CODES["LINUX"]
+        valid = numpy.zeros(len(keys), dtype=bool)
+        valid[linux] = numpy.isin(
+            keys[linux], _valid_size_keys(numpy, VALID_COMBINATIONS_LINUX)
+        )
+        valid[windows] = numpy.isin(
+            keys[windows], _valid_size_keys(numpy, VALID_COMBINATIONS_WINDOWS)
+        )
+        return valid & (cpu >= 0) & (memory >= 0)
+
+    def size_distribution(self):
+        """
+        Count the task definitions per ``(cpu, memory)`` combination.
+
+        Returns:
+        - list: Dicts with ``cpu``, ``memory`` (``None`` when missing),
+          ``count`` and ``valid`` (the share of them that use the combination
+          with a supported ``operatingSystemFamily``), most common first.
+        """
+        numpy = _numpy()
+        if not len(self):
+            return []
+        cpu = numpy.frombuffer(self.cpu, dtype=numpy.int64)
+        memory = numpy.frombuffer(self.memory, dtype=numpy.int64)
+        # MISSING sorts first and is mapped to 0, both values fit in 32 bits.
+        keys, inverse, counts = numpy.unique(
+            _size_keys(numpy, cpu + 1, memory + 1),
+            return_inverse=True,
+            return_counts=True,
+        )
+        valid_counts = numpy.bincount(
+            inverse.ravel(), weights=self.valid_sizes(), minlength=len(keys)
+        )
+        sizes_cpu = (keys >> 32) - 1
+        sizes_memory = (keys & 0xFFFFFFFF) - 1
+
+        # Only the distinct sizes are looped over, there are few of them.
+        order = numpy.argsort(-counts, kind="stable")
+        return [
+            {
+                "cpu": None if sizes_cpu[i] == MISSING else int(sizes_cpu[i]),
+                "memory": (
+                    None if sizes_memory[i] == MISSING else int(sizes_memory[i])
+                ),
+                "count": int(counts[i]),
+                "valid": float(valid_counts[i] / counts[i]),
+            }
+            for i in order
+        ]
+
+    def ephemeral_storage_summary(self):
+        """
+        Summarize the configured ``ephemeralStorage`` sizes.
+
+        Returns:
+        - dict: ``default`` (task definitions without a size), ``configured``,
+          ``min``, ``max``, ``mean`` and percentiles of the configured sizes
+          (``p50``...), and a ``histogram`` of counts per size bucket, keyed by
+          the bucket's upper bound in GiB or ``"larger"``.
+        """
+        numpy = _numpy()
+        sizes = numpy.frombuffer(self.ephemeral_storage, dtype=numpy.int64)
+        configured = sizes[sizes != MISSING]
+        summary = {
+            "default": int(len(sizes) - len(configured)),
+            "configured": int(len(configured)),
+        }
+        if len(configured):
+            summary.update(
+                min=int(configured.min()),
+                max=int(configured.max()),
+                mean=float(configured.mean()),
+            )
+            values = numpy.percentile(configured, PERCENTILES)
+            for percentile, value in zip(PERCENTILES, values):
+                summary[f"p{percentile}"] = float(value)
+
+        buckets = numpy.searchsorted(EPHEMERAL_STORAGE_BUCKETS, configured)
+        counts = numpy.bincount(buckets, minlength=len(EPHEMERAL_STORAGE_BUCKETS) + 1)
+        labels = [str(bound) for bound in EPHEMERAL_STORAGE_BUCKETS] + ["larger"]
+        summary["histogram"] = {
+            label: int(count) for label, count in zip(labels, counts)
+        }
+        return summary
+
+    def summary(self):
+        """
+        Returns:
+        - dict: ``task_definitions``, ``passed``, ``rules`` (see
+          ``rule_counts``), ``invalid_sizes``, ``sizes`` (see
+          ``size_distribution``) and ``ephemeral_storage`` (see
+          ``ephemeral_storage_summary``).
+        """
+        numpy = _numpy()
+        passed = numpy.frombuffer(self.results.passed, dtype=numpy.uint8)
+        return {
+            "task_definitions": len(self),
+            "passed": int(numpy.count_nonzero(passed)),
+            "rules": self.rule_counts(),
+            "invalid_sizes": int(len(self) - numpy.count_nonzero(self.valid_sizes())),
+            "sizes": self.size_distribution(),
+            "ephemeral_storage": self.ephemeral_storage_summary(),
+        }
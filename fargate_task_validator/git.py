@@ -0,0 +1,197 @@
+import os
+import subprocess
+from functools import partial
+
+from fargate_task_validator.batch import (
+    _ordered_map,
+    _validate_labeled_document,
+    is_json_name,
+    unwrap_task_definition,
+)
+from fargate_task_validator.utils.json_loader import loads
+
+# Added, copied, modified, renamed and type-changed files. Deleted files have
+# nothing left to validate.
+DIFF_FILTER = "ACMRT"
+
+
+class GitError(Exception):
+    """A git command failed, e.g. because a ref does not exist."""
+
+
+def git(*args, cwd=None, input=None):
+    """
+    Run a git command and return its standard output as bytes.
+
+    Raises:
+    - GitError: git is not installed or the command failed.
+    """
+    try:
+        result = subprocess.run(
+            ("git",) + args,
+            cwd=cwd,
+            input=input,
+            capture_output=True,
+            check=False,
+        )
+    except OSError as e:
+        raise GitError(f"Could not run git: {e}") from None
+    if result.returncode != 0:
+        message = result.stderr.decode(errors="replace").strip()
+        raise GitError(f"git {args[0]} failed: {message}")
+    return result.stdout
+
+
+def changed_files(base, head=None, pathspecs=(), select=is_json_name, cwd=None):
+    """
+    List the task definition files changed between two refs.
+
+    ``head`` is compared with the merge base of both refs, like a pull request
+    (``git diff base...head``). Without ``head``, the working tree is compared
+    with the merge base of ``base`` and ``HEAD``, so files only changed on
+    ``base`` since the fork are left out in both modes. New files that are not
+    tracked yet, and not ignored, count as changed in the working tree.
+
+    Plumbing commands are used, so user configuration such as
+    ``diff.relative`` does not change the listed paths.
+
+    Args:
+    - base (str): Base ref, e.g. ``origin/main``.
+    - head (str): Head ref, e.g. ``HEAD``. Optional.
+    - pathspecs (list): Limit the diff to these paths, directories or globs.
+    - select (callable): Selects the files by their name. Defaults to
+      ``*.json`` files.
+    - cwd (str): Directory in the repository. Defaults to the current one.
+
+    Returns:
+    - list: Paths of the changed files, relative to the repository root.
+
+    Raises:
+    - GitError: A ref does not exist or ``cwd`` is not in a repository.
+    """
+    merge_base = git("merge-base", base, head or "HEAD", cwd=cwd).decode().strip()
+    options = ["--name-only", "-z", "--no-renames", f"--diff-filter={DIFF_FILTER}"]
+    if head:
+        output = git(
+            "diff-tree", "-r", *options, merge_base, head, "--", *pathspecs, cwd=cwd
+        )
+    else:
+        # Files whose stat information changed but not their content may be
+        # listed too, which only validates them again.
+        output = git("diff-index", *options, merge_base, "--", *pathspecs, cwd=cwd)
+        output += git(
+            "ls-files",
+            "--others",
+            "--exclude-standard",
+            "--full-name",
+            "-z",
+            "--",
+            *pathspecs,
+            cwd=cwd,
+        )
+    names = [os.fsdecode(name) for name in output.split(b"\0") if name]
+    return [name for name in names if select(os.path.basename(name))]
+
+
+def read_blobs(ref, paths, cwd=None):
+    """
+    Read the content of files at a ref, with one ``git cat-file`` process.
+
+    Args:
+    - ref (str): The ref to read from.
+    - paths (list): Paths relative to the repository root.
+    - cwd (str): Directory in the repository.
+
+    Returns:
+    - generator: ``(path, content)`` pairs, with ``content`` as bytes, or
+      ``None`` for paths that do not exist at ``ref``.
+    """
+    if not paths:
+        return
+    requests = "".join(f"{ref}:{path}\n" for path in paths).encode()
+    output = git("cat-file", "--batch", cwd=cwd, input=requests)
+    offset = 0
+    for path in paths:
+        end = output.index(b"\n", offset)
+        header = output[offset:end].split()
+        offset = end + 1
+        if header[-1] == b"missing":
+            yield path, None
+            continue
+        size = int(header[2])
+        yield path, output[offset : offset + size]
+        # The content is followed by a newline.
+        offset += size + 1
+
+
+def iter_changed_documents(base, head=None, pathspecs=(), cwd=None):
+    """
+    Read the task definition files changed between two refs.
+
+    Files are read from ``head`` with git, so it does not need to be checked
+    out. Without ``head`` they are read from the working tree.
+
+    Returns:
+    - generator: ``(label, task_definition, error)`` tuples. Labels are the
+      paths relative to the current directory.
+    """
+    top = git("rev-parse", "--show-toplevel", cwd=cwd).decode().strip()
+    names = changed_files(base, head, pathspecs, cwd=cwd)
+
+    def label(name):
+        return os.path.relpath(os.path.join(top, name))
+
+    if head:
+        contents = read_blobs(head, names, cwd=cwd)
+    else:
+        contents = ((name, None) for name in names)
+
+    for name, content in contents:
+        try:
+            if content is None and head:
+                raise ValueError(f"not found at {head}")
+            if content is None:
+                with open(os.path.join(top, name), "rb") as f:
+                    content = f.read()
+            document = unwrap_task_definition(loads(content))
+        except (OSError, ValueError) as e:
+            yield label(name), None, f"Could not load task definition: {e}"
+            continue
+        yield label(name), document, None
+
+
+def validate_changed(
+    base, head=None, pathspecs=(), workers=None, cache=None, cwd=None, **options
+):
+    """
+    Validate only the task definition files changed between two refs.
+
+    Args:
+    - base (str): Base ref, e.g. ``origin/main``.
+    - head (str): Head ref. Defaults to the working tree.
+    - pathspecs (list): Limit the diff to these paths, directories or globs.
+    - workers (int): Number of worker processes. Defaults to the CPU count.
+    - cache (ResultCache): Cache to serve and store results. Optional.
+    - cwd (str): Directory in the repository. Defaults to the current one.
+    - options: Passed on to ``validate_document``.
+
+    Returns:
+    - generator: One outcome dict per changed file, see ``validate_file``.
+
+    Raises:
+    - GitError: A ref does not exist or ``cwd`` is not in a repository. The
+      changed files are listed right away, so this is raised by the call and
+      not while iterating.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    items = list(iter_changed_documents(base, head, pathspecs, cwd=cwd))
+    workers = max(1, min(workers, len(items)))
+    validate = partial(_validate_labeled_document, cache=cache, **options)
+    return _validate_items(validate, items, workers, cache)
+
+
+def _validate_items(validate, items, workers, cache):
+    yield from _ordered_map(validate, items, workers)
+    if cache is not None:
+        cache.prune()
@@ -0,0 +1,57 @@
+class RuleStats:
+    """
+    Wall time, number of calls and number of failures per rule.
+
+    Pass an instance as ``stats`` to ``evaluate`` to time every check. The
+    schema step is recorded under ``"schema"`` by ``validate_document``.
+    Statistics of separate runs, for example from worker processes, are
+    combined with ``merge``.
+    """
+
+    def __init__(self):
+        # name -> [calls, failures, seconds]
+        self.rules = {}
+
+    def record(self, name, seconds, status=None):
+        entry = self.rules.get(name)
+        if entry is None:
+            entry = self.rules[name] = [0, 0, 0.0]
+        entry[0] += 1
+        if status is not None and status.startswith("FAIL"):
+            entry[1] += 1
+        entry[2] += seconds
+
+    def merge(self, other):
+        """
+        Add the statistics of another run.
+
+        Args:
+        - other (RuleStats | dict): Statistics, or their ``as_dict()`` form.
+        """
+        if isinstance(other, RuleStats):
+            other = other.as_dict()
+        for name, counters in other.items():
+            entry = self.rules.get(name)
+            if entry is None:
+                entry = self.rules[name] = [0, 0, 0.0]
+            entry[0] += counters["calls"]
+            entry[1] += counters["failures"]
+            entry[2] += counters["seconds"]
+
+    def as_dict(self):
+        """
+        Returns:
+        - dict: ``calls``, ``failures`` and ``seconds`` per rule name.
+        """
+        return {
+            name: {"calls": calls, "failures": failures, "seconds": seconds}
+            for name, (calls, failures, seconds) in self.rules.items()
+        }
+
+    def rows(self):
+        """
+        Returns:
+        - list: ``(name, calls, failures, seconds)`` tuples, slowest first.
+        """
+        rows = [(name,) + tuple(entry) for name, entry in self.rules.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
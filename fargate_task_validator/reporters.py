@@ -0,0 +1,271 @@
+import json
+from abc import ABC, abstractmethod
+from xml.sax.saxutils import escape, quoteattr
+
+from fargate_task_validator.validators.recommendations import (
+    RECOMMENDATIONS,
+    REMEDIATIONS,
+)
+from fargate_task_validator.validators.rule_engine import split_status, RULES
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+INFORMATION_URI = "https://github.com/joozero/fargate-task-definition-validator"
+SARIF_LEVELS = {"FAIL": "error", "WARN": "warning"}
+
+# Pseudo checks reported next to the registered rules.
+SCHEMA_CHECK = "schema"
+LOAD_CHECK = "load"
+
+
+def failures(outcome):
+    """
+    List the failing checks of an outcome with their guidance.
+
+    Returns:
+    - list: One dict per failing check with the keys ``check``, ``status``,
+      ``containers``, ``recommendation`` and ``remediation``.
+    """
+    details = []
+    for check, status in outcome["results"].items():
+        if not status.startswith("FAIL"):
+            continue
+        details.append(
+            {
+                "check": check,
+                "status": status,
+                "containers": outcome["failing_containers"].get(check, []),
+                "recommendation": RECOMMENDATIONS.get(check),
+                "remediation": REMEDIATIONS.get(check),
+            }
+        )
+    return details
+
+
+class Reporter(ABC):
+    """
+    Writes outcomes to ``stream`` one at a time, as they complete.
+
+    Call ``start`` once, ``add`` for every outcome and ``finish`` at the end.
+    Nothing but the current outcome is held in memory. Subclasses implement
+    ``add``.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def start(self):
+        pass
+
+    @abstractmethod
+    def add(self, outcome):
+        """Write one outcome."""
+
+    def finish(self):
+        pass
+
+    def write(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per outcome and line, with a ``failures`` list added."""
+
+    def add(self, outcome):
+        record = dict(outcome, failures=failures(outcome))
+        self.write(json.dumps(record) + "\n")
+
+
+class JUnitReporter(Reporter):
+    """
+    JUnit XML with one ``testsuite`` per task definition and one ``testcase``
+    per check. Failing checks carry the recommendation and remediation.
+    """
+
+    def start(self):
+        self.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<testsuites name="fargate-validator">\n'
+        )
+
+    def add(self, outcome):
+        name = quoteattr(str(outcome["path"]))
+        cases = []
+        failed = errors = 0
+
+        if outcome["error"]:
+            errors += 1
+            cases.append(
+                f"    <testcase classname={name} name={quoteattr(LOAD_CHECK)}>\n"
+                f"      <error message={quoteattr(outcome['error'])}/>\n"
+                "    </testcase>\n"
+            )
+        if outcome["schema_valid"] is not None:
+            case = f"    <testcase classname={name} name={quoteattr(SCHEMA_CHECK)}"
+            if outcome["schema_valid"]:
+                cases.append(case + "/>\n")
+            else:
+                failed += 1
+                message, _, text = (outcome["schema"] or "").partition("\n")
+                cases.append(
+                    f"{case}>\n"
+                    f"      <failure message={quoteattr(message)}>"
+                    f"{escape(text)}</failure>\n"
+                    "    </testcase>\n"
+                )
+
+        failing = {detail["check"]: detail for detail in failures(outcome)}
+        for check, status in outcome["results"].items():
+            case = f"    <testcase classname={name} name={quoteattr(check)}"
+            if check not in failing:
+                cases.append(case + "/>\n")
+                continue
+            failed += 1
+            detail = failing[check]
+            text = []
+            if detail["containers"]:
+                text.append(f"Containers: {', '.join(detail['containers'])}")
+            if detail["recommendation"]:
+                text.append(f"Recommendation: {detail['recommendation']}")
+            if detail["remediation"]:
+                text.append(f"Remediation: {detail['remediation']}")
+            cases.append(
+                f"{case}>\n"
+                f"      <failure message={quoteattr(status)} type=\"FAIL\">"
+                f"{escape(chr(10).join(text))}</failure>\n"
+                "    </testcase>\n"
+            )
+
+        self.write(
+            f"  <testsuite name={name} tests=\"{len(cases)}\" "
+            f"failures=\"{failed}\" errors=\"{errors}\">\n"
+            + "".join(cases)
+            + "  </testsuite>\n"
+        )
+
+    def finish(self):
+        self.write("</testsuites>\n")
+
+
+class SarifReporter(Reporter):
+    """
+    SARIF 2.1.0 log with one result per failing finding. Container findings
+    name the container as a logical location, task definitions extracted from
+    a template also name their resource. The rule descriptions carry the
+    recommendation and remediation.
+    """
+
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.results = 0
+
+    def start(self):
+        rules = [
+            {
+                "id": LOAD_CHECK,
+                "shortDescription": {"text": "The task definition could not be checked."},
+            },
+            {
+                "id": SCHEMA_CHECK,
+                "shortDescription": {
+                    "text": "The task definition does not match the schema."
+                },
+            },
+        ]
+        for rule in RULES:
+            descriptor = {"id": rule.name}
+            if rule.name in RECOMMENDATIONS:
+                descriptor["shortDescription"] = {"text": RECOMMENDATIONS[rule.name]}
+            if rule.name in REMEDIATIONS:
+                descriptor["help"] = {"text": REMEDIATIONS[rule.name]}
+            rules.append(descriptor)
+
+        header = json.dumps(
+            {
+                "version": "2.1.0",
+                "$schema": SARIF_SCHEMA,
+                "runs": [
+                    {
+                        "tool": {
+                            "driver": {
+                                "name": "fargate-validator",
+                                "informationUri": INFORMATION_URI,
+                                "rules": rules,
+                            }
+                        },
+                        "results": [],
+                    }
+                ],
+            }
+        )
+        # Stream the results into the open "results" array.
+        self.write(header[: -len("]}]}")] + "\n")
+
+    def result(self, outcome, check, level, message, container=None, pointer=None):
+        resource = outcome["resource"]
+        uri = resource["template"] if resource else outcome["path"]
+        location = {"physicalLocation": {"artifactLocation": {"uri": uri}}}
+        logical_locations = []
+        if resource:
+            # Task definitions extracted from a template are located by the
+            # logical ID of their resource.
+            logical_locations.append(
+                {
+                    "name": resource["logical_id"],
+                    "fullyQualifiedName": f"Resources/{resource['logical_id']}",
+                    "kind": "resource",
+                }
+            )
+        if container is not None:
+            logical_locations.append({"name": container, "kind": "object"})
+        elif pointer is not None:
+            logical_locations.append(
+                {"fullyQualifiedName": pointer or "/", "kind": "member"}
+            )
+        if logical_locations:
+            location["logicalLocations"] = logical_locations
+        separator = ",\n" if self.results else ""
+        self.results += 1
+        self.write(
+            separator
+            + json.dumps(
+                {
+                    "ruleId": check,
+                    "level": level,
+                    "message": {"text": message},
+                    "locations": [location],
+                }
+            )
+        )
+
+    def add(self, outcome):
+        for error in outcome["schema_errors"]:
+            message = f"{error['message']} (schema: {error['schema_path']})"
+            self.result(
+                outcome, SCHEMA_CHECK, "error", message, pointer=error["path"]
+            )
+        if outcome["error"]:
+            self.result(outcome, LOAD_CHECK, "error", outcome["error"])
+            return
+
+        for container, check, status in outcome["findings"]:
+            word, detail = split_status(status)
+            if word not in SARIF_LEVELS:
+                continue
+            message = f"{check}: {status}."
+            if container is not None:
+                message = f"{check} in container '{container}': {word}"
+                message += f" ({detail})." if detail else "."
+            if check in RECOMMENDATIONS:
+                message += f" {RECOMMENDATIONS[check]}"
+            self.result(outcome, check, SARIF_LEVELS[word], message, container)
+
+    def finish(self):
+        self.write("\n]}]}\n")
+
+
+REPORTERS = {
+    "jsonl": JsonLinesReporter,
+    "junit": JUnitReporter,
+    "sarif": SarifReporter,
+}
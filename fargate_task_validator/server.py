@@ -0,0 +1,237 @@
+import json
+import os
+import socketserver
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fargate_task_validator.batch import new_outcome, validate_document
+from fargate_task_validator.utils.json_loader import loads
+from fargate_task_validator.validators.schema_validator import (
+    get_compiled_validator,
+)
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+LATENCY_WINDOW = 4096
+
+
+def _validate_item(document, **options):
+    outcome = new_outcome()
+    if not isinstance(document, dict):
+        outcome["error"] = "Task definition must be a JSON object."
+        return outcome
+    return validate_document(document, outcome, **options)
+
+
+class ServerMetrics:
+    """Thread-safe request counters and a sliding window of request latencies."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.documents = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds, documents=0, error=False):
+        with self.lock:
+            self.requests += 1
+            self.documents += documents
+            self.errors += error
+            self.latencies.append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            snapshot = {
+                "uptime_seconds": time.time() - self.started,
+                "requests": self.requests,
+                "errors": self.errors,
+                "documents": self.documents,
+            }
+
+        def percentile(fraction):
+            index = min(len(latencies) - 1, int(len(latencies) * fraction))
+            return latencies[index] * 1e3
+
+        if latencies:
+            snapshot["latency_ms"] = {
+                "mean": statistics.fmean(latencies) * 1e3,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1e3,
+                "window": len(latencies),
+            }
+        return snapshot
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of the validation server.
+
+    - ``POST /validate`` takes one task definition (JSON object) or a batch
+      (JSON array) and returns one outcome or a list of outcomes.
+    - ``GET /metrics`` returns request counters and latency percentiles.
+    - ``GET /healthz`` returns ``{"status": "ok"}``.
+    """
+
+    server_version = "fargate-validator"
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self):
+        # Unix socket peers have no address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self.send_json(200, self.server.metrics.snapshot())
+        else:
+            self.send_json(404, {"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        if self.path != "/validate":
+            self.close_connection = True
+            self.send_json(404, {"error": f"Unknown path '{self.path}'."})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            self.send_json(411, {"error": "Content-Length is required."})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self.send_json(413, {"error": "Request body is too large."})
+            return
+
+        try:
+            payload = loads(self.rfile.read(length))
+        except ValueError as e:
+            self.server.metrics.record(time.perf_counter() - start, error=True)
+            self.send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        try:
+            if isinstance(payload, list):
+                response = self.server.validate_batch(payload)
+                documents = len(payload)
+            else:
+                response = self.server.validate_one(payload)
+                documents = 1
+        except Exception as e:
+            # Keep serving: report the failure instead of dropping the
+            # connection with the request thread.
+            self.log_error("Validation failed: %r", e)
+            self.server.metrics.record(time.perf_counter() - start, error=True)
+            self.send_json(500, {"error": f"Validation failed: {e}"})
+            return
+
+        self.server.metrics.record(time.perf_counter() - start, documents)
+        self.send_json(200, response)
+
+
+class _ValidationServerMixin:
+    """Shared state of the TCP and Unix socket servers."""
+
+    daemon_threads = True
+
+    def setup_validation(self, workers=1, quiet=False, **options):
+        self.metrics = ServerMetrics()
+        self.quiet = quiet
+        self.options = options
+        self.workers = workers
+        self.executor = None
+        if workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        # Build the validators now so the first request does not pay for it.
+        get_compiled_validator()
+
+    def validate_one(self, document):
+        return _validate_item(document, **self.options)
+
+    def validate_batch(self, documents):
+        if self.executor is None or len(documents) < 2:
+            return [self.validate_one(document) for document in documents]
+        validate = partial(_validate_item, **self.options)
+        chunksize = max(1, len(documents) // (self.workers * 4))
+        return list(self.executor.map(validate, documents, chunksize=chunksize))
+
+    def server_close(self):
+        super().server_close()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+class ValidationHTTPServer(_ValidationServerMixin, ThreadingHTTPServer):
+    pass
+
+
+class ValidationUnixHTTPServer(
+    _ValidationServerMixin,
+    socketserver.ThreadingMixIn,
+    socketserver.UnixStreamServer,
+):
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def create_server(address, workers=1, quiet=False, **options):
+    """
+    Create a validation server with the validators loaded and kept warm.
+
+    Args:
+    - address (tuple | str): ``(host, port)`` for TCP, or the path of a Unix
+      socket.
+    - workers (int): Worker processes for batch requests. ``1`` validates in
+      the request threads.
+    - quiet (bool): Do not log every request.
+    - options: Passed on to ``validate_document``.
+
+    Returns:
+    - socketserver.BaseServer: The server. Call ``serve_forever()`` to run it.
+    """
+    if isinstance(address, str):
+        server = ValidationUnixHTTPServer(address, ValidationRequestHandler)
+    else:
+        server = ValidationHTTPServer(address, ValidationRequestHandler)
+    server.setup_validation(workers=workers, quiet=quiet, **options)
+    return server
+
+
+def parse_address(value):
+    """Parse ``PORT`` or ``HOST:PORT``. The host defaults to ``127.0.0.1``."""
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+
+from fargate_task_validator.cache import ruleset_fingerprint
+from fargate_task_validator.reporters import Reporter
+from fargate_task_validator.utils.json_loader import loads
+
+# Bump when the layout of partial result files changes.
+PARTIAL_VERSION = 1
+
+# The trailer of a partial file is within its last bytes.
+TRAILER_BYTES = 4096
+
+
+def parse_shard(value):
+    """
+    Parse a shard such as ``"2/8"``, the second of eight shards.
+
+    Returns:
+    - tuple: ``(index, count)`` with ``1 <= index <= count``.
+
+    Raises:
+    - ValueError: The value is not of the form ``i/N``.
+    """
+    index, separator, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = 0
+    if not separator or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}', expected i/N with 1 <= i <= N.")
+    return index, count
+
+
+def shard_of(path, count):
+    """
+    Assign a path to one of ``count`` shards.
+
+    The shard only depends on the normalized path, so it is the same on every
+    machine and does not change when other files are added or removed.
+
+    Returns:
+    - int: Shard index, from 1 to ``count``.
+    """
+    normalized = os.path.normpath(path).replace(os.sep, "/")
+    digest = hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def select_shard(paths, index, count):
+    """Return the paths of shard ``index`` of ``count``, in their order."""
+    return [path for path in paths if shard_of(path, count) == index]
+
+
+class PartialReporter(Reporter):
+    """
+    Writes the outcomes of one shard to a partial result file.
+
+    The file is JSON Lines: a header naming the shard and the ruleset, one
+    outcome per line and a trailer with the number of outcomes, which tells
+    complete files from the files of interrupted runs. ``merge_partials``
+    combines the files of all shards.
+    """
+
+    def __init__(self, stream, index=1, count=1):
+        super().__init__(stream)
+        self.index = index
+        self.count = count
+        self.outcomes = 0
+
+    def start(self):
+        header = {
+            "partial": PARTIAL_VERSION,
+            "shard": self.index,
+            "shards": self.count,
+            "ruleset": ruleset_fingerprint(),
+        }
+        self.write(json.dumps(header) + "\n")
+
+    def add(self, outcome):
+        self.outcomes += 1
+        self.write(json.dumps(outcome) + "\n")
+
+    def finish(self):
+        self.write(json.dumps({"outcomes": self.outcomes}) + "\n")
+
+
+def record_partial(outcomes, path, index=1, count=1):
+    """
+    Write outcomes to a partial result file as they pass through.
+
+    Returns:
+    - generator: The outcomes, unchanged.
+    """
+    with open(path, "w") as stream:
+        reporter = PartialReporter(stream, index, count)
+        reporter.start()
+        for outcome in outcomes:
+            reporter.add(outcome)
+            yield outcome
+        reporter.finish()
+
+
+def _last_line(f):
+    # Partial files can be large, only read their end.
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    f.seek(max(0, end - TRAILER_BYTES))
+    lines = f.read().splitlines()
+    return lines[-1] if lines else b""
+
+
+def read_partial_header(path):
+    """
+    Read the header of a partial result file and check that it is complete.
+
+    Raises:
+    - ValueError: The file is not a partial result file, or its run did not
+      finish.
+    """
+    with open(path, "rb") as f:
+        first = f.readline()
+        last = _last_line(f)
+    try:
+        header, trailer = loads(first), loads(last)
+    except ValueError:
+        header = trailer = None
+    if not isinstance(header, dict) or header.get("partial") != PARTIAL_VERSION:
+        raise ValueError(f"{path} is not a partial result file.")
+    if not isinstance(trailer, dict) or "outcomes" not in trailer:
+        raise ValueError(f"{path} is incomplete, its run did not finish.")
+    return header
+
+
+def merge_partials(paths):
+    """
+    Combine the partial result files of all shards of a run.
+
+    The files are checked first: together they must cover every shard of the
+    run exactly once, and come from the same ruleset as this validator.
+
+    Args:
+    - paths (list): Paths of the partial result files, in any order.
+
+    Returns:
+    - generator: The outcomes of all shards, in shard order.
+
+    Raises:
+    - ValueError: A file is not a partial result file, a shard is missing or
+      duplicated, or the files come from another ruleset.
+    """
+    headers = {path: read_partial_header(path) for path in paths}
+    counts = {header["shards"] for header in headers.values()}
+    if len(counts) != 1:
+        raise ValueError(f"Partial files come from runs with {sorted(counts)} shards.")
+    (count,) = counts
+
+    by_shard = {}
+    for path, header in headers.items():
+        if header["shard"] in by_shard:
+            raise ValueError(
+                f"Shard {header['shard']}/{count} is in both "
+                f"{by_shard[header['shard']]} and {path}."
+            )
+        by_shard[header["shard"]] = path
+    missing = sorted(set(range(1, count + 1)) - by_shard.keys())
+    if missing:
+        shards = ", ".join(f"{index}/{count}" for index in missing)
+        raise ValueError(f"Partial files of shards {shards} are missing.")
+
+    fingerprint = ruleset_fingerprint()
+    for path, header in headers.items():
+        if header["ruleset"] != fingerprint:
+            raise ValueError(f"{path} was written by another version of the checks.")
+
+    return _read_outcomes([by_shard[index] for index in range(1, count + 1)])
+
+
+def _read_outcomes(paths):
+    for path in paths:
+        with open(path, "rb") as f:
+            f.readline()
+            for line in f:
+                record = loads(line)
+                if "outcomes" in record and "path" not in record:
+                    break
+                yield record
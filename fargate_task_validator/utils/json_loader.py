@@ -1,6 +1,138 @@
 # src/utils/json_loader.py
 
 import json
+import os
+import re
+from functools import lru_cache
+
+# Names of the JSON backends, in the order they are tried by "auto".
+BACKEND_NAMES = ("orjson", "ujson", "simdjson", "json")
+
+# Selects the backend, also in worker processes. "auto" when unset.
+JSON_BACKEND_ENV = "FARGATE_VALIDATOR_JSON"
+
+# Files of at least this many bytes are memory-mapped by backends that parse
+# from a buffer, instead of being read into a bytes object first. This saves
+# a copy of very large files; smaller ones are read faster than mapped (see
+# benchmarks/bench_json.py).
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
+class JsonBackend:
+    """
+    A JSON parser.
+
+    Args:
+    - name (str): One of ``BACKEND_NAMES``.
+    - loads (callable): Parses ``bytes`` (or ``str``) into Python objects.
+      Raises ``ValueError`` on invalid JSON.
+    - buffers (bool): ``loads`` also accepts a ``memoryview``, so files can
+      be parsed straight from a memory map.
+    """
+
+    def __init__(self, name, loads, buffers=False):
+        self.name = name
+        self.loads = loads
+        self.buffers = buffers
+
+    def __repr__(self):
+        return f"JsonBackend({self.name!r})"
+
+
+@lru_cache(maxsize=None)
+def _import_backend(name):
+    if name == "orjson":
+        import orjson
+
+        return JsonBackend(name, orjson.loads, buffers=True)
+    if name == "ujson":
+        import ujson
+
+        return JsonBackend(name, ujson.loads)
+    if name == "simdjson":
+        import simdjson
+
+        return JsonBackend(name, simdjson.loads)
+    if name == "json":
+        return JsonBackend(name, json.loads)
+    raise ValueError(
+        f"Unknown JSON backend '{name}', expected auto or one of "
+        f"{', '.join(BACKEND_NAMES)}."
+    )
+
+
+def get_backend(name=None):
+    """
+    Return a JSON backend.
+
+    Args:
+    - name (str): ``"auto"`` or one of ``BACKEND_NAMES``. Defaults to the
+      ``FARGATE_VALIDATOR_JSON`` environment variable, then ``"auto"``, which
+      picks the first installed backend and falls back to the ``json`` module.
+
+    Returns:
+    - JsonBackend: The backend.
+
+    Raises:
+    - ImportError: The requested backend is not installed.
+    - ValueError: The name is unknown.
+    """
+    return _resolve_backend(name or os.environ.get(JSON_BACKEND_ENV) or "auto")
+
+
+@lru_cache(maxsize=None)
+def _resolve_backend(name):
+    # Cached including "auto", whose failed imports would otherwise be tried
+    # again by every call, since lru_cache does not cache exceptions.
+    if name != "auto":
+        return _import_backend(name)
+    for candidate in BACKEND_NAMES:
+        try:
+            return _import_backend(candidate)
+        except ImportError:
+            continue
+
+
+def loads(data, backend=None):
+    """
+    Parse JSON ``bytes`` or ``str`` with the selected backend.
+
+    Raises:
+    - ValueError: The data is not valid JSON.
+    """
+    return (backend or get_backend()).loads(data)
+
+
+def load_json_file(path, backend=None):
+    """
+    Read and parse a JSON file with the selected backend.
+
+    Files are read as bytes, so they are not decoded into a ``str`` first.
+    Backends that parse from a buffer get files of ``MMAP_THRESHOLD`` bytes or
+    more through ``mmap``, which avoids copying them into a ``bytes`` object.
+
+    Args:
+    - path (str): Path to the JSON file.
+    - backend (JsonBackend): Defaults to ``get_backend()``.
+
+    Returns:
+    - object: Parsed JSON data.
+
+    Raises:
+    - OSError: The file cannot be read.
+    - ValueError: The file is not valid JSON.
+    """
+    backend = backend or get_backend()
+    with open(path, "rb") as f:
+        if backend.buffers and os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            import mmap
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # The view must be released before the map is closed.
+                with memoryview(mapped) as view:
+                    return backend.loads(view)
+        data = f.read()
+    return backend.loads(data)
 
 
 def load_json_from_file(file_path):
@@ -13,6 +145,196 @@ def load_json_from_file(file_path):
     Returns:
     - dict: Parsed JSON data.
     """
-    with open(file_path, "r") as json_file:
-        data = json.load(json_file)
-    return data
+    return load_json_file(file_path)
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# Characters that end a JSON token. A decoding error followed by none of them
+# may be a token cut off by the end of the buffer, such as "tr" of "true".
+_TOKEN_END = re.compile(r"[\s,:\]}]")
+
+
+class _StreamBuffer:
+    """Text buffer over a stream that only keeps the unparsed remainder."""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=None):
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed before appending.
+        self.text = self.text[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.fill():
+                return
+
+    def peek(self):
+        self.skip_whitespace()
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def truncated(self, error):
+        """Whether ``error`` comes from a record cut off by the buffer end."""
+        if error.msg.startswith("Unterminated string"):
+            # Raw newlines are rejected in strings, so the string runs to the
+            # end of the buffer.
+            return True
+        return _TOKEN_END.search(self.text, error.pos) is None
+
+    def decode(self):
+        self.skip_whitespace()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as e:
+                # Only read on for truncated records. A malformed one would
+                # otherwise pull the rest of the stream into memory.
+                if self.eof or not self.truncated(e) or not self.fill(read_size):
+                    raise
+                # Grow reads for large documents to avoid reparsing too often.
+                read_size *= 2
+                continue
+            # A number may continue in the next chunk.
+            if end == len(self.text) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip_line(self):
+        """Skip past the next newline, dropping the skipped text."""
+        while True:
+            newline = self.text.find("\n", self.pos)
+            if newline >= 0:
+                self.pos = newline + 1
+                return
+            self.pos = len(self.text)
+            if not self.fill():
+                return
+
+    def skip_element(self):
+        """Skip to the ``,`` or ``]`` that ends the current array element."""
+        depth = 0
+        in_string = escaped = False
+        while True:
+            text = self.text
+            for index in range(self.pos, len(text)):
+                char = text[index]
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif char == '"':
+                    in_string = True
+                elif char in "[{":
+                    depth += 1
+                elif char in "]}" and depth:
+                    depth -= 1
+                elif char in ",]" and not depth:
+                    self.pos = index
+                    return
+            self.pos = len(text)
+            if not self.fill():
+                return
+
+
+def iter_json_records(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Iterate over the JSON documents in a stream, reporting malformed ones.
+
+    Like ``iter_json_documents``, but a malformed record does not end the
+    stream: it is reported and reading resumes at the next line of JSON Lines
+    input, or at the next element of an array.
+
+    Args:
+    - stream (file): Text stream to read from, e.g. ``sys.stdin``.
+    - chunk_size (int): Number of characters to read at a time.
+
+    Returns:
+    - generator: ``(document, error)`` pairs. ``error`` is ``None``, or the
+      ``JSONDecodeError`` of a malformed record, whose ``document`` is
+      ``None``.
+    """
+    buffer = _StreamBuffer(stream, chunk_size)
+
+    if buffer.peek() != "[":
+        while buffer.peek():
+            try:
+                document = buffer.decode()
+            except json.JSONDecodeError as e:
+                yield None, e
+                buffer.skip_line()
+                continue
+            yield document, None
+        return
+
+    buffer.pos += 1
+    if buffer.peek() == "]":
+        buffer.pos += 1
+    else:
+        while True:
+            try:
+                document = buffer.decode()
+            except json.JSONDecodeError as e:
+                yield None, e
+                buffer.skip_element()
+            else:
+                yield document, None
+            separator = buffer.peek()
+            while separator not in (",", "]"):
+                yield None, json.JSONDecodeError(
+                    "Expecting ',' or ']'", buffer.text, buffer.pos
+                )
+                if not separator:
+                    return
+                buffer.skip_element()
+                separator = buffer.peek()
+            buffer.pos += 1
+            if separator == "]":
+                break
+
+    if buffer.peek():
+        yield None, json.JSONDecodeError("Extra data", buffer.text, buffer.pos)
+
+
+def iter_json_documents(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Iterate over the JSON documents in a stream without loading all of it.
+
+    Accepts JSON Lines (or any concatenation of JSON values) and a single
+    top-level JSON array, whose elements are yielded one by one. Memory use is
+    bounded by the largest single document, not by the size of the stream.
+
+    Args:
+    - stream (file): Text stream to read from, e.g. ``sys.stdin``.
+    - chunk_size (int): Number of characters to read at a time.
+
+    Returns:
+    - generator: Parsed JSON documents.
+
+    Raises:
+    - json.JSONDecodeError: At the first malformed record, see
+      ``iter_json_records`` to read on.
+    """
+    for document, error in iter_json_records(stream, chunk_size):
+        if error is not None:
+            raise error
+        yield document
@@ -1,4 +1,20 @@
-import json
+import re
+from types import MappingProxyType
+
+from fargate_task_validator.utils.json_loader import loads
+from fargate_task_validator.validators.rule_engine import (
+    container_rule,
+    evaluate,
+    evaluate_fail_fast,
+    register_rule,
+    summarize,
+    task_rule,
+    CONTAINER_SCOPE,
+    TASK_SCOPE,
+)
+
+# Bump whenever a check changes its results, so cached results are invalidated.
+RULESET_VERSION = 2
 
 UNSUPPORTED_CONTAINER_PARAMETERS = [
     "disableNetworking",
@@ -8,7 +24,6 @@ UNSUPPORTED_CONTAINER_PARAMETERS = [
     "extraHosts",
     "links",
     "privileged",
-    "systemControls",
 ]
 
 UNSUPPORTED_ROOT_PARAMETERS = [
@@ -29,230 +44,354 @@ SUPPORTED_SYSCTLS = [
     "kernel.shm_rmid_forced",
 ]
 
-def check_fargate_compatibility(task_definition_str):
+
+def compile_sysctl_matcher(supported):
+    """
+    Compile the supported sysctl list into one anchored regular expression.
+
+    Entries ending in ``.*`` match any namespace below that prefix, every other
+    entry matches exactly.
+
+    Args:
+    - supported (list): Supported namespaces, e.g. ``SUPPORTED_SYSCTLS``.
+
+    Returns:
+    - re.Pattern: Pattern whose ``fullmatch`` accepts supported namespaces.
+    """
+    alternatives = []
+    for namespace in supported:
+        if namespace.endswith(".*"):
+            alternatives.append(re.escape(namespace[:-1]) + ".+")
+        else:
+            alternatives.append(re.escape(namespace))
+    return re.compile("|".join(alternatives))
+
+
+SUPPORTED_SYSCTL_PATTERN = compile_sysctl_matcher(SUPPORTED_SYSCTLS)
+
+ALLOWED_CAPABILITIES = ["SYS_PTRACE"]
+
+ALLOWED_LOG_DRIVERS = ["awslogs", "splunk", "awsfirelens"]
+
+VALID_OS_VALUES = [
+    "LINUX",
+    "WINDOWS_SERVER_2019_FULL",
+    "WINDOWS_SERVER_2019_CORE",
+    "WINDOWS_SERVER_2022_FULL",
+    "WINDOWS_SERVER_2022_CORE",
+]
+
+VALID_OS_SET = frozenset(VALID_OS_VALUES)
+
+# Estimated costs of the checks that do more than read one key, relative to
+# those that do, from timing them on the benchmark task definitions.
+COMPUTING_COST = 4
+LINUX_PARAMETERS_COST = 2
+CAPABILITIES_COST = 3
+ULIMITS_COST = 2
+SYSCTL_COST = 20
+
+def check_fargate_compatibility(task_definition, fail_fast=False):
     """
     Check if a given JSON task definition is compatible with Fargate and return detailed feedback.
 
     Args:
-    - task_definition_str (str): JSON string representation of the task definition.
+    - task_definition (str | bytes | dict): JSON string representation of the task
+      definition, or an already parsed task definition.
+    - fail_fast (bool): Stop at the first failing check, see
+      ``check_task_definition``.
 
     Returns:
     - dict: Detailed feedback on compatibility checks.
     """
-    task_definition = json.loads(task_definition_str)
+    if isinstance(task_definition, (str, bytes, bytearray)):
+        task_definition = loads(task_definition)
+    return check_task_definition(task_definition, fail_fast)
 
-    feedback = {}
 
-    # 1. Check for Unsupported Root Parameters and Unsupported Container Parameters
-    for param in UNSUPPORTED_ROOT_PARAMETERS:
-        if task_definition.get(param) not in (None, "", []):
-            feedback[param] = "FAIL"
-        else:
-            feedback[param] = "OK"
-
-    container_definitions = task_definition.get("containerDefinitions", [])
-    for container in container_definitions:
-        for param in UNSUPPORTED_CONTAINER_PARAMETERS:
-            if container.get(param) not in (None, "", []):
-                feedback[param] = "FAIL"
-            else:
-                feedback[param] = "OK"
-
-    # 2. Network Mode Check
-    if task_definition.get("networkMode", "").lower() == "awsvpc":
-        feedback["networkMode"] = "OK"
-    else:
-        feedback["networkMode"] = "FAIL"
-
-    # 3. Linux Parameters
-    for container_def in task_definition.get("containerDefinitions", []):
-        # linuxParameters constraints
-        linux_params = container_def.get("linuxParameters", {})
-
-        # Check if there are any other keys other than 'capabilities' in linuxParameters
-        if set(linux_params.keys()) - {"capabilities"}:
-            feedback["linuxParameters"] = "FAIL"
-        else:
-            feedback["linuxParameters"] = "OK"
-
-            # Check the 'add' in capabilities
-            capabilities = linux_params.get("capabilities", {})
-            allowed_caps = ["SYS_PTRACE"]
-            if not all(cap in allowed_caps for cap in capabilities.get("add", [])):
-                feedback["linuxParameters_capabilities"] = "FAIL"
-            else:
-                feedback["linuxParameters_capabilities"] = "OK"
-
-    # 4. Volumes
-    if "volumes" in task_definition:
-        for volume in task_definition["volumes"]:
-            if "dockerVolumeConfiguration" in volume:
-                feedback["dockerVolumeConfiguration"] = "FAIL"
-                break
-        else:
-            feedback["dockerVolumeConfiguration"] = "OK"
-
-    # 5. CPU for Windows Containers
-    if "runtimePlatform" in task_definition:
-        if (
-            task_definition["runtimePlatform"]
-            .get("operatingSystemFamily", "")
-            .startswith("WINDOWS")
-            and int(task_definition.get("cpu", "0")) < 1024
-        ):
-            feedback["cpuWindows"] = "FAIL"
-        else:
-            feedback["cpuWindows"] = "OK"
-
-    # 6. Check for compatibilities
-    # compatibilities = task_definition.get("compatibilities", [])
-    # if "FARGATE" not in compatibilities:
-    #     feedback["compatibilities"] = "WARN"
-    # else:
-    #     feedback["compatibilities"] = "OK"
-
-    # 7. Check for requiresAttributes
-    requires_compatibilities = task_definition.get("requiresCompatibilities", [])
-    if "FARGATE" not in requires_compatibilities:
-        feedback["requiresCompatibilities"] = "FAIL"
-    else:
-        feedback["requiresCompatibilities"] = "OK"
-
-    # 8. Computing Check
-    valid_combinations_linux = {
-        "256": ["512", "1024", "2048"],
-        "512": ["1024", "2048", "3072", "4096"],
-        "1024": ["2048", "3072", "4096", "5120", "6144", "7168", "8192"],
-        "2048": [str(i) for i in range(4096, 16385, 1024)],
-        "4096": [str(i) for i in range(8192, 30721, 1024)],
-        "8192": [str(i) for i in range(16384, 61441, 4096)],
-        "16384": [str(i) for i in range(32768, 122881, 8192)],
+def check_task_definition(task_definition, fail_fast=False, order=None):
+    """
+    Check if a parsed task definition is compatible with Fargate and return detailed feedback.
+
+    The document is not copied or re-serialized, so callers that already hold the
+    parsed task definition pay for parsing only once.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+    - fail_fast (bool): Run the checks cheapest first and stop at the first
+      failing one, see ``evaluate_fail_fast``. Only the checks that ran are
+      reported.
+    - order (RuleOrder): Order of the checks with ``fail_fast``. Defaults to
+      the order of this process, which adapts to the documents it checks.
+
+    Returns:
+    - dict: Detailed feedback on compatibility checks. Container level checks
+      report the most severe status across all containers, and are left out
+      when there are no containers.
+    """
+    if fail_fast:
+        return summarize(evaluate_fail_fast(task_definition, order)[0])
+    return summarize(evaluate(task_definition))
+
+
+def collect_findings(task_definition, stats=None, memo=None, memo_counts=None):
+    """
+    Check a parsed task definition and return the findings per container.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+    - stats (RuleStats): Records the wall time and status of every check.
+      Optional.
+    - memo (ContainerMemo): Reuses the results of identical containers.
+      Optional.
+    - memo_counts (dict): Counts the ``hits`` and ``misses`` of this task
+      definition in ``memo``. Optional.
+
+    Returns:
+    - dict: Status per ``(container, check)``. ``container`` is ``None`` for
+      task level checks.
+    """
+    return evaluate(
+        task_definition, stats=stats, memo=memo, memo_counts=memo_counts
+    )
+
+
+def _is_set(value):
+    return value not in (None, "", [])
+
+
+# 1. Check for Unsupported Root Parameters and Unsupported Container Parameters
+def _unsupported_parameter_check(param):
+    def check(definition):
+        return "FAIL" if _is_set(definition.get(param)) else "OK"
+
+    return check
+
+
+for _param in UNSUPPORTED_ROOT_PARAMETERS:
+    register_rule(
+        _param, TASK_SCOPE, _unsupported_parameter_check(_param), paths=(_param,)
+    )
+
+for _param in UNSUPPORTED_CONTAINER_PARAMETERS:
+    register_rule(
+        _param, CONTAINER_SCOPE, _unsupported_parameter_check(_param), paths=(_param,)
+    )
+
+
+# 2. Network Mode Check
+@task_rule("networkMode", paths=("networkMode",))
+def check_network_mode(task_definition):
+    if (task_definition.get("networkMode") or "").lower() == "awsvpc":
+        return "OK"
+    return "FAIL"
+
+
+# 3. Linux Parameters
+@container_rule(
+    "linuxParameters", paths=("linuxParameters",), cost=LINUX_PARAMETERS_COST
+)
+def check_linux_parameters(container):
+    # Only 'capabilities' may be set in linuxParameters
+    linux_params = container.get("linuxParameters") or {}
+    return "FAIL" if set(linux_params.keys()) - {"capabilities"} else "OK"
+
+
+@container_rule(
+    "linuxParameters_capabilities", paths=("linuxParameters",), cost=CAPABILITIES_COST
+)
+def check_linux_capabilities(container):
+    linux_params = container.get("linuxParameters") or {}
+    if set(linux_params.keys()) - {"capabilities"}:
+        return None
+
+    capabilities = linux_params.get("capabilities") or {}
+    if all(cap in ALLOWED_CAPABILITIES for cap in capabilities.get("add", [])):
+        return "OK"
+    return "FAIL"
+
+
+# 4. Volumes
+@task_rule("dockerVolumeConfiguration", paths=("volumes",))
+def check_docker_volume_configuration(task_definition):
+    if "volumes" not in task_definition:
+        return None
+    for volume in task_definition["volumes"]:
+        if "dockerVolumeConfiguration" in volume:
+            return "FAIL"
+    return "OK"
+
+
+# 5. CPU for Windows Containers
+@task_rule("cpuWindows", paths=("runtimePlatform", "cpu"))
+def check_cpu_windows(task_definition):
+    if "runtimePlatform" not in task_definition:
+        return None
+    if (
+        task_definition["runtimePlatform"]
+        .get("operatingSystemFamily", "")
+        .startswith("WINDOWS")
+        and int(task_definition.get("cpu", "0")) < 1024
+    ):
+        return "FAIL"
+    return "OK"
+
+
+# 6. Check for requiresCompatibilities
+@task_rule("requiresCompatibilities", paths=("requiresCompatibilities",))
+def check_requires_compatibilities(task_definition):
+    if "FARGATE" not in task_definition.get("requiresCompatibilities", []):
+        return "FAIL"
+    return "OK"
+
+
+# 7. Computing Check
+def _memory_values(start, stop, step):
+    return frozenset(str(i) for i in range(start, stop + 1, step))
+
+
+# Valid task memory values (MiB) per task cpu value (CPU units). Built once at
+# import and immutable, so membership checks are set lookups.
+VALID_COMBINATIONS_LINUX = MappingProxyType(
+    {
+        "256": frozenset({"512", "1024", "2048"}),
+        "512": _memory_values(1024, 4096, 1024),
+        "1024": _memory_values(2048, 8192, 1024),
+        "2048": _memory_values(4096, 16384, 1024),
+        "4096": _memory_values(8192, 30720, 1024),
+        "8192": _memory_values(16384, 61440, 4096),
+        "16384": _memory_values(32768, 122880, 8192),
     }
+)
 
-    valid_combinations_windows = {
-        "1024": ["2048", "3072", "4096", "5120", "6144", "7168", "8192"],
-        "2048": [str(i) for i in range(4096, 16385, 1024)],
-        "4096": [str(i) for i in range(8192, 30721, 1024)],
+VALID_COMBINATIONS_WINDOWS = MappingProxyType(
+    {
+        "1024": _memory_values(2048, 8192, 1024),
+        "2048": _memory_values(4096, 16384, 1024),
+        "4096": _memory_values(8192, 30720, 1024),
     }
+)
 
-    valid_os_values = [
-        "LINUX",
-        "WINDOWS_SERVER_2019_FULL",
-        "WINDOWS_SERVER_2019_CORE",
-        "WINDOWS_SERVER_2022_FULL",
-        "WINDOWS_SERVER_2022_CORE",
-    ]
 
+def valid_combinations(os_family):
+    """Return the cpu to memory table for an ``operatingSystemFamily``."""
+    if "WINDOWS" in os_family:
+        return VALID_COMBINATIONS_WINDOWS
+    return VALID_COMBINATIONS_LINUX
+
+
+@task_rule(
+    "computing", paths=("cpu", "memory", "runtimePlatform"), cost=COMPUTING_COST
+)
+def check_computing(task_definition):
     if not all(key in task_definition for key in ["cpu", "memory"]):
-        feedback["computing"] = "FAIL"
-    else:
-        os_family = task_definition.get("runtimePlatform", {}).get(
-            "operatingSystemFamily", "LINUX"
-        )  # Make default "LINUX"
-
-        if os_family not in valid_os_values:
-            feedback["computing"] = "FAIL"
-        elif "WINDOWS" in os_family:
-            memory_values = valid_combinations_windows.get(task_definition["cpu"], [])
-            if task_definition["memory"] not in memory_values:
-                feedback["computing"] = "FAIL"
-            else:
-                feedback["computing"] = "OK"
-        else:
-            memory_values = valid_combinations_linux.get(task_definition["cpu"], [])
-            if task_definition["memory"] not in memory_values:
-                feedback["computing"] = "FAIL"
-            else:
-                feedback["computing"] = "OK"
-
-    # 9. Volumes Check (EBS, ephemeral, or EFS)
-    volumes = task_definition.get("volumes", [])
-    for volume in volumes:
-        if "dockerVolumeConfiguration" in volume:
-            feedback["volumes"] = "FAIL"
-            break
-        elif "efsVolumeConfiguration" in volume:
-            feedback["volumes"] = "OK"
-            break
-    else:
-        feedback["volumes"] = "OK"
-
-    # 10. Ephemeral Storage Check
-    if "ephemeralStorage" in task_definition:
-        size_in_gib = task_definition["ephemeralStorage"].get("sizeInGiB")
-        if isinstance(size_in_gib, int) and 21 <= size_in_gib <= 200:
-            feedback["ephemeralStorage"] = "OK"
-        else:
-            feedback["ephemeralStorage"] = "FAIL"
-    else:
-        feedback["ephemeralStorage"] = "OK"
-
-    # 11. Log Configuration Check
-    allowed_log_drivers = ["awslogs", "splunk", "awsfirelens"]
-    container_definitions = task_definition.get("containerDefinitions", [{}])
-    for container in container_definitions:
-        log_config = container.get("logConfiguration", {})
-        # fail only logDriver exists
-        if (
-            log_config
-            and log_config.get("logDriver", "").lower() not in allowed_log_drivers
-        ):
-            feedback["logConfiguration"] = "FAIL"
-            break
-    else:
-        feedback["logConfiguration"] = "OK"
-
-    # 12. Ulimits Check
-    for container in container_definitions:
-        ulimits = container.get("ulimits", [])
-        for ulimit in ulimits:
-            if ulimit.get("name") != "nofile":
-                feedback["ulimits"] = "FAIL"
-                break
-        else:
-            continue
-        break
-    else:
-        feedback["ulimits"] = "OK"
-
-    # 13. Stop Timeout Check
-    for container in container_definitions:
-        stop_timeout = container.get("stopTimeout", 0)
-        if stop_timeout > 120:
-            feedback["stopTimeout"] = "FAIL"
-            break
-    else:
-        feedback["stopTimeout"] = "OK"
-
-    # Add other checks as needed
-
-    # GPU constraints
-    for container_def in task_definition.get("containerDefinitions", []):
-        resource_requirements = container_def.get("resourceRequirements", [])
-        for requirement in resource_requirements:
-            if requirement.get("type") == "GPU":
-                feedback["GPU"] = "FAIL"
-                break
-        else:
-            feedback["GPU"] = "OK"
+        return "FAIL"
+
+    os_family = task_definition.get("runtimePlatform", {}).get(
+        "operatingSystemFamily", "LINUX"
+    )  # Make default "LINUX"
+
+    if not isinstance(os_family, str) or os_family not in VALID_OS_SET:
+        return "FAIL"
+    cpu, memory = task_definition["cpu"], task_definition["memory"]
+    if not isinstance(cpu, str) or not isinstance(memory, str):
+        return "FAIL"
+    return "OK" if memory in valid_combinations(os_family).get(cpu, ()) else "FAIL"
 
-    # 14. pidMode Check
+
+# 8. Volumes Check (EBS, ephemeral, or EFS)
+@task_rule("volumes", paths=("volumes",))
+def check_volumes(task_definition):
+    for volume in task_definition.get("volumes", []):
+        if "dockerVolumeConfiguration" in volume:
+            return "FAIL"
+    return "OK"
+
+
+# 9. Ephemeral Storage Check
+@task_rule("ephemeralStorage", paths=("ephemeralStorage",))
+def check_ephemeral_storage(task_definition):
+    if "ephemeralStorage" not in task_definition:
+        return "OK"
+    size_in_gib = task_definition["ephemeralStorage"].get("sizeInGiB")
+    if isinstance(size_in_gib, int) and 21 <= size_in_gib <= 200:
+        return "OK"
+    return "FAIL"
+
+
+# 10. Log Configuration Check
+@container_rule("logConfiguration", paths=("logConfiguration",))
+def check_log_configuration(container):
+    log_config = container.get("logConfiguration") or {}
+    # fail only logDriver exists
+    if (
+        log_config
+        and log_config.get("logDriver", "").lower() not in ALLOWED_LOG_DRIVERS
+    ):
+        return "FAIL"
+    return "OK"
+
+
+# 11. Ulimits Check
+@container_rule("ulimits", paths=("ulimits",), cost=ULIMITS_COST)
+def check_ulimits(container):
+    for ulimit in container.get("ulimits") or []:
+        if ulimit.get("name") != "nofile":
+            return "FAIL"
+    return "OK"
+
+
+# 12. Stop Timeout Check
+@container_rule("stopTimeout", paths=("stopTimeout",))
+def check_stop_timeout(container):
+    if (container.get("stopTimeout") or 0) > 120:
+        return "FAIL"
+    return "OK"
+
+
+# 13. GPU constraints
+@container_rule("GPU", paths=("resourceRequirements",))
+def check_gpu(container):
+    for requirement in container.get("resourceRequirements") or []:
+        if requirement.get("type") == "GPU":
+            return "FAIL"
+    return "OK"
+
+
+# 14. pidMode Check
+@task_rule("pidMode", paths=("pidMode",))
+def check_pid_mode(task_definition):
     if "pidMode" in task_definition and task_definition["pidMode"] != "task":
-        feedback["pidMode"] = "FAIL"
-    else:
-        feedback["pidMode"] = "OK"
-
-    # sysctl Check
-    for container_def in task_definition.get("containerDefinitions", []):
-        sysctls = container_def.get("sysctl", [])
-        for sysctl in sysctls:
-            if not any(sysctl["name"].startswith(prefix) for prefix in SUPPORTED_SYSCTLS):
-                feedback["sysctl"] = "FAIL"
-                break
-        else:
-            continue
-        break
-    else:
-        feedback["sysctl"] = "OK"
+        return "FAIL"
+    return "OK"
 
-    return feedback
+
+# 15. sysctl Check
+def unsupported_sysctls(container):
+    """
+    List the sysctl namespaces of a container that Fargate does not support.
+
+    Reads ``systemControls`` entries (``namespace``) and legacy ``sysctl``
+    entries (``name``) in a single pass.
+
+    Returns:
+    - list: Unsupported namespaces, in the order they appear.
+    """
+    unsupported = []
+    fullmatch = SUPPORTED_SYSCTL_PATTERN.fullmatch
+    for field, key in (("systemControls", "namespace"), ("sysctl", "name")):
+        for entry in container.get(field) or []:
+            namespace = entry.get(key) if isinstance(entry, dict) else None
+            if not isinstance(namespace, str):
+                unsupported.append(f"<missing {key}>")
+            elif not fullmatch(namespace):
+                unsupported.append(namespace)
+    return unsupported
+
+
+@container_rule("sysctl", paths=("systemControls", "sysctl"), cost=SYSCTL_COST)
+def check_sysctl(container):
+    unsupported = unsupported_sysctls(container)
+    if unsupported:
+        return f"FAIL: {', '.join(unsupported)}"
+    return "OK"
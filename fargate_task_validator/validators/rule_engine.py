@@ -0,0 +1,620 @@
+import heapq
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from time import perf_counter
+
+TASK_SCOPE = "task"
+CONTAINER_SCOPE = "container"
+
+STATUS_SEVERITY = {"OK": 0, "WARN": 1, "FAIL": 2}
+
+DEFAULT_MEMO_ENTRIES = 4096
+# Variants remembered per container image and name. Kept small, since every
+# lookup compares against all of them.
+MEMO_BUCKET_ENTRIES = 2
+
+# Estimated cost of a check that reads one key, the unit of ``Rule.cost``.
+DEFAULT_RULE_COST = 1
+# Documents evaluated between two reorderings of the rules by ``RuleOrder``.
+REORDER_INTERVAL = 64
+
+
+class Rule:
+    """
+    A single Fargate compatibility check.
+
+    Task rules receive the whole task definition, container rules receive one
+    entry of ``containerDefinitions``. The check returns a status string that
+    starts with ``OK``, ``WARN`` or ``FAIL``, or ``None`` when the rule does
+    not apply.
+
+    ``paths`` lists the top-level keys the check reads, of the task definition
+    or of the container. Its findings are reused by ``evaluate_incremental``
+    while none of them change. ``None`` means the check may read anything.
+
+    ``cost`` is the estimated time of one check, relative to a check that reads
+    a single key. ``evaluate_fail_fast`` runs cheap checks first.
+    """
+
+    def __init__(self, name, scope, check, paths=None, cost=DEFAULT_RULE_COST):
+        self.name = name
+        self.scope = scope
+        self.check = check
+        self.paths = frozenset(paths) if paths is not None else None
+        self.cost = cost
+        self.id = None
+
+    def affected_by(self, changed):
+        """Whether the rule must run again after ``changed`` keys changed."""
+        return self.paths is None or changed is None or bool(self.paths & changed)
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.scope!r})"
+
+
+RULES = []
+RULES_BY_NAME = {}
+
+# Rule order learned by this process, see ``rule_order``.
+_rule_order = None
+
+
+def register_rule(name, scope, check, paths=None, cost=DEFAULT_RULE_COST):
+    """
+    Add a rule to the registry. Rules are reported in registration order.
+
+    Args:
+    - name (str): Feedback key of the rule.
+    - scope (str): ``TASK_SCOPE`` or ``CONTAINER_SCOPE``.
+    - check (callable): Function returning the status of the rule.
+    - paths (iterable): Top-level keys read by ``check``. ``None`` when unknown.
+    - cost (float): Estimated relative cost of ``check``, see ``Rule``.
+
+    Returns:
+    - Rule: The registered rule.
+    """
+    if name in RULES_BY_NAME:
+        raise ValueError(f"Rule '{name}' is already registered.")
+    rule = Rule(name, scope, check, paths, cost)
+    # Small integer id, the position of the rule in the registry.
+    rule.id = len(RULES)
+    RULES.append(rule)
+    RULES_BY_NAME[name] = rule
+    return rule
+
+
+def task_rule(name, paths=None, cost=DEFAULT_RULE_COST):
+    """Decorator registering a task level rule."""
+
+    def decorator(check):
+        register_rule(name, TASK_SCOPE, check, paths, cost)
+        return check
+
+    return decorator
+
+
+def container_rule(name, paths=None, cost=DEFAULT_RULE_COST):
+    """Decorator registering a container level rule."""
+
+    def decorator(check):
+        register_rule(name, CONTAINER_SCOPE, check, paths, cost)
+        return check
+
+    return decorator
+
+
+def split_status(status):
+    """
+    Split a status such as ``"FAIL: vm.swappiness"`` into its word and detail.
+
+    Returns:
+    - tuple: ``(word, detail)``. ``detail`` is ``None`` when there is none.
+    """
+    head, separator, detail = status.partition(":")
+    word = head.split(" ", 1)[0]
+    return word, (detail.strip() or None) if separator else None
+
+
+def severity(status):
+    return STATUS_SEVERITY.get(split_status(status)[0], 2)
+
+
+def container_labels(container_definitions):
+    """
+    Name each container for reporting.
+
+    Containers are labeled by their ``name``. Unnamed containers and repeated
+    names fall back to their position, e.g. ``containerDefinitions[2]``.
+    """
+    labels = []
+    seen = set()
+    for index, container in enumerate(container_definitions):
+        name = container.get("name") if isinstance(container, dict) else None
+        if not isinstance(name, str) or not name or name in seen:
+            name = f"containerDefinitions[{index}]"
+        seen.add(name)
+        labels.append(name)
+    return labels
+
+
+def timed_check(rule, stats):
+    """Wrap ``rule.check`` so that every call is recorded in ``stats``."""
+    check, name = rule.check, rule.name
+
+    def timed(document):
+        start = perf_counter()
+        status = check(document)
+        stats.record(name, perf_counter() - start, status)
+        return status
+
+    return timed
+
+
+def checks_for(rules, scope, stats=None):
+    """
+    List ``(name, check)`` pairs of the rules in ``scope``.
+
+    The checks are only wrapped for timing when ``stats`` is given, so an
+    uninstrumented run calls them directly.
+    """
+    if stats is None:
+        return [(rule.name, rule.check) for rule in rules if rule.scope == scope]
+    return [
+        (rule.name, timed_check(rule, stats)) for rule in rules if rule.scope == scope
+    ]
+
+
+def read_paths(rules):
+    """
+    Union of the ``paths`` of ``rules``.
+
+    Returns:
+    - tuple: Sorted keys read by the rules, or ``None`` if one of them may
+      read anything.
+    """
+    paths = set()
+    for rule in rules:
+        if rule.paths is None:
+            return None
+        paths |= rule.paths
+    return tuple(sorted(paths))
+
+
+@lru_cache(maxsize=32)
+def memo_signature(rules):
+    """Names and ``read_paths`` of the container rules among ``rules``."""
+    container_rules = [rule for rule in rules if rule.scope == CONTAINER_SCOPE]
+    return tuple(rule.name for rule in container_rules), read_paths(container_rules)
+
+
+class ContainerMemo:
+    """
+    Bounded LRU cache of container rule results, keyed by container content.
+
+    Identical containers, such as the same sidecar in many task definitions,
+    are then checked once per batch. Containers are bucketed by ``image`` and
+    ``name`` and compared on the keys read by the container rules only, so
+    large unrelated fields like ``environment`` cost nothing. Values are
+    compared with ``==``, so rules must give numerically equal values (``1``,
+    ``1.0``, ``True``) the same status, and they are not copied, so checked
+    documents must not be modified while the memo is in use. Safe to share
+    between threads.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MEMO_ENTRIES):
+        self.max_entries = max_entries
+        self.buckets = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def statuses(self, container, checks, names, paths, counts=None):
+        """
+        Return the status of every check for ``container``, running the checks
+        only if an identical container has not been seen.
+
+        Args:
+        - container (dict): Entry of ``containerDefinitions``.
+        - checks (list): ``(name, check)`` pairs, see ``checks_for``.
+        - names (tuple): Names of ``checks``, which are part of the key.
+        - paths (tuple): Keys read by the checks, see ``read_paths``. ``None``
+          compares whole containers.
+        - counts (dict): ``hits`` and ``misses`` of the caller, counted apart
+          from the totals of the memo that every caller shares. Optional.
+
+        Returns:
+        - tuple: One status (or ``None``) per check.
+        """
+        image, name = container.get("image"), container.get("name")
+        key = (
+            names,
+            image if isinstance(image, str) else None,
+            name if isinstance(name, str) else None,
+        )
+        if paths is None:
+            values = container
+        else:
+            values = [[path, container[path]] for path in paths if path in container]
+
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                for known, statuses in bucket:
+                    if known == values:
+                        self.buckets.move_to_end(key)
+                        self.hits += 1
+                        if counts is not None:
+                            counts["hits"] += 1
+                        return statuses
+            self.misses += 1
+        if counts is not None:
+            counts["misses"] += 1
+
+        statuses = tuple(check(container) for _, check in checks)
+        # Entries refer to the checked values instead of copying them, which
+        # would cost more than the checks.
+        entry = (values, statuses)
+        with self.lock:
+            bucket = self.buckets.setdefault(key, [])
+            if len(bucket) >= MEMO_BUCKET_ENTRIES:
+                # Many variants of one container, keep only the recent ones.
+                del bucket[0]
+                self.size -= 1
+            bucket.append(entry)
+            self.buckets.move_to_end(key)
+            self.size += 1
+            while self.size > self.max_entries:
+                _, evicted = self.buckets.popitem(last=False)
+                self.size -= len(evicted)
+        return statuses
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def evaluate(task_definition, rules=None, stats=None, memo=None, memo_counts=None):
+    """
+    Run the rules against a task definition in a single pass.
+
+    Task rules see the task definition once and every container is visited
+    once, with all container rules applied to it.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+    - rules (list): Rules to run. Defaults to every registered rule.
+    - stats (RuleStats): Records the wall time and status of every check.
+      Optional, see ``fargate_task_validator.profiling``.
+    - memo (ContainerMemo): Reuses the container rule results of identical
+      containers. Optional.
+    - memo_counts (dict): Counts the ``hits`` and ``misses`` of this call in
+      ``memo``. Optional.
+
+    Returns:
+    - dict: Status per ``(container, rule name)``. ``container`` is ``None``
+      for task level rules.
+    """
+    if rules is None:
+        rules = RULES
+
+    task_checks = checks_for(rules, TASK_SCOPE, stats)
+    container_checks = checks_for(rules, CONTAINER_SCOPE, stats)
+
+    findings = {}
+    for name, check in task_checks:
+        status = check(task_definition)
+        if status is not None:
+            findings[(None, name)] = status
+
+    if container_checks:
+        container_definitions = task_definition.get("containerDefinitions") or []
+        labels = container_labels(container_definitions)
+        if memo is not None:
+            names, paths = memo_signature(tuple(rules))
+        for label, container in zip(labels, container_definitions):
+            if memo is not None and isinstance(container, dict):
+                statuses = memo.statuses(
+                    container, container_checks, names, paths, memo_counts
+                )
+                for (name, _), status in zip(container_checks, statuses):
+                    if status is not None:
+                        findings[(label, name)] = status
+                continue
+            for name, check in container_checks:
+                status = check(container)
+                if status is not None:
+                    findings[(label, name)] = status
+
+    return findings
+
+
+class RuleOrder:
+    """
+    Orders rules so that the checks most likely to fail cheaply run first.
+
+    Stopping at the first failure, the expected cost of a document is lowest
+    when the rules run by increasing ``cost / failure rate``. Failure rates
+    start at 1/2 for every rule, which orders the rules by ``cost``, and are
+    then learned from the documents evaluated with ``evaluate_fail_fast``. The
+    order is updated every ``reorder_interval`` documents.
+
+    Container rules run once per container, so their cost is multiplied by the
+    number of containers of the document. Counters are updated without a lock,
+    a lost update from another thread only delays the learning a little.
+    """
+
+    def __init__(self, rules=None, reorder_interval=REORDER_INTERVAL):
+        self.rules = list(RULES if rules is None else rules)
+        self.reorder_interval = reorder_interval
+        # rule name -> [documents, failures]
+        self.counts = {rule.name: [0, 0] for rule in self.rules}
+        self.documents = 0
+        self._reorder()
+
+    def failure_rate(self, rule):
+        documents, failures = self.counts[rule.name]
+        # Laplace estimate, so unseen and never failing rules keep a chance.
+        return (failures + 1) / (documents + 2)
+
+    def _reorder(self):
+        def score(rule):
+            return (rule.cost / self.failure_rate(rule), rule.id)
+
+        ordered = sorted(self.rules, key=score)
+        self.task_rules = [
+            (score(rule), rule) for rule in ordered if rule.scope == TASK_SCOPE
+        ]
+        self.container_rules = [
+            (score(rule), rule) for rule in ordered if rule.scope == CONTAINER_SCOPE
+        ]
+        # Merged order per number of containers, until the next reordering.
+        self.orders = {}
+
+    def order(self, containers=1):
+        """
+        Return the rules in evaluation order.
+
+        Args:
+        - containers (int): Number of containers of the document.
+
+        Returns:
+        - list: The rules, cheapest expected cost per failure first.
+        """
+        rules = self.orders.get(containers)
+        if rules is None:
+            # Both lists are sorted and scaling one of them keeps it sorted.
+            scaled = (
+                ((cost * containers, id), rule)
+                for (cost, id), rule in self.container_rules
+            )
+            rules = [rule for _, rule in heapq.merge(self.task_rules, scaled)]
+            self.orders[containers] = rules
+        return rules
+
+    def record(self, rule, failed):
+        """Count one document evaluated by ``rule``."""
+        counts = self.counts[rule.name]
+        counts[0] += 1
+        if failed:
+            counts[1] += 1
+
+    def document_done(self):
+        """Count one evaluated document, reordering the rules when due."""
+        self.documents += 1
+        if self.documents % self.reorder_interval == 0:
+            self._reorder()
+
+
+def rule_order():
+    """
+    Return the fail-fast rule order of this process, creating it on first use.
+
+    Every worker process learns the failure rates of its own documents.
+    """
+    global _rule_order
+    if _rule_order is None:
+        _rule_order = RuleOrder()
+    return _rule_order
+
+
+def evaluate_fail_fast(task_definition, order=None, stats=None):
+    """
+    Run the rules against a task definition until one of them fails.
+
+    Rules run in the order of ``order`` and each container rule checks the
+    containers before the next rule runs. The failure rates of ``order`` are
+    updated with the results.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+    - order (RuleOrder): Evaluation order of the rules. Defaults to the order
+      of this process, see ``rule_order``.
+    - stats (RuleStats): Records the wall time and status of every check.
+      Optional.
+
+    Returns:
+    - tuple: ``(findings, counts)``. ``findings`` holds the statuses of the
+      rules that ran, as ``evaluate`` would return them, up to the first
+      ``FAIL``. ``counts`` holds the number of rules ``evaluated`` and
+      ``skipped``.
+    """
+    if order is None:
+        order = rule_order()
+
+    container_definitions = task_definition.get("containerDefinitions") or []
+    labels = container_labels(container_definitions)
+    rules = order.order(max(1, len(container_definitions)))
+
+    findings = {}
+    evaluated = 0
+    for rule in rules:
+        check = rule.check if stats is None else timed_check(rule, stats)
+        failed = False
+        if rule.scope == TASK_SCOPE:
+            targets = [(None, task_definition)]
+        else:
+            targets = zip(labels, container_definitions)
+        for label, document in targets:
+            status = check(document)
+            if status is not None:
+                findings[(label, rule.name)] = status
+                if status.startswith("FAIL"):
+                    failed = True
+                    break
+        evaluated += 1
+        order.record(rule, failed)
+        if failed:
+            break
+    order.document_done()
+    return findings, {"evaluated": evaluated, "skipped": len(rules) - evaluated}
+
+
+def changed_keys(previous, current):
+    """
+    List the top-level keys whose values differ between two documents.
+
+    Returns:
+    - set: Keys added, removed or changed, or ``None`` when either document is
+      not an object.
+    """
+    if not isinstance(previous, dict) or not isinstance(current, dict):
+        return None
+    return {
+        key
+        for key in previous.keys() | current.keys()
+        if key not in previous or key not in current or previous[key] != current[key]
+    }
+
+
+def evaluate_incremental(
+    previous, previous_findings, task_definition, rules=None, stats=None
+):
+    """
+    Re-run only the rules affected by the changes since a previous revision.
+
+    A rule is re-run when one of its ``paths`` changed, in the task definition
+    for task rules or in the container for container rules. Containers are
+    matched to the previous revision by label. The findings of every other
+    rule are taken from ``previous_findings``.
+
+    Args:
+    - previous (dict): Previous revision of the task definition.
+    - previous_findings (dict): Findings of ``previous``, as returned by
+      ``evaluate`` with the same ``rules``.
+    - task_definition (dict): New revision of the task definition.
+    - rules (list): Rules to run. Defaults to every registered rule.
+    - stats (RuleStats): Records the checks that are run. Optional.
+
+    Returns:
+    - tuple: ``(findings, counts)``. ``findings`` is the same as
+      ``evaluate(task_definition, rules)`` would return, ``counts`` holds the
+      number of rule checks ``evaluated`` and ``reused``.
+    """
+    if rules is None:
+        rules = RULES
+
+    task_rules = [rule for rule in rules if rule.scope == TASK_SCOPE]
+    container_rules = [rule for rule in rules if rule.scope == CONTAINER_SCOPE]
+    checks = dict(checks_for(rules, TASK_SCOPE, stats))
+    checks.update(checks_for(rules, CONTAINER_SCOPE, stats))
+
+    findings = {}
+    counts = {"evaluated": 0, "reused": 0}
+
+    def apply(rule, label, document, changed):
+        key = (label, rule.name)
+        if rule.affected_by(changed):
+            counts["evaluated"] += 1
+            status = checks[rule.name](document)
+        else:
+            counts["reused"] += 1
+            status = previous_findings.get(key)
+        if status is not None:
+            findings[key] = status
+
+    changed = changed_keys(previous, task_definition)
+    for rule in task_rules:
+        apply(rule, None, task_definition, changed)
+
+    if container_rules:
+        previous_containers = previous.get("containerDefinitions") or []
+        previous_by_label = dict(
+            zip(container_labels(previous_containers), previous_containers)
+        )
+        container_definitions = task_definition.get("containerDefinitions") or []
+        labels = container_labels(container_definitions)
+        for label, container in zip(labels, container_definitions):
+            container_changed = None
+            if label in previous_by_label:
+                container_changed = changed_keys(previous_by_label[label], container)
+            for rule in container_rules:
+                apply(rule, label, container, container_changed)
+
+    return findings, counts
+
+
+def findings_to_list(findings):
+    """
+    Convert findings to JSON serializable ``[container, rule, status]`` items.
+    """
+    return [
+        [container, name, status] for (container, name), status in findings.items()
+    ]
+
+
+def findings_from_list(items):
+    """Convert the output of ``findings_to_list`` back to findings."""
+    return {(container, name): status for container, name, status in items}
+
+
+def summarize(findings, rules=None):
+    """
+    Collapse findings into one status per rule, keeping the most severe one.
+
+    Container rules report the status word only, since details such as the
+    offending values differ between containers.
+
+    Args:
+    - findings (dict): Findings as returned by ``evaluate``.
+    - rules (list): Rules defining the output order. Defaults to the registry.
+
+    Returns:
+    - dict: Status per rule name.
+    """
+    if rules is None:
+        rules = RULES
+
+    worst = {}
+    for (_, name), status in findings.items():
+        current = worst.get(name)
+        if current is None or severity(status) > severity(current):
+            worst[name] = status
+
+    summary = {}
+    for rule in rules:
+        if rule.name in worst:
+            status = worst[rule.name]
+            if rule.scope == CONTAINER_SCOPE:
+                status = split_status(status)[0]
+            summary[rule.name] = status
+    return summary
+
+
+def failing_containers(findings):
+    """
+    Group failing container findings by rule.
+
+    Returns:
+    - dict: List of container labels per rule name. Labels carry the detail of
+      the finding, e.g. ``"app (vm.swappiness)"``.
+    """
+    failing = {}
+    for (container, name), status in findings.items():
+        if container is not None and severity(status) == STATUS_SEVERITY["FAIL"]:
+            detail = split_status(status)[1]
+            label = f"{container} ({detail})" if detail else container
+            failing.setdefault(name, []).append(label)
+    return failing
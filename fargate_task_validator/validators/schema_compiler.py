@@ -0,0 +1,381 @@
+import re
+
+# Draft 7 keywords that only annotate a schema and never affect validity.
+ANNOTATION_KEYWORDS = {
+    "$id",
+    "$schema",
+    "$comment",
+    "title",
+    "description",
+    "default",
+    "readOnly",
+    "writeOnly",
+    "examples",
+    "definitions",
+    "format",
+}
+
+# Draft 7 keywords this compiler knows how to generate code for.
+SUPPORTED_KEYWORDS = {
+    "$ref",
+    "type",
+    "properties",
+    "required",
+    "items",
+    "additionalProperties",
+    "enum",
+    "const",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "minItems",
+    "maxItems",
+    "pattern",
+    "allOf",
+    "anyOf",
+    "not",
+}
+
+# Draft 7 keywords that assert something and are not compiled. Schemas using
+# them are rejected so the compiled result can never disagree with Draft 7.
+UNSUPPORTED_KEYWORDS = {
+    "multipleOf",
+    "additionalItems",
+    "uniqueItems",
+    "contains",
+    "maxProperties",
+    "minProperties",
+    "patternProperties",
+    "dependencies",
+    "propertyNames",
+    "if",
+    "then",
+    "else",
+    "oneOf",
+}
+
+TYPE_CHECKS = {
+    "object": "isinstance({0}, dict)",
+    "array": "isinstance({0}, list)",
+    "string": "isinstance({0}, str)",
+    "boolean": "isinstance({0}, bool)",
+    "null": "{0} is None",
+    "number": "(isinstance({0}, (int, float)) and not isinstance({0}, bool))",
+    "integer": (
+        "((isinstance({0}, int) and not isinstance({0}, bool))"
+        " or (isinstance({0}, float) and {0}.is_integer()))"
+    ),
+}
+
+
+class UnsupportedSchemaError(Exception):
+    """Raised when a schema uses a keyword or reference the compiler cannot handle."""
+
+
+def _json_equal(left, right):
+    # JSON equality: booleans never equal numbers, containers compare deeply.
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left == right
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(
+            _json_equal(value, right[key]) for key, value in left.items()
+        )
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(
+            _json_equal(a, b) for a, b in zip(left, right)
+        )
+    return type(left) is type(right) and left == right
+
+
+def _is_trivial(schema):
+    # A schema without any asserting keyword accepts every instance.
+    if schema is True:
+        return True
+    return isinstance(schema, dict) and not (
+        schema.keys() & (SUPPORTED_KEYWORDS | UNSUPPORTED_KEYWORDS)
+    )
+
+
+class CompiledValidator:
+    """
+    A schema compiled to specialized Python code.
+
+    Only answers whether an instance is valid. Use the Draft 7 validator to
+    explain why an instance is invalid.
+    """
+
+    def __init__(self, schema, source, is_valid):
+        self.schema = schema
+        self.source = source
+        self.is_valid = is_valid
+
+
+class _Compiler:
+    def __init__(self, root):
+        self.root = root
+        self.functions = {}
+        self.sources = []
+        self.namespace = {"_json_equal": _json_equal}
+
+    def constant(self, value):
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def resolve(self, ref):
+        if not ref.startswith("#"):
+            raise UnsupportedSchemaError(f"Cannot resolve reference '{ref}'.")
+        from urllib.parse import unquote
+
+        target = self.root
+        pointer = unquote(ref[1:])
+        if pointer:
+            for token in pointer.lstrip("/").split("/"):
+                token = token.replace("~1", "/").replace("~0", "~")
+                try:
+                    if isinstance(target, list):
+                        target = target[int(token)]
+                    else:
+                        target = target[token]
+                except (KeyError, IndexError, TypeError, ValueError):
+                    raise UnsupportedSchemaError(f"Cannot resolve reference '{ref}'.")
+        return target
+
+    def function_for(self, schema, _aliases=()):
+        key = id(schema)
+        if key in self.functions:
+            return self.functions[key]
+        if (
+            isinstance(schema, dict)
+            and "$ref" in schema
+            and key not in _aliases
+        ):
+            # A bare reference needs no function of its own.
+            target = self.resolve(schema["$ref"])
+            return self.function_for(target, _aliases + (key,))
+        name = f"_validate_{len(self.functions)}"
+        self.functions[key] = name
+        self.sources.append(self.compile_function(name, schema))
+        return name
+
+    def compile_function(self, name, schema):
+        lines = [f"def {name}(data):"]
+        body = self.compile_checks(schema)
+        lines.extend("    " + line for line in body)
+        lines.append("    return True")
+        return "\n".join(lines)
+
+    def inline(self, schema, expression):
+        """Return a Python expression validating ``expression``, if one suffices."""
+        if not isinstance(schema, dict) or "$ref" in schema:
+            return None
+        if schema.keys() & (SUPPORTED_KEYWORDS | UNSUPPORTED_KEYWORDS) != {"type"}:
+            return None
+        types = schema["type"]
+        if isinstance(types, str):
+            types = [types]
+        if not types or set(types) - TYPE_CHECKS.keys():
+            return None
+        return " or ".join(TYPE_CHECKS[kind].format(expression) for kind in types)
+
+    def guard(self, schema, kind, checks):
+        # Skip the instance type test when "type" has already enforced it.
+        if not checks:
+            return []
+        if schema.get("type") == kind:
+            return checks
+        python_check = TYPE_CHECKS[kind].format("data")
+        return [f"if {python_check}:"] + ["    " + line for line in checks]
+
+    def compile_checks(self, schema):
+        if _is_trivial(schema):
+            return []
+        if schema is False:
+            return ["return False"]
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"Invalid schema: {schema!r}")
+
+        if "$ref" in schema:
+            # Draft 7 ignores every sibling of $ref.
+            target = self.function_for(self.resolve(schema["$ref"]))
+            return [f"if not {target}(data):", "    return False"]
+
+        unsupported = UNSUPPORTED_KEYWORDS & schema.keys()
+        if unsupported:
+            raise UnsupportedSchemaError(
+                f"Unsupported keywords: {', '.join(sorted(unsupported))}"
+            )
+
+        lines = []
+
+        if "type" in schema:
+            types = schema["type"]
+            if isinstance(types, str):
+                types = [types]
+            unknown = set(types) - TYPE_CHECKS.keys()
+            if unknown:
+                raise UnsupportedSchemaError(f"Unknown types: {sorted(unknown)}")
+            checks = [TYPE_CHECKS[kind].format("data") for kind in types]
+            lines += [f"if not ({' or '.join(checks)}):", "    return False"]
+
+        if "enum" in schema and all(isinstance(v, str) for v in schema["enum"]):
+            values = self.constant(frozenset(schema["enum"]))
+            lines += [
+                f"if not (isinstance(data, str) and data in {values}):",
+                "    return False",
+            ]
+        elif "enum" in schema:
+            values = self.constant(list(schema["enum"]))
+            lines += [
+                f"if not any(_json_equal(data, value) for value in {values}):",
+                "    return False",
+            ]
+
+        if "const" in schema:
+            value = self.constant(schema["const"])
+            lines += [f"if not _json_equal(data, {value}):", "    return False"]
+
+        lines += self.compile_object_checks(schema)
+        lines += self.compile_array_checks(schema)
+        lines += self.compile_string_checks(schema)
+        lines += self.compile_number_checks(schema)
+
+        for subschema in schema.get("allOf", []):
+            target = self.function_for(subschema)
+            lines += [f"if not {target}(data):", "    return False"]
+
+        if "anyOf" in schema:
+            targets = [self.function_for(subschema) for subschema in schema["anyOf"]]
+            checks = " or ".join(f"{target}(data)" for target in targets)
+            lines += [f"if not ({checks}):", "    return False"]
+
+        if "not" in schema:
+            target = self.function_for(schema["not"])
+            lines += [f"if {target}(data):", "    return False"]
+
+        return lines
+
+    def compile_object_checks(self, schema):
+        checks = []
+        for name in schema.get("required", []):
+            checks += [f"if {name!r} not in data:", "    return False"]
+
+        properties = schema.get("properties", {})
+        for name, subschema in properties.items():
+            if _is_trivial(subschema):
+                continue
+            value = f"data[{name!r}]"
+            check = self.inline(subschema, value)
+            if check is None:
+                check = f"{self.function_for(subschema)}({value})"
+            checks += [
+                f"if {name!r} in data and not ({check}):",
+                "    return False",
+            ]
+
+        if "additionalProperties" in schema:
+            extra = schema["additionalProperties"]
+            known = self.constant(frozenset(properties))
+            if extra is False:
+                checks += [
+                    f"if any(key not in {known} for key in data):",
+                    "    return False",
+                ]
+            elif extra is not True:
+                target = self.function_for(extra)
+                checks += [
+                    "for key, value in data.items():",
+                    f"    if key not in {known} and not {target}(value):",
+                    "        return False",
+                ]
+
+        return self.guard(schema, "object", checks)
+
+    def compile_array_checks(self, schema):
+        checks = []
+        if "minItems" in schema:
+            checks += [f"if len(data) < {schema['minItems']!r}:", "    return False"]
+        if "maxItems" in schema:
+            checks += [f"if len(data) > {schema['maxItems']!r}:", "    return False"]
+        if "items" in schema:
+            items = schema["items"]
+            if isinstance(items, list):
+                raise UnsupportedSchemaError("Tuple 'items' is not supported.")
+            if not _is_trivial(items):
+                check = self.inline(items, "item")
+                if check is None:
+                    check = f"{self.function_for(items)}(item)"
+                checks += [
+                    "for item in data:",
+                    f"    if not ({check}):",
+                    "        return False",
+                ]
+
+        return self.guard(schema, "array", checks)
+
+    def compile_string_checks(self, schema):
+        checks = []
+        # Draft 7 counts code points, which is what len() does for str.
+        if "minLength" in schema:
+            checks += [
+                f"if len(data) < {schema['minLength']!r}:",
+                "    return False",
+            ]
+        if "maxLength" in schema:
+            checks += [
+                f"if len(data) > {schema['maxLength']!r}:",
+                "    return False",
+            ]
+        if "pattern" in schema:
+            pattern = self.constant(re.compile(schema["pattern"]))
+            checks += [f"if not {pattern}.search(data):", "    return False"]
+
+        return self.guard(schema, "string", checks)
+
+    def compile_number_checks(self, schema):
+        comparisons = {
+            "minimum": "<",
+            "maximum": ">",
+            "exclusiveMinimum": "<=",
+            "exclusiveMaximum": ">=",
+        }
+        checks = []
+        for keyword, operator in comparisons.items():
+            if keyword in schema:
+                checks += [
+                    f"if data {operator} {schema[keyword]!r}:",
+                    "    return False",
+                ]
+
+        return self.guard(schema, "number", checks)
+
+
+def compile_schema(schema, root=None):
+    """
+    Generate and compile a Python function that validates instances of a schema.
+
+    References are resolved against ``root``, which defaults to ``schema``
+    itself. Only the parts of the schema reachable from ``schema`` are compiled.
+
+    Args:
+    - schema (dict): Draft 7 JSON schema.
+    - root (dict): Document containing ``schema``, when compiling a subschema.
+
+    Returns:
+    - CompiledValidator: Validator exposing ``is_valid(instance)`` and the
+      generated ``source``.
+
+    Raises:
+    - UnsupportedSchemaError: If the schema uses features that are not compiled.
+    """
+    compiler = _Compiler(schema if root is None else root)
+    entry = compiler.function_for(schema)
+    source = "\n\n".join(compiler.sources) + "\n"
+    namespace = compiler.namespace
+    exec(compile(source, "<compiled task definition schema>", "exec"), namespace)
+    return CompiledValidator(schema, source, namespace[entry])
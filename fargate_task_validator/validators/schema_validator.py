@@ -1,4 +1,12 @@
-from jsonschema import Draft7Validator
+from functools import lru_cache
+from itertools import islice
+
+from fargate_task_validator.validators.schema_compiler import (
+    compile_schema,
+    UnsupportedSchemaError,
+    SUPPORTED_KEYWORDS,
+    UNSUPPORTED_KEYWORDS,
+)
 
 container_definition_schema = {
     "id": "/containerDefinition",
@@ -274,4 +282,177 @@ task_definition_schema.update(
     }
 )
 
-validator = Draft7Validator(task_definition_schema)
+
+@lru_cache(maxsize=None)
+def get_validator():
+    """
+    Build the ``Draft7Validator`` for ``task_definition_schema``, once per process.
+
+    jsonschema is imported on first use, which keeps importing this module cheap.
+    """
+    from jsonschema import Draft7Validator
+
+    return Draft7Validator(task_definition_schema)
+
+
+def __getattr__(name):
+    # ``validator`` is built lazily, on first access.
+    if name == "validator":
+        return get_validator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+SCHEMA_VALID_MESSAGE = "Task definition schema is valid!"
+
+DEFAULT_MAX_SCHEMA_ERRORS = 20
+
+
+@lru_cache(maxsize=None)
+def get_compiled_validator():
+    """
+    Compile ``task_definition_schema`` to Python code, once per process.
+
+    Returns:
+    - CompiledValidator: The compiled validator, or ``None`` if the schema uses
+      features the compiler does not support.
+    """
+    try:
+        return compile_schema(task_definition_schema)
+    except UnsupportedSchemaError:
+        return None
+
+
+def json_pointer(tokens, prefix=""):
+    """Join path tokens into a JSON pointer (RFC 6901), e.g. ``/volumes/0``."""
+    return prefix + "".join(
+        "/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens
+    )
+
+
+def schema_errors(task_definition, max_errors=DEFAULT_MAX_SCHEMA_ERRORS):
+    """
+    Collect the schema errors of a parsed task definition in a single pass.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+    - max_errors (int): Stop after this many errors. ``None`` collects all.
+
+    Returns:
+    - list: One dict per error with the keys ``path`` (JSON pointer to the
+      offending value), ``schema_path`` (JSON pointer into the schema) and
+      ``message``. Empty when the task definition is valid.
+    """
+    # The compiled validator answers the common, valid case. Invalid documents
+    # go through Draft7Validator, which explains what is wrong.
+    compiled = get_compiled_validator()
+    if compiled is not None and compiled.is_valid(task_definition):
+        return []
+
+    errors = get_validator().iter_errors(task_definition)
+    return [
+        {
+            "path": json_pointer(error.absolute_path),
+            "schema_path": json_pointer(error.absolute_schema_path, "#"),
+            "message": error.message,
+        }
+        for error in islice(errors, max_errors)
+    ]
+
+
+def format_schema_errors(errors, max_errors=None):
+    """
+    Turn the output of ``schema_errors`` into a human readable message.
+
+    Args:
+    - errors (list): Errors as returned by ``schema_errors``.
+    - max_errors (int): The cap the errors were collected with, if any.
+
+    Returns:
+    - str: ``SCHEMA_VALID_MESSAGE``, or one line per error.
+    """
+    if not errors:
+        return SCHEMA_VALID_MESSAGE
+    count = f"{len(errors)} error(s)"
+    if max_errors is not None and len(errors) >= max_errors:
+        count = f"first {len(errors)} errors"
+    lines = [f"Task definition schema is invalid! {count}:"]
+    for error in errors:
+        lines.append(f"- {error['path'] or '/'}: {error['message']}")
+    return "\n".join(lines)
+
+
+def validate_task_definition(task_definition, max_errors=DEFAULT_MAX_SCHEMA_ERRORS):
+    """
+    Validate a parsed task definition against the task definition schema.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+    - max_errors (int): Report at most this many errors. ``None`` reports all.
+
+    Returns:
+    - str: Human readable validation message listing every error found.
+    """
+    errors = schema_errors(task_definition, max_errors)
+    return format_schema_errors(errors, max_errors)
+
+
+# Root keywords that constrain each top-level property on its own, so a changed
+# property can be validated without the rest of the document.
+PER_PROPERTY_KEYWORDS = {"type", "required", "properties"}
+
+
+@lru_cache(maxsize=None)
+def get_property_validators():
+    """
+    Compile the schema of every top-level property, once per process.
+
+    Returns:
+    - dict: ``CompiledValidator`` per property name, or ``None`` if the root
+      schema cannot be checked one property at a time.
+    """
+    root = task_definition_schema
+    keywords = root.keys() & (SUPPORTED_KEYWORDS | UNSUPPORTED_KEYWORDS)
+    if keywords - PER_PROPERTY_KEYWORDS or root.get("type") != "object":
+        return None
+    try:
+        return {
+            name: compile_schema(schema, root)
+            for name, schema in root.get("properties", {}).items()
+        }
+    except UnsupportedSchemaError:
+        return None
+
+
+def revalidate_schema_errors(
+    task_definition, changed, max_errors=DEFAULT_MAX_SCHEMA_ERRORS
+):
+    """
+    Collect the schema errors of a new revision whose previous revision was valid.
+
+    Only the schemas of the ``changed`` top-level properties are checked. The
+    whole document is validated when that is not enough to decide, and to
+    explain why it is invalid.
+
+    Args:
+    - task_definition (dict): New revision of the task definition.
+    - changed (set): Top-level keys changed since the previous revision, as
+      returned by ``changed_keys``.
+    - max_errors (int): Stop after this many errors. ``None`` collects all.
+
+    Returns:
+    - list: Errors as returned by ``schema_errors``.
+    """
+    validators = get_property_validators()
+    required = task_definition_schema.get("required", ())
+    if (
+        validators is not None
+        and changed is not None
+        and isinstance(task_definition, dict)
+        and all(key in task_definition for key in required)
+        and all(
+            validators[key].is_valid(task_definition[key])
+            for key in changed
+            if key in validators and key in task_definition
+        )
+    ):
+        return []
+    return schema_errors(task_definition, max_errors)
@@ -0,0 +1,143 @@
+from fargate_task_validator.validators.fargate_validator import (
+    VALID_COMBINATIONS_LINUX,
+    VALID_COMBINATIONS_WINDOWS,
+)
+
+# On-demand prices per hour in us-east-1. Only their ratio matters for picking
+# the cheapest size, so regional differences do not change the result.
+PRICES = {
+    "LINUX": {"vcpu": 0.04048, "gb": 0.004445},
+    "WINDOWS": {"vcpu": 0.09148, "gb": 0.01005},
+}
+
+
+def _price_family(os_family):
+    if isinstance(os_family, str) and "WINDOWS" in os_family:
+        return "WINDOWS"
+    return "LINUX"
+
+
+def hourly_cost(cpu, memory, os_family="LINUX"):
+    """
+    Estimate the on-demand hourly price of a Fargate task size.
+
+    Args:
+    - cpu (int): Task CPU units.
+    - memory (int): Task memory in MiB.
+    - os_family (str): ``operatingSystemFamily`` of the task.
+
+    Returns:
+    - float: Price in USD per hour.
+    """
+    prices = PRICES[_price_family(os_family)]
+    return cpu / 1024 * prices["vcpu"] + memory / 1024 * prices["gb"]
+
+
+def _sorted_sizes(table, os_family):
+    sizes = [
+        (int(cpu), int(memory)) for cpu, values in table.items() for memory in values
+    ]
+    return tuple(sorted(sizes, key=lambda size: hourly_cost(*size, os_family)))
+
+
+# Every valid size, cheapest first.
+SIZES_BY_COST = {
+    "LINUX": _sorted_sizes(VALID_COMBINATIONS_LINUX, "LINUX"),
+    "WINDOWS": _sorted_sizes(VALID_COMBINATIONS_WINDOWS, "WINDOWS"),
+}
+
+
+def cheapest_size(cpu=0, memory=0, os_family="LINUX"):
+    """
+    Find the cheapest valid Fargate cpu/memory combination covering a request.
+
+    Args:
+    - cpu (int): Required CPU units.
+    - memory (int): Required memory in MiB.
+    - os_family (str): ``operatingSystemFamily`` of the task.
+
+    Returns:
+    - tuple: ``(cpu, memory)`` as ints, or ``None`` if no size is large enough.
+    """
+    for size_cpu, size_memory in SIZES_BY_COST[_price_family(os_family)]:
+        if size_cpu >= cpu and size_memory >= memory:
+            return size_cpu, size_memory
+    return None
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def container_requirements(task_definition):
+    """
+    Sum the cpu and memory declared by the containers of a task definition.
+
+    A container's memory is its hard ``memory`` limit, or its
+    ``memoryReservation`` when no hard limit is set.
+
+    Returns:
+    - tuple: ``(cpu, memory)``. An element is ``None`` when no container
+      declares that resource.
+    """
+    cpu = memory = None
+    for container in task_definition.get("containerDefinitions") or []:
+        container_cpu = _as_int(container.get("cpu"))
+        if container_cpu:
+            cpu = (cpu or 0) + container_cpu
+        container_memory = _as_int(container.get("memory")) or _as_int(
+            container.get("memoryReservation")
+        )
+        if container_memory:
+            memory = (memory or 0) + container_memory
+    return cpu, memory
+
+
+def recommend_size(task_definition):
+    """
+    Recommend the cheapest task size that covers what the containers need.
+
+    Resources not declared by any container keep the task level value, so a
+    task is only reported as over-provisioned on evidence from its containers.
+
+    Args:
+    - task_definition (dict): Parsed task definition.
+
+    Returns:
+    - dict: ``current``, ``required`` and ``recommended`` sizes as
+      ``(cpu, memory)`` tuples (``current`` and ``recommended`` may be
+      ``None``), their hourly costs and ``over_provisioned``.
+    """
+    os_family = (task_definition.get("runtimePlatform") or {}).get(
+        "operatingSystemFamily", "LINUX"
+    )
+    task_cpu = _as_int(task_definition.get("cpu"))
+    task_memory = _as_int(task_definition.get("memory"))
+    current = None
+    if task_cpu is not None and task_memory is not None:
+        current = (task_cpu, task_memory)
+
+    container_cpu, container_memory = container_requirements(task_definition)
+    required = (
+        container_cpu if container_cpu is not None else task_cpu or 0,
+        container_memory if container_memory is not None else task_memory or 0,
+    )
+    recommended = cheapest_size(*required, os_family=os_family)
+
+    current_cost = hourly_cost(*current, os_family) if current else None
+    recommended_cost = hourly_cost(*recommended, os_family) if recommended else None
+    return {
+        "current": current,
+        "required": required,
+        "recommended": recommended,
+        "current_hourly_cost": current_cost,
+        "recommended_hourly_cost": recommended_cost,
+        "over_provisioned": bool(
+            current_cost is not None
+            and recommended_cost is not None
+            and recommended_cost < current_cost
+        ),
+    }
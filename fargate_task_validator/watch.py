@@ -0,0 +1,426 @@
+import glob
+import os
+import select
+import struct
+import sys
+from time import monotonic, sleep
+
+from fargate_task_validator.batch import (
+    expand_paths,
+    is_json_name,
+    new_outcome,
+    validate_document,
+    GLOB_CHARACTERS,
+)
+from fargate_task_validator.utils.json_loader import load_json_file
+
+DEFAULT_DEBOUNCE = 0.2
+DEFAULT_POLL_INTERVAL = 1.0
+
+# A burst of saves is reported at the latest after this many seconds, even if
+# files keep changing.
+MAX_DEBOUNCE_DELAY = 2.0
+
+# inotify(7) constants.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_ONLYDIR
+)
+FILE_EVENTS = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+EVENT_HEADER = struct.Struct("iIII")
+READ_SIZE = 64 * 1024
+
+
+class WatchTargets:
+    """
+    The files watched for changes: directory trees and individual files.
+
+    Glob patterns are expanded once, when the targets are created. Files
+    created later in a watched directory are picked up.
+
+    Args:
+    - patterns (list): File paths, directory paths or glob patterns.
+    - select (callable): Selects the files of a directory by their name.
+    """
+
+    def __init__(self, patterns, select=is_json_name):
+        self.select = select
+        self.roots = []
+        self.files = set()
+        for pattern in patterns:
+            if GLOB_CHARACTERS & set(pattern):
+                matches = sorted(glob.glob(pattern, recursive=True))
+            else:
+                matches = [pattern]
+            for match in matches:
+                if os.path.isdir(match):
+                    self.roots.append(os.path.normpath(match))
+                else:
+                    self.files.add(os.path.normpath(match))
+        self._absolute_roots = [
+            os.path.join(os.path.abspath(root), "") for root in self.roots
+        ]
+
+    def paths(self):
+        """Return the files that currently exist, see ``expand_paths``."""
+        paths = expand_paths(self.roots + sorted(self.files), select=self.select)
+        return [os.path.normpath(path) for path in paths if os.path.isfile(path)]
+
+    def matches(self, path):
+        """Whether a changed ``path`` is one of the watched files."""
+        path = os.path.normpath(path)
+        if path in self.files:
+            return True
+        if not self.select(os.path.basename(path)):
+            return False
+        absolute = os.path.abspath(path)
+        return any(absolute.startswith(root) for root in self._absolute_roots)
+
+    def directories(self):
+        """Return the directories to watch, including every subdirectory."""
+        directories = []
+        for root in self.roots:
+            for directory, subdirectories, _ in os.walk(root):
+                subdirectories.sort()
+                directories.append(directory)
+        for path in sorted(self.files):
+            directories.append(os.path.dirname(path) or ".")
+        return directories
+
+
+class PollingWatcher:
+    """
+    Detects changes by comparing the modification time and size of every
+    watched file, every ``interval`` seconds. Works on every platform.
+    """
+
+    name = "polling"
+
+    def __init__(self, targets, interval=DEFAULT_POLL_INTERVAL):
+        self.targets = targets
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for path in self.targets.paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self):
+        snapshot = self.scan()
+        changed = {
+            path
+            for path in snapshot.keys() | self.snapshot.keys()
+            if snapshot.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = snapshot
+        return changed
+
+    def wait(self, timeout=None):
+        """
+        Wait until watched files change.
+
+        Args:
+        - timeout (float): Seconds to wait at most. ``None`` waits forever.
+
+        Returns:
+        - set: Paths of the changed, created and deleted files. Empty when
+          ``timeout`` expired first.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            changed = self.poll()
+            if changed:
+                return changed
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, deadline - monotonic())
+                if delay <= 0:
+                    return changed
+            sleep(delay)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Detects changes with Linux inotify, through ``ctypes``.
+
+    Every directory below the watched roots is watched, so no files are
+    scanned while waiting. New directories are watched as they appear.
+
+    Raises:
+    - OSError: inotify is not available.
+    """
+
+    name = "inotify"
+
+    def __init__(self, targets):
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        library = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self._get_errno = ctypes.get_errno
+        self.targets = targets
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            self._raise("inotify_init1")
+        self.directories = {}
+        try:
+            for directory in targets.directories():
+                self.add_directory(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def _raise(self, function):
+        errno = self._get_errno()
+        raise OSError(errno, f"{function}: {os.strerror(errno)}")
+
+    def add_directory(self, directory):
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), WATCH_MASK
+        )
+        if wd < 0:
+            self._raise("inotify_add_watch")
+        self.directories[wd] = directory
+
+    def _read_events(self):
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            yield wd, mask, os.fsdecode(name)
+
+    def read(self):
+        """
+        Read the pending events.
+
+        Returns:
+        - set: Paths of the changed watched files, or ``None`` when the kernel
+          dropped events and every file has to be checked again.
+        """
+        changed = set()
+        while select.select([self.fd], [], [], 0)[0]:
+            for wd, mask, name in self._read_events():
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                directory = self.directories.get(wd)
+                if mask & IN_IGNORED:
+                    self.directories.pop(wd, None)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed |= self._watch_new_directory(path)
+                elif mask & FILE_EVENTS and self.targets.matches(path):
+                    changed.add(os.path.normpath(path))
+        return changed
+
+    def _watch_new_directory(self, path):
+        # Files may have been written before the directory was watched.
+        changed = set()
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            try:
+                self.add_directory(directory)
+            except OSError:
+                continue
+            for name in files:
+                file_path = os.path.join(directory, name)
+                if self.targets.matches(file_path):
+                    changed.add(os.path.normpath(file_path))
+        return changed
+
+    def wait(self, timeout=None):
+        """
+        Wait until watched files change.
+
+        Args:
+        - timeout (float): Seconds to wait at most. ``None`` waits forever.
+
+        Returns:
+        - set: Paths of the changed, created and deleted files, or ``None``
+          when every file has to be checked again. Empty when ``timeout``
+          expired first.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, deadline - monotonic())
+            if not select.select([self.fd], [], [], remaining)[0]:
+                return set()
+            changed = self.read()
+            # Events for other files in the watched directories are ignored.
+            if changed is None or changed:
+                return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(targets, polling=False, interval=DEFAULT_POLL_INTERVAL):
+    """
+    Create the best watcher available on this system.
+
+    Args:
+    - targets (WatchTargets): The files to watch.
+    - polling (bool): Use ``PollingWatcher`` even if inotify is available.
+    - interval (float): Polling interval in seconds.
+
+    Returns:
+    - InotifyWatcher | PollingWatcher: The watcher.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(targets)
+        except (OSError, AttributeError):
+            # Not Linux, no libc, or out of inotify watches.
+            pass
+    return PollingWatcher(targets, interval)
+
+
+def debounced_changes(watcher, debounce=DEFAULT_DEBOUNCE):
+    """
+    Yield changes of watched files, one set per burst of saves.
+
+    After the first change, changes are collected until no file changed for
+    ``debounce`` seconds, or for at most ``MAX_DEBOUNCE_DELAY`` seconds.
+
+    Args:
+    - watcher (InotifyWatcher | PollingWatcher): The watcher.
+    - debounce (float): Quiet period in seconds.
+
+    Returns:
+    - generator: Sets of changed paths, or ``None`` when every file has to be
+      checked again.
+    """
+    while True:
+        changes = watcher.wait()
+        if changes is not None and not changes:
+            continue
+        deadline = monotonic() + MAX_DEBOUNCE_DELAY
+        while changes is not None and monotonic() < deadline:
+            more = watcher.wait(debounce)
+            if more is None:
+                changes = None
+            elif not more:
+                break
+            else:
+                changes |= more
+        yield changes
+
+
+class WatchSession:
+    """
+    Results of the watched files, kept in memory between changes.
+
+    ``refresh`` only validates the files that changed. The parsed document of
+    every file is kept, so a changed file is validated incrementally against
+    its previous revision (see ``validate_document``) and the results of
+    unchanged files are reused as they are.
+
+    Args:
+    - targets (WatchTargets): The watched files.
+    - cache (ResultCache): Cache to serve and store results. Optional.
+    - options: Passed on to ``validate_document``.
+    """
+
+    def __init__(self, targets, cache=None, **options):
+        self.targets = targets
+        self.cache = cache
+        self.options = options
+        # path -> (task definition, outcome)
+        self.documents = {}
+
+    @property
+    def outcomes(self):
+        """The outcome of every watched file, sorted by path."""
+        return [self.documents[path][1] for path in sorted(self.documents)]
+
+    def validate(self, path):
+        outcome = new_outcome(path)
+        try:
+            task_definition = load_json_file(path)
+        except (OSError, ValueError) as e:
+            outcome["error"] = f"Could not load task definition: {e}"
+            self.documents[path] = (None, outcome)
+            return outcome
+
+        previous = self.documents.get(path)
+        if previous is not None and previous[0] is None:
+            previous = None
+        validate_document(
+            task_definition,
+            outcome,
+            cache=self.cache,
+            previous=previous,
+            **self.options,
+        )
+        self.documents[path] = (task_definition, outcome)
+        return outcome
+
+    def refresh(self, changed=None):
+        """
+        Validate changed files and forget deleted ones.
+
+        Args:
+        - changed (set): Paths of the changed files. ``None`` checks every
+          watched file again.
+
+        Returns:
+        - list: Outcomes of the files validated now, sorted by path.
+          Deleted files have none.
+        """
+        if changed is None:
+            current = set(self.targets.paths())
+            for path in self.documents.keys() - current:
+                del self.documents[path]
+            changed = current
+
+        outcomes = []
+        for path in sorted(changed):
+            if os.path.isfile(path):
+                outcomes.append(self.validate(path))
+            else:
+                self.documents.pop(path, None)
+        return outcomes
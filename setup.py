@@ -6,13 +6,14 @@ with open("requirements.txt", "r") as f:
 setup(
     name="fargate_validator",
     version="0.1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     entry_points={
         "console_scripts": [
             "fargate-validator = fargate_task_validator.__main__:main",
         ],
     },
     install_requires=requirements,
+    extras_require={"fleet": ["numpy"]},
     author="Jooyoung Kim",
     author_email="joozero@amazon.com",
     description="A utility to validate AWS ECS task definitions for Fargate compatibility",
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fargate_task_validator import aio
+from fargate_task_validator.aio import validate_many
+
+
+def collect(sources, **kwargs):
+    async def run():
+        return [outcome async for outcome in validate_many(sources, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_validate_paths_and_documents():
+    with open("examples/windows_task.json", "r") as f:
+        windows_task = json.load(f)
+    outcomes = collect(
+        ["examples/fail_task.json", windows_task, "missing.json"], concurrency=2
+    )
+    by_path = {outcome["path"]: outcome for outcome in outcomes}
+    assert set(by_path) == {"examples/fail_task.json", "<document 1>", "missing.json"}
+    assert not by_path["examples/fail_task.json"]["passed"]
+    assert by_path["<document 1>"]["passed"]
+    assert by_path["missing.json"]["error"]
+
+
+def test_results_arrive_in_completion_order(monkeypatch):
+    validate_source = aio._validate_source
+
+    def slow_first(label, source, **options):
+        if label == "<document 0>":
+            time.sleep(0.3)
+        return validate_source(label, source, **options)
+
+    monkeypatch.setattr(aio, "_validate_source", slow_first)
+    outcomes = collect([{"family": "slow"}, {"family": "fast"}], concurrency=2)
+    assert [outcome["path"] for outcome in outcomes] == [
+        "<document 1>",
+        "<document 0>",
+    ]
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    validate_source = aio._validate_source
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def tracked(label, source, **options):
+        with lock:
+            running.append(label)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(label)
+        return validate_source(label, source, **options)
+
+    monkeypatch.setattr(aio, "_validate_source", tracked)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = collect(
+            ({"family": str(i)} for i in range(20)), concurrency=3, executor=executor
+        )
+    assert len(outcomes) == 20
+    assert max(peak) <= 3
+
+    with pytest.raises(ValueError):
+        collect([], concurrency=0)
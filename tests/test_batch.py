@@ -0,0 +1,124 @@
+import json
+import os
+
+import pytest
+from fargate_task_validator.__main__ import main
+from fargate_task_validator.batch import (
+    expand_paths,
+    validate_files,
+    validate_stream,
+)
+from fargate_task_validator.cache import ResultCache
+
+
+def test_expand_paths_directories_and_globs():
+    paths = expand_paths(["examples", "examples/*_task.json"])
+    assert paths == [
+        "examples/amazon_linux_2_task.json",
+        "examples/fail_task.json",
+        "examples/my_nginx_task.json",
+        "examples/windows_task.json",
+    ], "Directories and globs were not expanded to unique files."
+
+
+def test_validate_files_in_process_pool():
+    paths = expand_paths(["examples"])
+    outcomes = list(validate_files(paths, workers=2))
+    assert [outcome["path"] for outcome in outcomes] == paths
+    assert [outcome["passed"] for outcome in outcomes] == [True, False, True, True]
+
+
+def test_unreadable_file_is_reported(tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{ not json")
+    (outcome,) = validate_files([str(broken)], workers=1)
+    assert outcome["error"] and not outcome["passed"]
+
+
+def test_main_exit_code_reflects_combined_result():
+    with pytest.raises(SystemExit) as passing:
+        main(
+            [
+                "-q",
+                "--no-cache",
+                "examples/my_nginx_task.json",
+                "examples/windows_task.json",
+            ]
+        )
+    assert passing.value.code == 0
+
+    with pytest.raises(SystemExit) as failing:
+        main(["-q", "--no-cache", "-j", "1", "examples"])
+    assert failing.value.code == 1
+
+
+def test_cache_serves_unchanged_definitions(tmp_path):
+    paths = expand_paths(["examples"])
+    cache = ResultCache(str(tmp_path))
+    first = list(validate_files(paths, workers=1, cache=cache))
+    second = list(validate_files(paths, workers=2, cache=cache))
+
+    assert [outcome["cache"] for outcome in first] == ["miss"] * len(paths)
+    assert [outcome["cache"] for outcome in second] == ["hit"] * len(paths)
+    for before, after in zip(first, second):
+        assert after["results"] == before["results"]
+        assert after["passed"] == before["passed"]
+
+
+def test_cache_key_ignores_formatting_and_key_order(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.key_for({"a": 1, "b": [1, 2]}) == cache.key_for({"b": [1, 2], "a": 1})
+    assert cache.key_for({"a": 1}) != cache.key_for({"a": 2})
+
+
+def test_cache_prune_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    paths = ["examples/windows_task.json", "examples/my_nginx_task.json"]
+    list(validate_files(paths, workers=1, cache=cache))
+
+    entries = {}
+    for root, _, files in os.walk(tmp_path):
+        for name in files:
+            path = os.path.join(root, name)
+            entries[path] = os.path.getsize(path)
+    assert len(entries) == 2
+
+    # The first entry was used least recently.
+    least_recent, most_recent = sorted(entries)
+    os.utime(least_recent, (1000, 1000))
+    os.utime(most_recent, (2000, 2000))
+
+    cache.max_bytes = max(entries.values())
+    assert cache.prune() == 1
+    assert not os.path.exists(least_recent) and os.path.exists(most_recent)
+
+
+def test_validate_stream_unwraps_describe_output(tmp_path):
+    with open("examples/windows_task.json", "r") as f:
+        windows_task = json.load(f)
+    stream = tmp_path / "dump.ndjson"
+    stream.write_text(
+        json.dumps({"taskDefinition": windows_task})
+        + "\n"
+        + json.dumps({"family": "x", "networkMode": "bridge"})
+        + "\n"
+    )
+
+    for workers in (1, 2):
+        outcomes = list(validate_stream([str(stream)], workers=workers))
+        assert [outcome["path"] for outcome in outcomes] == [
+            f"{stream}[0]",
+            f"{stream}[1]",
+        ]
+        assert [outcome["passed"] for outcome in outcomes] == [True, False]
+
+
+def test_validate_stream_reads_on_after_a_malformed_document(tmp_path):
+    with open("examples/windows_task.json", "r") as f:
+        windows_task = json.load(f)
+    stream = tmp_path / "dump.ndjson"
+    stream.write_text('{"family": \n' + json.dumps(windows_task) + "\n")
+
+    outcomes = list(validate_stream([str(stream)], workers=1))
+    assert outcomes[0]["error"].startswith("Could not parse task definition")
+    assert outcomes[1]["path"] == f"{stream}[1]" and outcomes[1]["passed"]
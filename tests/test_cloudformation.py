@@ -0,0 +1,201 @@
+import json
+
+import pytest
+from fargate_task_validator.__main__ import main
+from fargate_task_validator.cloudformation import (
+    expand_template_paths,
+    extract_task_definitions,
+    load_template,
+    to_task_definition,
+    validate_templates,
+)
+
+TEMPLATE = {
+    "Parameters": {"TaskCpu": {"Type": "String", "Default": "512"}},
+    "Resources": {
+        "WebTaskDefinition": {
+            "Type": "AWS::ECS::TaskDefinition",
+            "Properties": {
+                "Cpu": {"Ref": "TaskCpu"},
+                "Memory": 1024,
+                "NetworkMode": "awsvpc",
+                "RequiresCompatibilities": ["FARGATE"],
+                "ExecutionRoleArn": {"Fn::GetAtt": ["ExecutionRole", "Arn"]},
+                "ContainerDefinitions": [
+                    {
+                        "Name": "web",
+                        "Image": "nginx:latest",
+                        "Essential": True,
+                        "PortMappings": [{"ContainerPort": 80}],
+                        "DockerLabels": {"Team": "web"},
+                        "LogConfiguration": {
+                            "LogDriver": "awslogs",
+                            "Options": {"awslogs-group": {"Ref": "LogGroup"}},
+                        },
+                        "User": {"Ref": "AWS::NoValue"},
+                    }
+                ],
+                "Volumes": [
+                    {
+                        "Name": "data",
+                        "EFSVolumeConfiguration": {
+                            "FilesystemId": "fs-1234",
+                            "AuthorizationConfig": {"IAM": "ENABLED"},
+                        },
+                    }
+                ],
+            },
+        },
+        "LegacyTaskDefinition": {
+            "Type": "AWS::ECS::TaskDefinition",
+            "Properties": {
+                "Cpu": "256",
+                "Memory": "512",
+                "NetworkMode": "bridge",
+                "ContainerDefinitions": [
+                    {"Name": "app", "Image": "app:1", "Privileged": True}
+                ],
+            },
+        },
+        "LogGroup": {"Type": "AWS::Logs::LogGroup"},
+    },
+}
+
+YAML_TEMPLATE = """
+Resources:
+  Service:
+    Type: AWS::ECS::Service
+  TaskDefinition:
+    Type: AWS::ECS::TaskDefinition
+    Properties:
+      Cpu: 256
+      Memory: 512
+      NetworkMode: awsvpc
+      TaskRoleArn: !GetAtt TaskRole.Arn
+      ContainerDefinitions:
+        - Name: app
+          Image: !Sub "${AWS::AccountId}.dkr.ecr.${AWS::Region}.amazonaws.com/app"
+"""
+
+
+def write_template(directory, name, template):
+    path = directory / name
+    path.write_text(json.dumps(template))
+    return str(path)
+
+
+def test_properties_are_mapped_to_the_api_shape():
+    ((logical_id, task_definition), _) = extract_task_definitions(TEMPLATE)
+    assert logical_id == "WebTaskDefinition"
+    assert task_definition["cpu"] == "512"
+    assert task_definition["memory"] == "1024"
+    assert task_definition["executionRoleArn"] == "<Fn::GetAtt ExecutionRole.Arn>"
+
+    (container,) = task_definition["containerDefinitions"]
+    assert container["portMappings"] == [{"containerPort": 80}]
+    assert container["dockerLabels"] == {"Team": "web"}
+    assert container["logConfiguration"]["options"] == {
+        "awslogs-group": "<Ref LogGroup>"
+    }
+    assert "user" not in container
+
+    (volume,) = task_definition["volumes"]
+    assert volume["efsVolumeConfiguration"] == {
+        "fileSystemId": "fs-1234",
+        "authorizationConfig": {"iam": "ENABLED"},
+    }
+
+
+def test_proxy_configuration_properties_are_renamed():
+    task_definition = to_task_definition(
+        {
+            "ProxyConfiguration": {
+                "ContainerName": "envoy",
+                "ProxyConfigurationProperties": [{"Name": "AppPorts", "Value": "80"}],
+            }
+        }
+    )
+    assert task_definition["proxyConfiguration"] == {
+        "containerName": "envoy",
+        "properties": [{"name": "AppPorts", "value": "80"}],
+    }
+
+
+@pytest.mark.parametrize("properties", [None, [], "Cpu: 256"])
+def test_properties_that_are_not_a_mapping_are_rejected(properties):
+    template = {
+        "Resources": {
+            "WebTaskDefinition": {
+                "Type": "AWS::ECS::TaskDefinition",
+                "Properties": properties,
+            }
+        }
+    }
+    with pytest.raises(ValueError, match="WebTaskDefinition"):
+        extract_task_definitions(template)
+
+
+def test_yaml_template_with_short_form_functions(tmp_path):
+    path = tmp_path / "template.yaml"
+    path.write_text(YAML_TEMPLATE)
+    ((logical_id, task_definition),) = extract_task_definitions(
+        load_template(str(path))
+    )
+    assert logical_id == "TaskDefinition"
+    assert task_definition["cpu"] == "256"
+    assert task_definition["taskRoleArn"] == "<Fn::GetAtt TaskRole.Arn>"
+    assert task_definition["containerDefinitions"][0]["image"] == "<Fn::Sub>"
+
+
+def test_cdk_out_directory_is_searched_for_templates(tmp_path):
+    cdk_out = tmp_path / "cdk.out"
+    (cdk_out / "assembly-Prod").mkdir(parents=True)
+    write_template(cdk_out, "manifest.json", {"version": "36.0.0"})
+    first = write_template(cdk_out, "Web.template.json", TEMPLATE)
+    second = write_template(cdk_out / "assembly-Prod", "Api.template.json", TEMPLATE)
+    assert expand_template_paths([str(cdk_out)]) == [first, second]
+
+
+def test_findings_point_to_template_and_logical_id(tmp_path):
+    path = write_template(tmp_path, "App.template.json", TEMPLATE)
+    broken = tmp_path / "Broken.template.json"
+    broken.write_text("{ not json")
+
+    outcomes = list(validate_templates([path, str(broken)], workers=2))
+    assert [outcome["path"] for outcome in outcomes] == [
+        f"{path}#WebTaskDefinition",
+        f"{path}#LegacyTaskDefinition",
+        str(broken),
+    ]
+    web, legacy, unreadable = outcomes
+    assert web["resource"] == {"template": path, "logical_id": "WebTaskDefinition"}
+    assert web["results"]["networkMode"] == "OK"
+    assert legacy["results"]["networkMode"] == "FAIL"
+    assert legacy["failing_containers"]["privileged"] == ["app"]
+    assert unreadable["error"].startswith("Could not read template")
+
+
+def test_main_validates_templates(tmp_path, capsys):
+    path = write_template(tmp_path, "App.template.json", TEMPLATE)
+    with pytest.raises(SystemExit) as exit:
+        main(
+            [
+                "--cloudformation",
+                "--no-cache",
+                "-j",
+                "1",
+                "--format",
+                "sarif",
+                str(tmp_path),
+            ]
+        )
+    assert exit.value.code == 1
+
+    (run,) = json.loads(capsys.readouterr().out)["runs"]
+    for result in run["results"]:
+        (location,) = result["locations"]
+        assert location["physicalLocation"]["artifactLocation"]["uri"] == path
+        assert location["logicalLocations"][0]["name"] in {
+            "WebTaskDefinition",
+            "LegacyTaskDefinition",
+        }
@@ -0,0 +1,43 @@
+import pickle
+
+from fargate_task_validator.batch import expand_paths, validate_files
+from fargate_task_validator.compact import (
+    CompactResult,
+    Finding,
+    ResultBatch,
+    Status,
+)
+from fargate_task_validator.validators.rule_engine import RULES_BY_NAME
+
+
+def example_outcomes():
+    return list(validate_files(expand_paths(["examples"]), workers=1))
+
+
+def test_batch_round_trips_to_dicts():
+    outcomes = example_outcomes()
+    batch = ResultBatch().extend(outcomes)
+    assert len(batch) == len(outcomes)
+    for index, outcome in enumerate(outcomes):
+        assert batch.to_dict(index) == outcome["results"]
+        result = batch.result(index)
+        assert result.to_dict() == outcome["results"]
+        assert result.failing_containers() == outcome["failing_containers"]
+        assert result.passed == outcome["passed"]
+        assert result.schema_valid == outcome["schema_valid"]
+
+
+def test_compact_result_statuses():
+    outcome = example_outcomes()[1]
+    result = CompactResult.from_outcome(outcome)
+    assert result.status("networkMode") is Status.FAIL
+    assert result.status("cpuWindows") is None
+    assert all(isinstance(finding, Finding) for finding in result.failing)
+    assert not hasattr(result.failing[0], "__dict__")
+    assert pickle.loads(pickle.dumps(result)).to_dict() == outcome["results"]
+
+
+def test_batch_counts_and_size():
+    batch = ResultBatch().extend(example_outcomes())
+    assert batch.counts("networkMode") == {Status.OK: 3, Status.WARN: 0, Status.FAIL: 1}
+    assert batch.nbytes == len(batch) * (len(RULES_BY_NAME) + 2)
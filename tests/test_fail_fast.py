@@ -0,0 +1,118 @@
+import copy
+import json
+import os
+
+import pytest
+from fargate_task_validator.__main__ import main, parse_args
+from fargate_task_validator.batch import validate_document, validate_files
+from fargate_task_validator.validators.fargate_validator import (
+    check_task_definition,
+)
+from fargate_task_validator.validators.rule_engine import (
+    evaluate_fail_fast,
+    rule_order,
+    RULES_BY_NAME,
+    RuleOrder,
+)
+
+EXAMPLES = sorted(os.path.join("examples", name) for name in os.listdir("examples"))
+
+with open("examples/fail_task.json") as f:
+    FAIL_TASK = json.load(f)
+with open("examples/windows_task.json") as f:
+    WINDOWS_TASK = json.load(f)
+
+
+def edit(task_definition, change):
+    revision = copy.deepcopy(task_definition)
+    change(revision)
+    return revision
+
+
+REVISIONS = [
+    FAIL_TASK,
+    WINDOWS_TASK,
+    edit(WINDOWS_TASK, lambda td: td.update(networkMode="bridge")),
+    edit(WINDOWS_TASK, lambda td: td.update(volumes="not a list")),
+    edit(
+        WINDOWS_TASK,
+        lambda td: td["containerDefinitions"][0].update(
+            systemControls=[{"namespace": "vm.swappiness", "value": "0"}]
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("task_definition", REVISIONS)
+def test_fail_fast_agrees_with_full_validation(task_definition):
+    full = validate_document(task_definition)
+    outcome = validate_document(task_definition, fail_fast=True)
+    assert outcome["passed"] == full["passed"]
+    for name, status in outcome["results"].items():
+        assert status == full["results"][name]
+
+
+def test_stops_at_the_first_failure():
+    findings, counts = evaluate_fail_fast(FAIL_TASK)
+    failures = [status for status in findings.values() if status.startswith("FAIL")]
+    assert len(failures) == 1
+    assert counts["skipped"] > 0
+    assert len(check_task_definition(FAIL_TASK, fail_fast=True)) == counts["evaluated"]
+
+    # The schema is not checked once a rule failed.
+    outcome = validate_document(FAIL_TASK, fail_fast=True)
+    assert outcome["schema_valid"] is None and not outcome["passed"]
+
+
+def test_rules_run_by_cost_then_by_failure_rate():
+    order = RuleOrder(reorder_interval=1)
+    rules = order.order()
+    costs = [rule.cost for rule in rules]
+    assert costs == sorted(costs)
+    assert rules[-1] is RULES_BY_NAME["sysctl"]
+
+    # Container rules cost more in task definitions with many containers.
+    assert order.order(containers=20)[0].scope == "task"
+
+    privileged = RULES_BY_NAME["privileged"]
+    for _ in range(10):
+        order.record(privileged, failed=True)
+        order.document_done()
+    assert order.order()[0] is privileged
+
+
+def test_order_adapts_over_a_batch():
+    order = RuleOrder(reorder_interval=4)
+    for _ in range(8):
+        evaluate_fail_fast(FAIL_TASK, order)
+    findings, counts = evaluate_fail_fast(FAIL_TASK, order)
+    # The rule that keeps failing now runs first.
+    assert counts["evaluated"] == 1
+
+
+def test_main_fail_fast_batch_stops_the_run(capsys):
+    with pytest.raises(SystemExit) as exit:
+        main(EXAMPLES + ["--fail-fast-batch", "--no-cache", "--workers", "1", "-q"])
+    assert exit.value.code == 1
+    output = capsys.readouterr().out
+    assert "Files: 2" in output and "Stopped at the first failure" in output
+
+    outcomes = list(validate_files(EXAMPLES, workers=2, fail_fast=True))
+    assert [outcome["passed"] for outcome in outcomes] == [True, False, True, True]
+
+
+def test_api_calls_share_the_process_order():
+    order = rule_order()
+    documents = order.documents
+    check_task_definition(FAIL_TASK, fail_fast=True)
+    check_task_definition(WINDOWS_TASK, fail_fast=True)
+    assert rule_order() is order and order.documents == documents + 2
+
+    private = RuleOrder()
+    check_task_definition(FAIL_TASK, fail_fast=True, order=private)
+    assert private.documents == 1
+
+
+def test_fail_fast_is_not_combined_with_fleet_report():
+    with pytest.raises(SystemExit):
+        parse_args(["--fail-fast", "--fleet-report", "fleet.json", "x.json"])
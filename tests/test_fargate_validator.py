@@ -1,9 +1,13 @@
+import json
 import pytest
 from fargate_task_validator.validators.fargate_validator import (
     check_fargate_compatibility,
+    check_task_definition,
+    collect_findings,
     UNSUPPORTED_ROOT_PARAMETERS,
     UNSUPPORTED_CONTAINER_PARAMETERS,
 )
+from fargate_task_validator.validators.rule_engine import CONTAINER_SCOPE, RULES
 
 
 # Some helper functions to load the JSON samples:
@@ -154,3 +158,74 @@ def test_invalid_stop_timeout():
     """
     feedback = check_fargate_compatibility(task_definition)
     assert feedback["stopTimeout"] == "FAIL", "Stop timeout not flagged as invalid."
+
+
+## Parsed Task Definition Test
+def test_parsed_task_definition_matches_string():
+    task_definition = load_json("examples/fail_task.json")
+    assert check_fargate_compatibility(
+        json.loads(task_definition)
+    ) == check_fargate_compatibility(task_definition)
+    assert check_task_definition(
+        json.loads(task_definition)
+    ) == check_fargate_compatibility(task_definition)
+
+
+## Per Container Findings Test
+def test_failure_in_earlier_container_is_not_hidden():
+    task_definition = {
+        "containerDefinitions": [
+            {"name": "app", "ulimits": [{"name": "core"}], "stopTimeout": 200},
+            {"name": "sidecar", "ulimits": [{"name": "nofile"}]},
+        ]
+    }
+    feedback = check_task_definition(task_definition)
+    assert feedback["ulimits"] == "FAIL", "Failing first container was overwritten."
+    assert feedback["stopTimeout"] == "FAIL"
+
+    findings = collect_findings(task_definition)
+    assert findings[("app", "ulimits")] == "FAIL"
+    assert findings[("sidecar", "ulimits")] == "OK"
+    assert findings[(None, "networkMode")] == "FAIL"
+
+
+## Sysctl Test
+def test_every_unsupported_sysctl_is_reported():
+    task_definition = {
+        "containerDefinitions": [
+            {
+                "name": "app",
+                "systemControls": [
+                    {"namespace": "net.core.somaxconn", "value": "1024"},
+                    {"namespace": "vm.swappiness", "value": "10"},
+                    {"namespace": "kernel.shmmax", "value": "1"},
+                    {"namespace": "kernel.domainname", "value": "x"},
+                ],
+            },
+            {"name": "sidecar", "sysctl": [{"name": "fs.mqueue.msg_max"}]},
+            {"name": "legacy", "sysctl": [{"name": "kernel.msgmaxx"}]},
+        ]
+    }
+    findings = collect_findings(task_definition)
+    assert findings[("app", "sysctl")] == "FAIL: vm.swappiness, kernel.domainname"
+    assert findings[("sidecar", "sysctl")] == "OK"
+    assert findings[("legacy", "sysctl")] == "FAIL: kernel.msgmaxx"
+    assert check_task_definition(task_definition)["sysctl"] == "FAIL"
+
+
+def test_benchmark_task_definitions_are_compatible():
+    from benchmarks.generator import generate_task_definition
+    from benchmarks.run import SIZES
+
+    for sizes in SIZES.values():
+        feedback = check_fargate_compatibility(generate_task_definition(**sizes))
+        assert set(feedback.values()) == {"OK"}
+
+
+def test_container_checks_are_left_out_without_containers():
+    task_definition = json.loads(load_json("examples/my_nginx_task.json"))
+    task_definition["containerDefinitions"] = []
+    feedback = check_task_definition(task_definition)
+    container_checks = {rule.name for rule in RULES if rule.scope == CONTAINER_SCOPE}
+    assert not container_checks & feedback.keys()
+    assert feedback["networkMode"] == "OK"
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from fargate_task_validator.__main__ import main
+from fargate_task_validator.batch import (
+    expand_paths,
+    new_outcome,
+    validate_document,
+    validate_files,
+)
+from fargate_task_validator.fleet import MISSING, fleet_fields
+
+numpy = pytest.importorskip("numpy")
+
+from fargate_task_validator.fleet import FleetReport  # noqa: E402
+
+
+def test_fleet_fields():
+    assert fleet_fields(
+        {
+            "cpu": "1024",
+            "memory": 2048,
+            "ephemeralStorage": {"sizeInGiB": 50},
+            "runtimePlatform": {"operatingSystemFamily": "WINDOWS_SERVER_2022_CORE"},
+        }
+    ) == {
+        "cpu": 1024,
+        "memory": 2048,
+        "ephemeral_storage": 50,
+        "os_family": "WINDOWS_SERVER_2022_CORE",
+    }
+    fields = fleet_fields({"cpu": "1 vCPU", "runtimePlatform": "LINUX"})
+    assert fields["cpu"] == fields["memory"] == fields["ephemeral_storage"] == MISSING
+    assert fields["os_family"] == "LINUX"
+
+
+def test_fleet_report_aggregates():
+    definitions = [
+        {"cpu": "256", "memory": "512", "requiresCompatibilities": ["FARGATE"]},
+        {"cpu": "256", "memory": "512", "ephemeralStorage": {"sizeInGiB": 30}},
+        {"cpu": "256", "memory": "4096", "ephemeralStorage": {"sizeInGiB": 150}},
+        {
+            "cpu": "256",
+            "memory": "512",
+            "runtimePlatform": {"operatingSystemFamily": "WINDOWS_SERVER_2019_FULL"},
+        },
+        {"containerDefinitions": []},
+    ]
+    report = FleetReport().extend(
+        validate_document(definition, new_outcome(), skip_schema=True, fleet=True)
+        for definition in definitions
+    )
+    summary = report.summary()
+
+    assert summary["task_definitions"] == 5
+    requires = summary["rules"]["requiresCompatibilities"]
+    assert (requires["ok"], requires["fail"]) == (1, 4)
+    assert requires["failure_rate"] == pytest.approx(0.8)
+
+    assert report.valid_sizes().tolist() == [True, True, False, False, False]
+    assert summary["invalid_sizes"] == 3
+    assert summary["sizes"] == [
+        {"cpu": 256, "memory": 512, "count": 3, "valid": pytest.approx(2 / 3)},
+        {"cpu": None, "memory": None, "count": 1, "valid": 0.0},
+        {"cpu": 256, "memory": 4096, "count": 1, "valid": 0.0},
+    ]
+
+    storage = summary["ephemeral_storage"]
+    assert (storage["default"], storage["configured"]) == (3, 2)
+    assert (storage["min"], storage["max"], storage["p50"]) == (30, 150, 90.0)
+    assert storage["histogram"]["50"] == storage["histogram"]["150"] == 1
+
+
+def test_empty_fleet_report():
+    summary = FleetReport().summary()
+    assert summary["task_definitions"] == 0
+    assert summary["sizes"] == []
+    assert summary["rules"]["computing"]["failure_rate"] == 0.0
+
+
+def test_fleet_report_matches_outcomes():
+    outcomes = list(validate_files(expand_paths(["examples"]), workers=1, fleet=True))
+    summary = FleetReport().extend(outcomes).summary()
+    for name, counts in summary["rules"].items():
+        failed = sum(
+            outcome["results"].get(name, "").startswith("FAIL") for outcome in outcomes
+        )
+        assert counts["fail"] == failed, name
+
+
+def test_main_writes_fleet_report(tmp_path):
+    path = tmp_path / "fleet.json"
+    with pytest.raises(SystemExit):
+        main(["-q", "--no-cache", "-j", "1", "--fleet-report", str(path), "examples"])
+    summary = json.loads(path.read_text())
+    assert summary["task_definitions"] == 4
+    assert summary["rules"]["networkMode"]["fail"] == 1
+
+
+def test_fleet_report_of_non_object_documents(tmp_path):
+    assert fleet_fields([]) == fleet_fields({})
+    (tmp_path / "list.json").write_text("[]")
+    path = tmp_path / "fleet.json"
+    argv = ["-q", "--no-cache", "-j", "1", "--fleet-report", str(path)]
+    with pytest.raises(SystemExit) as exit:
+        main(argv + [str(tmp_path / "list.json"), "examples/windows_task.json"])
+    assert exit.value.code == 1
+    assert json.loads(path.read_text())["task_definitions"] == 2
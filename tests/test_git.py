@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+from fargate_task_validator.__main__ import main
+from fargate_task_validator.git import (
+    changed_files,
+    GitError,
+    read_blobs,
+    validate_changed,
+)
+
+EXAMPLES = os.path.abspath("examples")
+
+
+def run_git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    run_git(tmp_path, "init", "-q", "-b", "main")
+    (tmp_path / "services").mkdir()
+    for name in ["my_nginx_task.json", "windows_task.json"]:
+        shutil.copy(os.path.join(EXAMPLES, name), tmp_path / "services" / name)
+    (tmp_path / "README.md").write_text("services")
+    run_git(tmp_path, "add", ".")
+    run_git(tmp_path, "commit", "-q", "-m", "base")
+
+    run_git(tmp_path, "checkout", "-q", "-b", "feature")
+    shutil.copy(os.path.join(EXAMPLES, "fail_task.json"), tmp_path / "services")
+    (tmp_path / "README.md").write_text("changed")
+    (tmp_path / "services" / "windows_task.json").unlink()
+    run_git(tmp_path, "add", "-A")
+    run_git(tmp_path, "commit", "-q", "-m", "feature")
+    run_git(tmp_path, "checkout", "-q", "main")
+
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_changed_files_between_refs(repo):
+    # Deleted files and other file types are left out.
+    assert changed_files("main", "feature") == ["services/fail_task.json"]
+    assert changed_files("main", "feature", ["README.md"]) == []
+
+
+def test_files_are_read_from_the_head_ref(repo):
+    # feature is not checked out, its files only exist in git.
+    assert not (repo / "services" / "fail_task.json").exists()
+    ((path, content), (missing, nothing)) = read_blobs(
+        "feature", ["services/fail_task.json", "services/windows_task.json"]
+    )
+    assert json.loads(content)["family"]
+    assert nothing is None
+
+    (outcome,) = validate_changed("main", "feature", workers=1)
+    assert outcome["path"] == os.path.join("services", "fail_task.json")
+    assert not outcome["passed"]
+
+
+def test_working_tree_is_compared_without_head(repo):
+    path = repo / "services" / "my_nginx_task.json"
+    task_definition = json.loads(path.read_text())
+    task_definition["networkMode"] = "bridge"
+    path.write_text(json.dumps(task_definition))
+
+    (outcome,) = validate_changed("main", workers=1)
+    assert outcome["path"] == os.path.join("services", "my_nginx_task.json")
+    assert outcome["results"]["networkMode"] == "FAIL"
+
+
+def test_working_tree_is_compared_with_the_merge_base(repo):
+    # Changed on main after the fork only, not part of the pull request.
+    path = repo / "services" / "my_nginx_task.json"
+    path.write_text(path.read_text() + "\n")
+    run_git(repo, "commit", "-q", "-am", "main moves on")
+    run_git(repo, "switch", "-q", "feature")
+
+    assert changed_files("main") == ["services/fail_task.json"]
+    assert changed_files("main") == changed_files("main", "feature")
+
+
+def test_user_configuration_does_not_change_paths(repo, monkeypatch):
+    run_git(repo, "config", "diff.relative", "true")
+    monkeypatch.chdir(repo / "services")
+    assert changed_files("main", "feature") == ["services/fail_task.json"]
+    assert changed_files("main", "feature", ["fail_task.json"]) == [
+        "services/fail_task.json"
+    ]
+
+
+def test_untracked_files_are_changed_in_the_working_tree(repo):
+    new = repo / "services" / "new.json"
+    shutil.copy(os.path.join(EXAMPLES, "fail_task.json"), new)
+    (repo / ".gitignore").write_text("ignored.json\n")
+    (repo / "ignored.json").write_text("{}")
+    assert changed_files("main") == ["services/new.json"]
+
+    (outcome,) = validate_changed("main", workers=1)
+    assert outcome["path"] == os.path.join("services", "new.json")
+
+
+def test_unknown_ref(repo):
+    with pytest.raises(GitError):
+        validate_changed("main", "no-such-branch")
+
+
+def test_main_validates_changed_files(repo, capsys):
+    with pytest.raises(SystemExit) as exit:
+        main(["--base", "main", "--head", "feature", "--no-cache", "-q"])
+    assert exit.value.code == 1
+    output = capsys.readouterr().out
+    assert "Files: 1" in output and "fail_task.json" in output
+
+    with pytest.raises(SystemExit) as exit:
+        main(["--base", "main", "--head", "main", "--no-cache", "-q"])
+    assert exit.value.code == 0
@@ -0,0 +1,69 @@
+import copy
+import json
+
+import pytest
+from fargate_task_validator.batch import validate_document, validate_revision
+from fargate_task_validator.validators.rule_engine import evaluate, evaluate_incremental
+
+with open("examples/fail_task.json") as f:
+    FAIL_TASK = json.load(f)
+with open("examples/windows_task.json") as f:
+    WINDOWS_TASK = json.load(f)
+
+
+def edit(task_definition, change):
+    revision = copy.deepcopy(task_definition)
+    change(revision)
+    return revision
+
+
+CHANGES = [
+    lambda td: td["containerDefinitions"][0].update(image="nginx:2"),
+    lambda td: td.update(networkMode="bridge"),
+    lambda td: td.update(cpu="4096", memory="8192"),
+    lambda td: td.pop("requiresCompatibilities", None),
+    lambda td: td["containerDefinitions"][0].update(privileged=True),
+    lambda td: td["containerDefinitions"][0].update(
+        systemControls=[{"namespace": "vm.swappiness", "value": "0"}]
+    ),
+    lambda td: td["containerDefinitions"].append({"name": "sidecar"}),
+    lambda td: td["containerDefinitions"].reverse(),
+    lambda td: td["containerDefinitions"][0].pop("name", None),
+]
+
+
+@pytest.mark.parametrize("previous", [FAIL_TASK, WINDOWS_TASK])
+@pytest.mark.parametrize("change", CHANGES)
+def test_incremental_findings_match_full_evaluation(previous, change):
+    revision = edit(previous, change)
+    findings, _ = evaluate_incremental(previous, evaluate(previous), revision)
+    assert findings == evaluate(revision)
+
+
+def test_only_affected_rules_are_run():
+    revision = edit(WINDOWS_TASK, CHANGES[0])
+    _, counts = evaluate_incremental(WINDOWS_TASK, evaluate(WINDOWS_TASK), revision)
+    assert counts["evaluated"] == 0 and counts["reused"] > 0
+
+    revision = edit(WINDOWS_TASK, CHANGES[1])
+    _, counts = evaluate_incremental(WINDOWS_TASK, evaluate(WINDOWS_TASK), revision)
+    assert counts["evaluated"] == 1
+
+
+def test_changed_schema_property_is_revalidated():
+    previous = validate_document(WINDOWS_TASK)
+    assert previous["schema_valid"]
+    revision = edit(WINDOWS_TASK, lambda td: td.update(volumes="not a list"))
+    outcome = validate_document(revision, previous=(WINDOWS_TASK, previous))
+    assert outcome["schema_valid"] is False
+    assert outcome["incremental"]["evaluated"] == 2
+
+
+def test_validate_revision(tmp_path):
+    new = tmp_path / "new.json"
+    new.write_text(json.dumps(edit(WINDOWS_TASK, CHANGES[1])))
+    outcome = validate_revision("examples/windows_task.json", str(new))
+    full = validate_document(json.loads(new.read_text()))
+    assert outcome["results"] == full["results"]
+    assert outcome["results"]["networkMode"] == "FAIL"
+    assert outcome["incremental"]["evaluated"] == 1
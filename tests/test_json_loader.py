@@ -0,0 +1,126 @@
+import builtins
+import io
+import json
+
+import pytest
+from fargate_task_validator.utils import json_loader
+from fargate_task_validator.utils.json_loader import (
+    BACKEND_NAMES,
+    get_backend,
+    iter_json_documents,
+    iter_json_records,
+    JSON_BACKEND_ENV,
+    load_json_file,
+)
+
+DOCUMENTS = [{"family": f"task-{i}", "cpu": "256", "memory": 512 + i} for i in range(50)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_json_lines_and_array_input(chunk_size):
+    json_lines = "\n".join(json.dumps(document) for document in DOCUMENTS) + "\n"
+    array = json.dumps(DOCUMENTS, indent=2)
+
+    assert list(iter_json_documents(io.StringIO(json_lines), chunk_size)) == DOCUMENTS
+    assert list(iter_json_documents(io.StringIO(array), chunk_size)) == DOCUMENTS
+    assert list(iter_json_documents(io.StringIO(" [ ] "), chunk_size)) == []
+
+
+@pytest.mark.parametrize("text", ["[1 2]", "[1,]", "[1", "{", "[1] 2"])
+def test_malformed_input_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_documents(io.StringIO(text), 2))
+
+
+def test_documents_are_read_lazily():
+    class CountingStream(io.StringIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    stream = CountingStream(json.dumps(DOCUMENTS))
+    documents = iter_json_documents(stream, chunk_size=64)
+    assert next(documents) == DOCUMENTS[0]
+    assert stream.reads < 5, "The whole stream was read for the first document."
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_malformed_records_are_reported_and_skipped(chunk_size):
+    good = [{"ok": True, "n": None}, {"ok": False}]
+    json_lines = '{"bad": tru}\n' + "\n".join(json.dumps(d) for d in good) + "\n"
+    array = '[{"ok": true, "n": null}, {"bad": [1 2]}, 3 4, {"ok": false}]'
+
+    records = list(iter_json_records(io.StringIO(json_lines), chunk_size))
+    assert [document for document, _ in records] == [None] + good
+    assert isinstance(records[0][1], json.JSONDecodeError)
+
+    records = list(iter_json_records(io.StringIO(array), chunk_size))
+    assert [document for document, _ in records] == [good[0], None, 3, None, good[1]]
+
+
+def test_malformed_record_does_not_read_ahead():
+    class CountingStream(io.StringIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    lines = ["{not json}"] + [json.dumps(document) for document in DOCUMENTS] * 20
+    stream = CountingStream("\n".join(lines))
+    records = iter_json_records(stream, chunk_size=64)
+    assert next(records)[1] is not None
+    assert next(records) == (DOCUMENTS[0], None)
+    assert stream.reads < 5, "The stream was read ahead after a malformed record."
+
+
+def installed_backend(name):
+    try:
+        return get_backend(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+
+@pytest.mark.parametrize("name", BACKEND_NAMES)
+def test_backends_parse_files_alike(name, tmp_path, monkeypatch):
+    backend = installed_backend(name)
+    path = tmp_path / "task.json"
+    path.write_text(json.dumps(DOCUMENTS[0]))
+    assert load_json_file(str(path), backend) == DOCUMENTS[0]
+
+    # Large files are memory-mapped by backends that parse buffers.
+    monkeypatch.setattr(json_loader, "MMAP_THRESHOLD", 1)
+    assert load_json_file(str(path), backend) == DOCUMENTS[0]
+
+    path.write_text("{ not json")
+    with pytest.raises(ValueError):
+        load_json_file(str(path), backend)
+
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.setenv(JSON_BACKEND_ENV, "json")
+    assert get_backend().name == "json"
+    monkeypatch.delenv(JSON_BACKEND_ENV)
+    assert get_backend().name in BACKEND_NAMES
+    with pytest.raises(ValueError):
+        get_backend("yaml")
+
+
+def test_auto_backend_is_resolved_once(monkeypatch):
+    imports = []
+    real_import = builtins.__import__
+
+    def counting_import(name, *args, **kwargs):
+        if name in BACKEND_NAMES:
+            imports.append(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.delenv(JSON_BACKEND_ENV, raising=False)
+    json_loader._resolve_backend.cache_clear()
+    json_loader._import_backend.cache_clear()
+    monkeypatch.setattr(builtins, "__import__", counting_import)
+    for _ in range(10):
+        assert json_loader.loads(b'{"a": 1}') == {"a": 1}
+    assert len(imports) <= len(BACKEND_NAMES)
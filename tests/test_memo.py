@@ -0,0 +1,69 @@
+import copy
+import json
+
+from fargate_task_validator.batch import expand_paths, validate_files
+from fargate_task_validator.validators.fargate_validator import collect_findings
+from fargate_task_validator.validators.rule_engine import ContainerMemo, RULES, evaluate
+
+SIDECAR = {
+    "name": "log_router",
+    "image": "amazon/aws-for-fluent-bit:stable",
+    "firelensConfiguration": {"type": "fluentbit"},
+    "logConfiguration": {"logDriver": "awslogs"},
+}
+
+
+def load_examples():
+    documents = []
+    for path in expand_paths(["examples"]):
+        with open(path) as f:
+            documents.append(json.load(f))
+    return documents
+
+
+def test_memoized_findings_match():
+    memo = ContainerMemo()
+    for _ in range(2):
+        for document in load_examples():
+            document["containerDefinitions"].append(copy.deepcopy(SIDECAR))
+            assert collect_findings(document, memo=memo) == collect_findings(document)
+    assert memo.hits > 0 and memo.misses > 0
+
+
+def test_identical_containers_are_checked_once():
+    memo = ContainerMemo()
+    variant = dict(SIDECAR, privileged=True)
+    document = {"containerDefinitions": [SIDECAR, copy.deepcopy(SIDECAR), variant]}
+    findings = collect_findings(document, memo=memo)
+    assert (memo.hits, memo.misses) == (1, 2)
+    assert findings[("containerDefinitions[1]", "privileged")] == "OK"
+    assert findings[("containerDefinitions[2]", "privileged")] == "FAIL"
+
+
+def test_memo_is_bounded_and_keyed_by_rules():
+    memo = ContainerMemo(max_entries=2)
+    for index in range(5):
+        document = {"containerDefinitions": [dict(SIDECAR, image=str(index))]}
+        collect_findings(document, memo=memo)
+    assert memo.size == 2
+
+    subset = [rule for rule in RULES if rule.name == "privileged"]
+    findings = evaluate({"containerDefinitions": [SIDECAR]}, rules=subset, memo=memo)
+    assert list(findings) == [("log_router", "privileged")]
+
+
+def test_validate_files_reports_memo_counters():
+    paths = expand_paths(["examples"])
+    outcomes = list(validate_files(paths, workers=1, memoize=True))
+    assert all(outcome["memo"] is not None for outcome in outcomes)
+
+
+def test_memo_counts_are_per_call():
+    memo = ContainerMemo()
+    collect_findings({"containerDefinitions": [SIDECAR]}, memo=memo)
+    counts = {"hits": 0, "misses": 0}
+    document = {"containerDefinitions": [SIDECAR, dict(SIDECAR, privileged=True)]}
+    collect_findings(document, memo=memo, memo_counts=counts)
+    # Lookups of other callers of the shared memo are not included.
+    assert counts == {"hits": 1, "misses": 1}
+    assert (memo.hits, memo.misses) == (1, 2)
@@ -0,0 +1,38 @@
+import json
+
+from fargate_task_validator.batch import validate_document
+from fargate_task_validator.profiling import RuleStats
+from fargate_task_validator.validators.fargate_validator import collect_findings
+from fargate_task_validator.validators.rule_engine import (
+    CONTAINER_SCOPE,
+    RULES,
+    TASK_SCOPE,
+)
+
+with open("examples/fail_task.json") as f:
+    FAIL_TASK = json.load(f)
+
+
+def test_stats_count_calls_and_failures():
+    stats = RuleStats()
+    findings = collect_findings(FAIL_TASK, stats=stats)
+    assert findings == collect_findings(FAIL_TASK)
+
+    counters = stats.as_dict()
+    containers = len(FAIL_TASK["containerDefinitions"])
+    for rule in RULES:
+        expected = containers if rule.scope == CONTAINER_SCOPE else 1
+        assert counters[rule.name]["calls"] == expected
+    assert counters["networkMode"]["failures"] == 1
+    assert all(counters[rule.name]["seconds"] >= 0 for rule in RULES)
+
+    stats.merge(stats)
+    assert stats.as_dict()["networkMode"]["calls"] == 2
+
+
+def test_validate_document_stats():
+    outcome = validate_document(FAIL_TASK, stats=True)
+    task_rules = sum(rule.scope == TASK_SCOPE for rule in RULES)
+    assert outcome["stats"]["schema"]["calls"] == 1
+    assert len(outcome["stats"]) >= task_rules + 1
+    assert validate_document(FAIL_TASK)["stats"] is None
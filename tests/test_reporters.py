@@ -0,0 +1,55 @@
+import io
+import json
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+from fargate_task_validator.batch import expand_paths, validate_files
+from fargate_task_validator.reporters import Reporter, REPORTERS
+
+
+def write_report(format):
+    stream = io.StringIO()
+    reporter = REPORTERS[format](stream)
+    reporter.start()
+    for outcome in validate_files(expand_paths(["examples"]), workers=1):
+        reporter.add(outcome)
+    reporter.finish()
+    return stream.getvalue()
+
+
+def test_jsonl_report():
+    records = [json.loads(line) for line in write_report("jsonl").splitlines()]
+    assert [record["passed"] for record in records] == [True, False, True, True]
+    failures = {failure["check"]: failure for failure in records[1]["failures"]}
+    assert failures["networkMode"]["remediation"].startswith("Change the")
+
+
+def test_junit_report():
+    root = ElementTree.fromstring(write_report("junit"))
+    suites = root.findall("testsuite")
+    assert len(suites) == 4
+    assert [suite.get("failures") != "0" for suite in suites] == [
+        False,
+        True,
+        False,
+        False,
+    ]
+    failure = suites[1].find("testcase[@name='networkMode']/failure")
+    assert "Recommendation:" in failure.text and "Remediation:" in failure.text
+
+
+def test_sarif_report():
+    log = json.loads(write_report("sarif"))
+    (run,) = log["runs"]
+    rule_ids = {rule["id"] for rule in run["tool"]["driver"]["rules"]}
+    assert {"networkMode", "sysctl", "schema"} <= rule_ids
+    assert run["results"]
+    for result in run["results"]:
+        assert result["ruleId"] in rule_ids
+        uri = result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
+        assert uri == "examples/fail_task.json"
+
+
+def test_reporters_must_implement_add():
+    with pytest.raises(TypeError):
+        Reporter(io.StringIO())
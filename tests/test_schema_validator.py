@@ -0,0 +1,183 @@
+import copy
+import json
+import random
+
+import pytest
+from jsonschema import Draft7Validator
+
+from fargate_task_validator.validators.schema_compiler import (
+    compile_schema,
+    UnsupportedSchemaError,
+)
+from fargate_task_validator.validators.schema_validator import (
+    get_compiled_validator,
+    schema_errors,
+    validate_task_definition,
+    validator,
+    SCHEMA_VALID_MESSAGE,
+)
+
+EXAMPLES = [
+    "examples/amazon_linux_2_task.json",
+    "examples/fail_task.json",
+    "examples/my_nginx_task.json",
+    "examples/windows_task.json",
+]
+
+SAMPLE_VALUES = [None, True, False, 0, 1, 1.0, 1.5, "", "ENABLED", "task", [], [{}], {}]
+
+
+def load_json(file_path):
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def mutations(document, rng, count):
+    """Yield copies of ``document`` with one value replaced or removed."""
+    paths = []
+
+    def walk(node, path):
+        paths.append(path)
+        if isinstance(node, dict):
+            for key, value in node.items():
+                walk(value, path + (key,))
+        elif isinstance(node, list):
+            for index, value in enumerate(node):
+                walk(value, path + (index,))
+
+    walk(document, ())
+    for _ in range(count):
+        mutated = copy.deepcopy(document)
+        path = rng.choice(paths[1:])
+        parent = mutated
+        for key in path[:-1]:
+            parent = parent[key]
+        if isinstance(parent, dict) and rng.random() < 0.2:
+            del parent[path[-1]]
+        else:
+            parent[path[-1]] = copy.deepcopy(rng.choice(SAMPLE_VALUES))
+        yield mutated
+
+
+def test_compiled_validator_is_built_once():
+    assert get_compiled_validator() is not None
+    assert get_compiled_validator() is get_compiled_validator()
+
+
+def test_compiled_validator_matches_draft7():
+    compiled = get_compiled_validator()
+    rng = random.Random(7)
+    documents = [load_json(path) for path in EXAMPLES]
+    documents[0]["volumes"] = [
+        {
+            "name": "efs",
+            "efsVolumeConfiguration": {
+                "fileSystemId": "fs-1",
+                "transitEncryption": "ENABLED",
+                "authorizationConfig": {"iam": "DISABLED"},
+            },
+        },
+        {"name": "docker", "dockerVolumeConfiguration": {"scope": "task"}},
+    ]
+    documents[0]["placementConstraints"] = [{"type": "memberOf", "expression": "x"}]
+
+    checked = 0
+    for document in documents:
+        for candidate in [document] + list(mutations(document, rng, 300)):
+            assert compiled.is_valid(candidate) == validator.is_valid(candidate), (
+                json.dumps(candidate)
+            )
+            checked += 1
+    assert checked == len(documents) * 301
+
+
+def test_compiled_keywords_match_draft7():
+    schema = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer", "minimum": 1, "exclusiveMaximum": 10},
+            "tags": {
+                "type": "array",
+                "minItems": 1,
+                "items": {"type": "string", "pattern": "^[a-z]+$", "maxLength": 3},
+            },
+            "mode": {"enum": ["a", 1, None]},
+            "fixed": {"const": {"k": [1, True]}},
+            "either": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+            "never": {"not": {"type": "boolean"}},
+            "child": {"$ref": "#"},
+        },
+        "additionalProperties": {
+            "type": ["string", "integer", "array", "object", "null"]
+        },
+    }
+    instances = [
+        {"id": 1},
+        {"id": 10},
+        {"id": 1.0},
+        {"id": True},
+        {"id": 2, "tags": []},
+        {"id": 2, "tags": ["abc"]},
+        {"id": 2, "tags": ["abcd"]},
+        {"id": 2, "tags": ["AB"]},
+        {"id": 2, "mode": 1},
+        {"id": 2, "mode": True},
+        {"id": 2, "mode": None},
+        {"id": 2, "fixed": {"k": [1, True]}},
+        {"id": 2, "fixed": {"k": [True, 1]}},
+        {"id": 2, "either": None},
+        {"id": 2, "either": 3},
+        {"id": 2, "never": False},
+        {"id": 2, "child": {"id": 3}},
+        {"id": 2, "child": {"id": 0}},
+        {"id": 2, "extra": 1.5},
+        {"id": 2, "extra": "x"},
+        [],
+        "id",
+    ]
+    compiled = compile_schema(schema)
+    draft7 = Draft7Validator(schema)
+    for instance in instances:
+        assert compiled.is_valid(instance) == draft7.is_valid(instance), instance
+
+
+def test_unsupported_keyword_is_rejected():
+    with pytest.raises(UnsupportedSchemaError):
+        compile_schema({"type": "object", "oneOf": [{"type": "object"}]})
+
+
+def test_invalid_document_still_reports_draft7_error():
+    message = validate_task_definition({"family": "x"})
+    assert message != SCHEMA_VALID_MESSAGE
+    assert "containerDefinitions" in message
+
+    valid = load_json("examples/my_nginx_task.json")
+    assert validate_task_definition(valid) == SCHEMA_VALID_MESSAGE
+
+
+def test_every_schema_error_is_reported_with_its_location():
+    broken = load_json("examples/my_nginx_task.json")
+    del broken["family"]
+    broken["volumes"] = [{"host": {"sourcePath": 1}}, 3]
+    errors = schema_errors(broken, max_errors=None)
+    assert {(error["path"], error["schema_path"]) for error in errors} == {
+        ("", "#/required"),
+        (
+            "/volumes/0/host/sourcePath",
+            "#/properties/volumes/items/properties/host/properties/sourcePath/type",
+        ),
+        ("/volumes/1", "#/properties/volumes/items/type"),
+    }
+    assert len(schema_errors(broken, max_errors=2)) == 2
+    assert schema_errors(load_json("examples/my_nginx_task.json")) == []
+
+
+def test_negative_max_schema_errors_is_rejected(capsys):
+    from fargate_task_validator.__main__ import parse_args
+
+    with pytest.raises(SystemExit) as exit:
+        parse_args(["--max-schema-errors", "-1", "examples/my_nginx_task.json"])
+    assert exit.value.code == 2
+    assert "must be 0 or more" in capsys.readouterr().err
+    assert parse_args(["--max-schema-errors", "0", "x.json"]).max_schema_errors == 0
@@ -0,0 +1,92 @@
+import http.client
+import json
+import socket
+import threading
+from contextlib import closing
+
+import pytest
+from fargate_task_validator.server import create_server
+
+
+def load_json(file_path):
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def server():
+    server = create_server(("127.0.0.1", 0), quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, payload=None):
+    body = None if payload is None else json.dumps(payload)
+    with closing(http.client.HTTPConnection(*server.server_address)) as connection:
+        connection.request(method, path, body=body)
+        with connection.getresponse() as response:
+            return response.status, json.loads(response.read())
+
+
+def test_validate_single_and_batch(server):
+    status, outcome = request(
+        server, "POST", "/validate", load_json("examples/windows_task.json")
+    )
+    assert status == 200 and outcome["passed"]
+
+    batch = [load_json("examples/fail_task.json"), {"family": "x"}, "not a task"]
+    status, outcomes = request(server, "POST", "/validate", batch)
+    assert status == 200
+    assert [outcome["passed"] for outcome in outcomes] == [False, False, False]
+    assert outcomes[0]["failing_containers"]["GPU"] == ["fail-container"]
+    assert outcomes[2]["error"]
+
+
+def test_invalid_json_and_metrics(server):
+    with closing(http.client.HTTPConnection(*server.server_address)) as connection:
+        connection.request("POST", "/validate", body="{ not json")
+        with connection.getresponse() as response:
+            assert response.status == 400
+            response.read()
+
+    request(server, "POST", "/validate", {"family": "x"})
+    status, metrics = request(server, "GET", "/metrics")
+    assert status == 200
+    assert metrics["requests"] == 2 and metrics["errors"] == 1
+    assert metrics["documents"] == 1
+    assert metrics["latency_ms"]["p50"] >= 0
+
+
+def test_unexpected_errors_are_reported(server, monkeypatch):
+    def broken(document):
+        raise TypeError("broken rule")
+
+    monkeypatch.setattr(server, "validate_one", broken)
+    status, response = request(server, "POST", "/validate", {"family": "x"})
+    assert status == 500 and "broken rule" in response["error"]
+    status, metrics = request(server, "GET", "/metrics")
+    assert metrics["errors"] == 1
+
+
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "validator.sock")
+    server = create_server(path, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(path)
+        # Closing the connection also closes its socket.
+        with closing(http.client.HTTPConnection("localhost")) as connection:
+            connection.sock = client
+            connection.request("GET", "/healthz")
+            with connection.getresponse() as response:
+                assert response.status == 200
+                assert json.loads(response.read()) == {"status": "ok"}
+    finally:
+        # Only once the client is gone, so the server sees no reset.
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+
+import pytest
+from fargate_task_validator.__main__ import main
+from fargate_task_validator.shard import (
+    merge_partials,
+    parse_shard,
+    read_partial_header,
+    record_partial,
+    select_shard,
+    shard_of,
+)
+
+EXAMPLES = sorted(os.path.join("examples", name) for name in os.listdir("examples"))
+
+
+def test_parse_shard():
+    assert parse_shard("2/8") == (2, 8)
+    for value in ["0/2", "3/2", "2", "a/b", "1/0"]:
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shards_are_stable_and_partition_the_files():
+    paths = [f"services/task-{i}.json" for i in range(200)]
+    shards = [select_shard(paths, index, 4) for index in range(1, 5)]
+    assert sorted(sum(shards, [])) == sorted(paths)
+    assert all(shards)
+
+    # Adding files does not move the others.
+    more = paths + [f"other/task-{i}.json" for i in range(50)]
+    for index, shard in enumerate(shards, 1):
+        assert set(shard) <= set(select_shard(more, index, 4))
+    assert shard_of("./services/task-1.json", 4) == shard_of(paths[1], 4)
+
+
+def write_partials(tmp_path, count):
+    partials = []
+    for index in range(1, count + 1):
+        partial = str(tmp_path / f"shard-{index}.jsonl")
+        argv = ["--shard", f"{index}/{count}", "--partial", partial]
+        with pytest.raises(SystemExit):
+            main(EXAMPLES + argv + ["--no-cache", "-q"])
+        partials.append(partial)
+    return partials
+
+
+def test_merged_partials_match_a_full_run(tmp_path, capsys):
+    with pytest.raises(SystemExit) as full:
+        main(EXAMPLES + ["--no-cache", "--format", "jsonl"])
+    expected = {}
+    for line in capsys.readouterr().out.splitlines():
+        outcome = json.loads(line)
+        expected[outcome["path"]] = outcome["passed"]
+
+    partials = write_partials(tmp_path, 3)
+    capsys.readouterr()
+    with pytest.raises(SystemExit) as merged:
+        main(["--merge"] + partials[::-1] + ["--format", "jsonl"])
+    outcomes = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {outcome["path"]: outcome["passed"] for outcome in outcomes} == expected
+    assert len(outcomes) == len(EXAMPLES)
+    assert merged.value.code == full.value.code == 1
+
+
+def test_incomplete_partials_are_rejected(tmp_path):
+    partials = write_partials(tmp_path, 2)
+    with pytest.raises(ValueError, match="1/2"):
+        merge_partials(partials[1:])
+    copy = str(tmp_path / "copy.jsonl")
+    shutil.copy(partials[0], copy)
+    with pytest.raises(ValueError, match="both"):
+        merge_partials(partials + [copy])
+    with pytest.raises(ValueError, match="shards"):
+        merge_partials([copy, str(write_partials(tmp_path, 1)[0])])
+
+    # The partial file of an interrupted run has no trailer.
+    interrupted = str(tmp_path / "interrupted.jsonl")
+    outcomes = record_partial([{"path": "a.json"}], interrupted, 1, 1)
+    next(outcomes)
+    outcomes.close()
+    with pytest.raises(ValueError, match="incomplete"):
+        read_partial_header(interrupted)
+
+    (tmp_path / "other.jsonl").write_text("{}\n")
+    with pytest.raises(ValueError, match="not a partial"):
+        read_partial_header(str(tmp_path / "other.jsonl"))
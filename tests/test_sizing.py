@@ -0,0 +1,73 @@
+import pytest
+from fargate_task_validator.batch import validate_document
+from fargate_task_validator.validators.fargate_validator import (
+    VALID_COMBINATIONS_LINUX,
+)
+from fargate_task_validator.validators.sizing import (
+    cheapest_size,
+    hourly_cost,
+    recommend_size,
+)
+
+
+def test_tables_are_immutable():
+    with pytest.raises(TypeError):
+        VALID_COMBINATIONS_LINUX["32768"] = frozenset()
+    assert isinstance(VALID_COMBINATIONS_LINUX["2048"], frozenset)
+    assert "16384" in VALID_COMBINATIONS_LINUX["2048"]
+
+
+def test_cheapest_size_covers_request():
+    assert cheapest_size(0, 0) == (256, 512)
+    assert cheapest_size(300, 1000) == (512, 1024)
+    assert cheapest_size(1024, 1024) == (1024, 2048)
+    assert cheapest_size(0, 200000) is None
+    assert cheapest_size(256, 512, "WINDOWS_SERVER_2022_CORE") == (1024, 2048)
+
+
+def test_cheapest_size_is_cheapest_valid_combination():
+    for cpu, memory in [(100, 3000), (2000, 5000), (5000, 9000)]:
+        size = cheapest_size(cpu, memory)
+        candidates = [
+            (int(c), int(m))
+            for c, values in VALID_COMBINATIONS_LINUX.items()
+            for m in values
+            if int(c) >= cpu and int(m) >= memory
+        ]
+        assert hourly_cost(*size) == min(hourly_cost(*c) for c in candidates)
+
+
+def test_recommend_size_from_containers():
+    task_definition = {
+        "cpu": "4096",
+        "memory": "8192",
+        "containerDefinitions": [
+            {"cpu": 256, "memory": 512},
+            {"cpu": 128, "memoryReservation": 256},
+        ],
+    }
+    sizing = recommend_size(task_definition)
+    assert sizing["required"] == (384, 768)
+    assert sizing["recommended"] == (512, 1024)
+    assert sizing["over_provisioned"]
+
+
+def test_recommend_size_without_container_sizes_keeps_task_size():
+    sizing = recommend_size(
+        {"cpu": "1024", "memory": "3072", "containerDefinitions": [{"name": "app"}]}
+    )
+    assert sizing["recommended"] == (1024, 3072)
+    assert not sizing["over_provisioned"]
+
+
+def test_malformed_task_definitions_do_not_abort_sizing():
+    sizing = recommend_size(
+        {"cpu": "256", "memory": "512", "runtimePlatform": {"operatingSystemFamily": 5}}
+    )
+    assert sizing["recommended"] == (256, 512)
+
+    outcome = validate_document(
+        {"runtimePlatform": "LINUX", "containerDefinitions": []}, right_size=True
+    )
+    assert outcome["error"].startswith("Could not recommend a task size")
+    assert not outcome["passed"]
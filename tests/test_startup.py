@@ -0,0 +1,41 @@
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "jsonschema",
+    "termcolor",
+    "concurrent.futures.process",
+    "fargate_task_validator.validators.recommendations",
+]
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    code = (
+        "import json, sys\n"
+        "import fargate_task_validator.__main__\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert json.loads(output) == []
+
+
+def test_skip_schema(tmp_path):
+    path = tmp_path / "task.json"
+    path.write_text(json.dumps({"containerDefinitions": [{"name": "app"}]}))
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "fargate_task_validator",
+            "--skip-schema",
+            "--no-cache",
+            str(path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert "networkMode" in result.stdout
+    assert "schema" not in result.stdout.lower()
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+
+import pytest
+from fargate_task_validator.watch import (
+    debounced_changes,
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    WatchTargets,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    shutil.copy("examples/my_nginx_task.json", tmp_path / "nginx.json")
+    (tmp_path / "services").mkdir()
+    shutil.copy("examples/fail_task.json", tmp_path / "services" / "fail.json")
+    (tmp_path / "notes.txt").write_text("not a task definition")
+    return tmp_path
+
+
+def inotify_watcher(targets):
+    try:
+        return InotifyWatcher(targets)
+    except OSError:
+        pytest.skip("inotify is not available")
+
+
+def touch(path, content):
+    path.write_text(content)
+    # Make sure the change is visible to mtime based polling.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_targets(tree):
+    targets = WatchTargets([str(tree), "examples/windows_task.json"])
+    assert targets.paths() == [
+        str(tree / "nginx.json"),
+        str(tree / "services" / "fail.json"),
+        "examples/windows_task.json",
+    ]
+    assert targets.matches(str(tree / "new.json"))
+    assert not targets.matches(str(tree / "notes.txt"))
+    assert not targets.matches("examples/fail_task.json")
+
+
+def test_polling_watcher(tree):
+    watcher = PollingWatcher(WatchTargets([str(tree)]), interval=0.01)
+    assert watcher.wait(0) == set()
+
+    touch(tree / "nginx.json", "{}")
+    (tree / "services" / "fail.json").unlink()
+    (tree / "new.json").write_text("{}")
+    (tree / "notes.txt").write_text("ignored")
+    assert watcher.wait(1) == {
+        str(tree / "nginx.json"),
+        str(tree / "services" / "fail.json"),
+        str(tree / "new.json"),
+    }
+
+
+def test_inotify_watcher(tree):
+    watcher = inotify_watcher(WatchTargets([str(tree)]))
+    try:
+        assert watcher.wait(0) == set()
+        (tree / "nginx.json").write_text("{}")
+        (tree / "notes.txt").write_text("ignored")
+        assert watcher.wait(1) == {str(tree / "nginx.json")}
+
+        # Saves through a temporary file and new directories are seen too.
+        (tree / "services" / "fail.json.tmp").write_text("{}")
+        os.replace(tree / "services" / "fail.json.tmp", tree / "services" / "fail.json")
+        (tree / "new").mkdir()
+        (tree / "new" / "task.json").write_text("{}")
+        changed = watcher.wait(1)
+        changed |= watcher.wait(0.1)
+        assert changed == {
+            str(tree / "services" / "fail.json"),
+            str(tree / "new" / "task.json"),
+        }
+    finally:
+        watcher.close()
+
+
+def test_bursts_of_saves_are_debounced(tree):
+    watcher = PollingWatcher(WatchTargets([str(tree)]), interval=0.01)
+    touch(tree / "nginx.json", "{}")
+    touch(tree / "services" / "fail.json", "{}")
+    changes = debounced_changes(watcher, debounce=0.05)
+    assert next(changes) == {
+        str(tree / "nginx.json"),
+        str(tree / "services" / "fail.json"),
+    }
+
+
+def test_session_only_validates_changed_files(tree):
+    session = WatchSession(WatchTargets([str(tree)]))
+    assert [outcome["passed"] for outcome in session.refresh()] == [True, False]
+    unchanged = session.documents[str(tree / "services" / "fail.json")][1]
+
+    path = tree / "nginx.json"
+    task_definition = json.loads(path.read_text())
+    task_definition["networkMode"] = "bridge"
+    path.write_text(json.dumps(task_definition))
+    (outcome,) = session.refresh({str(path)})
+    assert outcome["results"]["networkMode"] == "FAIL"
+    assert outcome["incremental"]["reused"] > 0
+    assert session.outcomes[1] is unchanged
+
+    path.unlink()
+    assert session.refresh({str(path)}) == []
+    assert [outcome["path"] for outcome in session.outcomes] == [
+        str(tree / "services" / "fail.json")
+    ]